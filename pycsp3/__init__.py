@@ -78,6 +78,9 @@ if sys.argv:
     elif sys.argv[0] == '':  # console mode
         Compilation.load(console=True)
         data = None
+    elif os.path.realpath(sys.argv[0]).startswith(os.path.join(os.path.dirname(os.path.realpath(__file__)), "solvers", "")):  # tool mode
+        # e.g., python pycsp3/solvers/benchmark.py: the executed script is a tool of the library, and not a model to be compiled
+        Compilation.done = True
     elif "pycsp3/problems/tests/" in sys.argv[0]:  # test mode
         # TODO is it correct (for avoiding compiling two times)?
         #  analysing if we have to compile (e..g, when running the tester, we should not try to do that);
@@ -86,18 +89,23 @@ if sys.argv:
     elif sys.argv[-1] != '-nocompile':
         Compilation.load()
         data = Compilation.data
+        if Compilation.load_from_cache():  # the model is not executed when its compiled form is found in the cache
+            sys.exit(0)
 
 _solver = None  # current solver
 
 
-def _set_solver(name):
-    global _solver
+def _build_solver(name):
     if name == CHOCO:
         from pycsp3.solvers.choco import Choco
-        _solver = Choco()
-    else:  # Fallback case => ace
-        from pycsp3.solvers.ace import Ace
-        _solver = Ace()
+        return Choco()
+    from pycsp3.solvers.ace import Ace  # Fallback case => ace
+    return Ace()
+
+
+def _set_solver(name):
+    global _solver
+    _solver = _build_solver(name)
     return _solver
 
 
@@ -112,16 +120,17 @@ def solver(name=None):
     return _solver if name is None else _set_solver(name)
 
 
-def compile(filename=None, *, verbose=0):
+def compile(filename=None, *, verbose=0, in_memory=False):
     """
     Compiles the current model
 
     :param filename: the filename of the compiled problem instance
     :param verbose: verbosity level from -1 to 2
-    :return: a pair composed of a string (filename) and a Boolean (True if a COP, False otherwise)
+    :param in_memory: True if the XCSP3 document must not be written in a file, but generated when it is given to a solver (StreamedDocument)
+    :return: a pair composed of a string (filename), or a StreamedDocument if in_memory is True, and a Boolean (True if a COP, False otherwise)
     """
     from pycsp3.compiler import Compilation
-    filename, cop = Compilation.compile(filename, verbose=verbose)
+    filename, cop = Compilation.compile(filename, verbose=verbose, in_memory=in_memory)
     return filename, cop
 
 
@@ -139,6 +148,15 @@ def solution():
     return None if _solver is None else _solver.last_solution
 
 
+def solutions():
+    """
+    Returns the store of the solutions found by the last solving operation (as a 2-D array of integers, with one row per solution
+    and one column per variable), which can be exported without any copy, e.g., with solutions().to_numpy() or solutions().save("sols.npy")
+    """
+    from pycsp3.classes.main.variables import SolutionStore
+    return SolutionStore
+
+
 def n_solutions():
     """
     Returns the number of solutions found by the last solving operation, or None
@@ -153,6 +171,13 @@ def bound():
     return None if _solver is None else _solver.bound
 
 
+def statistics():
+    """
+    Returns the statistics (Statistics object) collected during the last solving operation, or None
+    """
+    return None if _solver is None else _solver.last_statistics
+
+
 def core():
     """
     returns the core identified by the last extraction operation, or None
@@ -168,46 +193,116 @@ def _process_solving(solving):
     return t[0], args, args_recursive
 
 
-def solve(*, solver=ACE, options="", filename=None, verbose=-1, sols=None, extraction=False):
+def _solving_string(solver, verbose, sols):
+    if isinstance(solver, TypeSolver):
+        solver = "[" + solver.name.lower()
+        if verbose != -1:
+            solver += "," + ("v" if verbose == 0 else "vv" if verbose == 1 else "vvv")
+        if sols is not None:
+            solver += ",limit=" + ("no" if sols == ALL else str(sols) + "sols")
+        return solver + "]"
+    assert isinstance(solver, str)
+    msg = "As you use the parameter 'solver', you should not use the parameter"
+    if verbose != -1:
+        warning(msg + "'verbose' (which is then ignored); you can write e.g., [ace,v]")
+    if sols is not None:
+        warning(msg + "'sols' (which is then ignored); you can write e.g., [ace,limit=no]")
+    return ("[" if len(solver) > 0 and solver[0] != '[' else "") + solver + ("]" if len(solver) > 0 and solver[-1] != ']' else "")
+
+
+def _piped(pipe):
+    from pycsp3.dashboard import options
+    return pipe or bool(options.pipe)
+
+
+def _cached(cache):
+    from pycsp3.dashboard import options
+    return (cache or bool(options.solve_cache)) and not options.no_cache
+
+
+def _multiple(sols):
+    return sols == ALL or isinstance(sols, int) and sols > 1
+
+
+def _new_solver(solver, options, verbose, sols):
+    # builds the solver (without making it the current one), and returns it with the string and dictionaries of its options
+    from pycsp3.solvers.solver import SolverProcess
+    built = None
+    if isinstance(solver, SolverProcess):  # an already built solver (e.g., a session AcePy4J) is used
+        built, solver = solver, CHOCO if solver.name.lower().startswith(CHOCO.name.lower()) else ACE
+    if isinstance(solver, TypeSolver) and _multiple(sols):  # options for displaying all solution in XML format
+        options += " -xe -xc=false" if solver == ACE else " -a "
+    solving = _solving_string(solver, verbose, sols)
+    solver_name, args, args_recursive = _process_solving(solving)
+    built = _build_solver(solver_name) if built is None else built
+    built.setting(options)
+    return built, solving, args, args_recursive
+
+
+def _prepare_solver(solver, options, verbose, sols):
+    # builds the solver (that becomes the current one), and returns the string and dictionaries of its options
+    global _solver
+    _solver, solving, args, args_recursive = _new_solver(solver, options, verbose, sols)
+    return solving, args, args_recursive
+
+
+def _own(solver, solutions):
+    # makes the specified solver (whose solving operation is finished) the current one, and records its solutions in variables
+    global _solver
+    _solver = solver
+    solver.record(solutions if len(solutions) > 0 else None)
+
+
+def _solve_portfolio(instance, portfolio, options, verbose, on_solution, on_bound):
+    global _solver
+    from pycsp3.solvers.solver import solve_portfolio
+    runs = []
+    for entry in portfolio:
+        entry_solver, entry_options = entry if isinstance(entry, tuple) else (entry, "")
+        solving = _solving_string(entry_solver, -1 if isinstance(entry_solver, str) else verbose, None)
+        solver_name, args, args_recursive = _process_solving(solving)
+        entry_solver = _build_solver(solver_name)
+        entry_solver.setting((options + " " + entry_options).strip())
+        runs.append((entry_solver, solving, args, args_recursive))
+    _solver, status = solve_portfolio(instance, runs, verbose=verbose, on_solution=on_solution, on_bound=on_bound)
+    return status
+
+
+def solve(*, solver=ACE, options="", filename=None, verbose=-1, sols=None, extraction=False, on_solution=None, on_bound=None, portfolio=None,
+          pipe=False, cache=False):
     """
     Solves the current model (after compiling it) and returns the status of this operation.
 
     :param solver: name of the solver (ACE or CHOCO), possibly accompanied by general options
-                   as defined in https://github.com/xcsp3team/pycsp3/blob/master/docs/optionsSolvers.pdf
+                   as defined in https://github.com/xcsp3team/pycsp3/blob/master/docs/optionsSolvers.pdf,
+                   or an already built solver (e.g., a session AcePy4J, whose JVM is kept alive between solving operations)
     :param options: specific options for the solver
     :param filename: the filename of the compiled problem instance
     :param verbose: verbosity level from -1 to 2
     :param sols: number of solutions to be found (ALL if no limit)
     :param extraction: True if an unsatisfiable core of constraints must be sought
+    :param on_solution: a function called with each solution (Instantiation object) as soon as it is found; the solver is stopped if it returns False
+    :param on_bound: a function called with each new bound (int) as soon as it is found; the solver is stopped if it returns False
+    :param portfolio: a list of solvers to be run concurrently (instead of the parameter solver), each one given as for the parameter solver
+                      (e.g., ACE or "[ace,seed=2]") or as a pair (solver, options); the first definitive answer (or the best bound) is retained
+    :param pipe: True if the XCSP3 document must be streamed to the solver through a named pipe, without writing any file
+                 (this is also the case with the option -pipe); otherwise, the generated file is kept (e.g., for debugging)
+    :param cache: True if the result can be taken from (and recorded in) the on-disk cache of solving results, when the same instance
+                  is solved again by the same solver with the same options (this is also the case with the option -solve_cache);
+                  a result obtained with a time limit is only reused for the same time limit, except if it is definitive
     :return: the status of the solving operation
     """
-    global _solver
-    instance = compile(filename, verbose=verbose)
+    instance = compile(filename, verbose=verbose, in_memory=_piped(pipe))
     if instance is None:
         print("Problem when compiling")
+    elif portfolio is not None:
+        if sols is not None or extraction:
+            warning("The parameters 'sols' and 'extraction' are ignored when using a portfolio")
+        return _solve_portfolio(instance, portfolio, options, verbose, on_solution, on_bound)
     else:
-        if isinstance(solver, TypeSolver):
-            if sols == ALL or isinstance(sols, int) and sols > 1:  # options for displaying all solution in XML format
-                options += " -xe -xc=false" if solver == ACE else " -a "
-            solver = "[" + solver.name.lower()
-            if verbose != -1:
-                solver += "," + ("v" if verbose == 0 else "vv" if verbose == 1 else "vvv")
-            if sols is not None:
-                solver += ",limit=" + ("no" if sols == ALL else str(sols) + "sols")
-            solver += "]"
-        else:
-            assert isinstance(solver, str)
-            msg = "As you use the parameter 'solver', you should not use the parameter"
-            if verbose != -1:
-                warning(msg + "'verbose' (which is then ignored); you can write e.g., [ace,v]")
-            if sols is not None:
-                warning(msg + "'sols' (which is then ignored); you can write e.g., [ace,limit=no]")
-            solver = ("[" if len(solver) > 0 and solver[0] != '[' else "") + solver + ("]" if len(solver) > 0 and solver[-1] != ']' else "")
-
-        solver_name, args, args_recursive = _process_solving(solver)
-        _solver = _set_solver(solver_name)
-        _solver.setting(options)
-        return _solver.solve(instance, solver, args, args_recursive, verbose=verbose, extraction=extraction)
+        solver, args, args_recursive = _prepare_solver(solver, options, verbose, sols)
+        return _solver.solve(instance, solver, args, args_recursive, verbose=verbose, extraction=extraction, on_solution=on_solution, on_bound=on_bound,
+                             cache=_cached(cache))
 
         # _solver = _set_solver(solver)
         # if solver == ACE:
@@ -224,6 +319,102 @@ def solve(*, solver=ACE, options="", filename=None, verbose=-1, sols=None, extra
         # verbose=verbose, extraction=extraction)
 
 
+async def solve_async(*, solver=ACE, options="", filename=None, verbose=-1, sols=None, timeout=None, on_solution=None, on_bound=None, pipe=False):
+    """
+    Solves the current model (after compiling it) without blocking the event loop, and returns the status of this operation.
+    Several solving operations can be run concurrently on the same event loop, each one with its own solver; cancelling the task kills
+    the solving process. When the operation is finished, its solver becomes the current one and its solutions are recorded in variables.
+
+    :param solver: name of the solver (ACE or CHOCO), possibly accompanied by general options
+    :param options: specific options for the solver
+    :param filename: the filename of the compiled problem instance
+    :param verbose: verbosity level from -1 to 2
+    :param sols: number of solutions to be found (ALL if no limit)
+    :param timeout: the maximal time (in seconds) before interrupting the solver, or None
+    :param on_solution: a function called with each solution (Instantiation object) as soon as it is found; the solver is stopped if it returns False
+    :param on_bound: a function called with each new bound (int) as soon as it is found; the solver is stopped if it returns False
+    :param pipe: True if the XCSP3 document must be streamed to the solver through a named pipe, without writing any file
+    :return: the status of the solving operation
+    """
+    instance = compile(filename, verbose=verbose, in_memory=_piped(pipe))
+    if instance is None:
+        print("Problem when compiling")
+        return None
+    built, solving, args, args_recursive = _new_solver(solver, options, verbose, sols)
+    solutions = []
+
+    def _on_solution(sol):
+        if _multiple(sols):  # the history of all solutions is recorded when the operation is finished
+            solutions.append(sol)
+        return on_solution(sol) if on_solution is not None else None
+
+    status = await built.solve_async(instance, solving, args, args_recursive, verbose=verbose, timeout=timeout, on_solution=_on_solution,
+                                     on_bound=on_bound, recording=False)
+    _own(built, solutions)
+    return status
+
+
+async def _owned_events(solver, events, multiple):
+    # yields the specified events of a solving operation, and makes the solver the current one when the iteration is over
+    solutions = []
+    try:
+        async for kind, value in events:
+            if kind == "solution" and multiple:
+                solutions.append(value)
+            yield kind, value
+    finally:
+        await events.aclose()
+        _own(solver, solutions)
+
+
+def solve_async_iter(*, solver=ACE, options="", filename=None, verbose=-1, sols=None, timeout=None, pipe=False):
+    """
+    Solves the current model (after compiling it) without blocking the event loop, and returns an asynchronous iterator over
+    the pairs ("solution", Instantiation) and ("bound", int) found by the solver. Stopping the iteration early kills the solving process.
+    The solver becomes the current one once the iteration is over, the status of the operation being then given by status().
+
+    :param solver: name of the solver (ACE or CHOCO), possibly accompanied by general options
+    :param options: specific options for the solver
+    :param filename: the filename of the compiled problem instance
+    :param verbose: verbosity level from -1 to 2
+    :param sols: number of solutions to be found (ALL if no limit)
+    :param timeout: the maximal time (in seconds) before interrupting the solver, or None
+    :param pipe: True if the XCSP3 document must be streamed to the solver through a named pipe, without writing any file
+    :return: an asynchronous iterator over solutions and bounds
+    """
+    instance = compile(filename, verbose=verbose, in_memory=_piped(pipe))
+    assert instance is not None, "Problem when compiling"
+    built, solving, args, args_recursive = _new_solver(solver, options, verbose, sols)
+    events = built.iter_async(instance, solving, args, args_recursive, verbose=verbose, timeout=timeout, recording=False)
+    return _owned_events(built, events, _multiple(sols))
+
+
+def compile_many(model, data, *, workers=None, args="", timeout=None):
+    """
+    Compiles the specified model with each of the specified data, each compilation being executed in a fresh Python process,
+    and generates the outcomes (data, filename, wck, error) as soon as compilations are finished (see compiler.compile_many())
+    """
+    from pycsp3.compiler import compile_many
+    return compile_many(model, data, workers=workers, args=args, timeout=timeout)
+
+
+def Job(instance, solver, options=""):
+    """
+    Returns a solving job for solve_many(): a compiled instance (filename or bytes), a solver (e.g., ACE or "[choco,limit=10s]") and specific options
+    """
+    from pycsp3.solvers.batch import Job
+    return Job(instance, solver, options)
+
+
+def solve_many(jobs, *, output=None, workers=None, wall_limit=None, cpu_limit=None, memory_limit=None):
+    """
+    Solves the specified jobs, at most 'workers' of them being run at the same time, and generates the results (dictionaries)
+    as soon as jobs are finished (see solvers.batch.solve_many())
+    """
+    from pycsp3.solvers.batch import solve_many
+    return solve_many(jobs, output=output, workers=workers, wall_limit=wall_limit, cpu_limit=cpu_limit, memory_limit=memory_limit)
+
+
 def _pycharm_security():  # for avoiding that imports are removed when reformatting code
     _ = (namedtuple, product, permutations)
 
@@ -237,15 +428,15 @@ def end():
     global _solver
     verbose = 1
     if not Compilation.done and not Error.errorOccurrence:
-        filename, cop = Compilation.compile(disabling_opoverrider=True)
         solving = ACE.name if options.solve else options.solver
+        filename, cop = Compilation.compile(disabling_opoverrider=True, in_memory=bool(solving and options.pipe and not options.display))
         if solving:
             if options.display:
                 warning("options -display and -solve should not be used together.")
                 return filename
             solver_name, args, args_recursive = _process_solving(solving)
             _solver = _set_solver(solver_name)
-            result = _solver.solve((filename, cop), solving, args, args_recursive, compiler=True, verbose=verbose, automatic=True)
+            result = _solver.solve((filename, cop), solving, args, args_recursive, compiler=True, verbose=verbose, automatic=True, cache=_cached(False))
             print("\nResult: ", result)
             if solution():
                 print(solution())
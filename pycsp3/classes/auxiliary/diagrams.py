@@ -44,8 +44,8 @@ class Diagram:
         return t
 
     def flat_transitions(self, scp):
-        values = scp[0].dom.all_values()
-        assert all(values == scp[i].dom.all_values() for i in range(1, len(scp)))
+        values = scp[0].dom  # the Domain object is kept for fast membership tests
+        assert all(scp[i].dom is values or scp[i].dom.all_values() == values.all_values() for i in range(1, len(scp)))
         trs = []
         for (q1, l, q2) in self.transitions:
             labels = [l] if isinstance(l, (int, str)) else l if isinstance(l, (list, tuple, set, frozenset)) else list(l.filtering(values))
@@ -54,7 +54,7 @@ def to_ordinary_table(table, domains, *, possibly_starred=False):
         else v.filtering(doms[i]) for i, v in enumerate(t))
         return itertools.product(*development)
 
-    doms = [range(d) if isinstance(d, int) else d.all_values() if isinstance(d, Domain) else d for d in domains]
+    doms = [range(d) if isinstance(d, int) else d for d in domains]  # Domain objects are kept for fast membership tests
     T = list()  # we use a list because its processing is faster than a set
     contains_node_condition = False
     for t in table:
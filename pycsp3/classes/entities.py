@@ -3,7 +3,7 @@ import re
 from pycsp3 import tools
 from pycsp3.classes import main
 from pycsp3.classes.auxiliary.enums import TypeCtr, TypeCtrArg
-from pycsp3.classes.main.variables import Variable
+from pycsp3.classes.main.variables import Domain, Variable, SolutionStore
 from pycsp3.tools.inspector import checkType
 from pycsp3.tools.utilities import flatten, is_containing, warning, ANY, combinations
 
@@ -56,6 +56,7 @@ class EVar(Entity):
         self.variable = x
         VarEntities.items.append(self)
         VarEntities.varToEVar[x] = self
+        VarEntities.nameToEVar.setdefault(x.id, self)
 
     def get_type(self):
         return self.variable.dom.type
@@ -310,6 +311,7 @@ class VarEntities:
     varToEVar = dict()
     varToEVarArray = dict()
     prefixToEVarArray = dict()
+    nameToEVar = dict()  # for stand-alone variables (i.e., not in arrays)
 
     @staticmethod
     def get_item_with_name(s):
@@ -327,11 +329,7 @@ class VarEntities:
             else:
                 assert is_containing(indexes, type(None))
                 return va
-        else:
-            for item in VarEntities.items:
-                if isinstance(item, EVar) and item.id == s:
-                    return item
-        return None
+        return VarEntities.nameToEVar.get(s)
 
 
 class CtrEntities:
@@ -355,10 +353,13 @@ def clear():
     VarEntities.varToEVar = dict()
     VarEntities.varToEVarArray = dict()
     VarEntities.prefixToEVarArray = dict()
+    VarEntities.nameToEVar = dict()
     CtrEntities.items = []
     ObjEntities.items = []
     AnnEntities.items = []
     AnnEntities.items_types = []
     Variable.name2obj = dict()
+    Domain.pool = dict()
+    SolutionStore.reset()
     main.constraints.auxiliary.obj = None
     # Diffs.reset()
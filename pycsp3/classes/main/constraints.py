@@ -1,3 +1,4 @@
+import hashlib
 from collections import OrderedDict
 from itertools import permutations, combinations
 
@@ -12,7 +13,7 @@ from pycsp3.classes.nodes import TypeNode, Node
 from pycsp3.dashboard import options
 from pycsp3.tools import curser
 from pycsp3.tools.utilities import ANY, is_1d_list, matrix_to_string, integers_to_string, table_to_string, flatten, is_matrix, is_2d_list, error, error_if, \
-    warning, is_windows, possible_range
+    warning, is_windows, possible_range, is_ndarray
 
 
 class Parameter:
@@ -88,6 +89,20 @@ class ConstraintArgument:
         return str(self.name) + ":" + str(content)
 
 
+def _canonical_content(v):
+    # a hashable form of v such that two contents are equal (see OpOverrider.eq_protected()) iff their canonical forms are equal
+    if isinstance(v, list):
+        return list, tuple(_canonical_content(w) for w in v)
+    if isinstance(v, Variable):
+        return Variable, type(v), v.id
+    if isinstance(v, Node):
+        return Node, v.type, v.is_leaf(), _canonical_content(v.cnt) if v.is_leaf() else tuple(_canonical_content(son) for son in v.cnt)
+    if isinstance(v, tuple):
+        return tuple, tuple(_canonical_content(w) for w in v)
+    hash(v)  # raises TypeError if v is not hashable
+    return type(v), v
+
+
 class Constraint:
     def __init__(self, name):
         self.name = name
@@ -109,6 +124,19 @@ class Constraint:
             return False
         return [v for v in self.arguments.items() if str(v[0]) != "condition"] == [v for v in other.arguments.items() if str(v[0]) != "condition"]
 
+    def key_except_condition(self):
+        """
+        Returns a hashable key such that two constraints with the same key are equal except for their conditions (see equal_except_condition()),
+        False if the constraint cannot be equal to any other one, or None if no key can be built (unhashable content)
+        """
+        if len(self.attributes) > 0 or self.n_parameters > 0 or any(len(arg.attributes) > 0 for arg in self.arguments.values()):
+            return False
+        try:
+            return (self.name,) + tuple((arg.name, arg.name == TypeCtrArg.MATRIX or arg.content_compressible, arg.content_ordered, arg.lifted,
+                                         _canonical_content(arg.content)) for k, arg in self.arguments.items() if str(k) != "condition")
+        except TypeError:
+            return None
+
     def arg(self, name, content, *, attributes=None, content_compressible=True, content_ordered=False, lifted=False, adhoc=False):
         self.arguments[name] = ConstraintArgument(name, content, attributes, content_compressible, content_ordered, lifted, adhoc)
         return self
@@ -154,6 +182,14 @@ class Constraint:
             return False  # two arguments of different size cannot be currently abstracted
         return diffs
 
+    def signature(self):
+        """
+        Returns a hashable key such that close_to() can only succeed between two constraints with the same key,
+        or None if the constraint can never be merged with another one (this is used to bucket constraints when detecting groups)
+        """
+        return (type(self), tuple((str(k), str(v)) for (k, v) in self.attributes),
+                tuple((arg.name, str(arg.attributes), arg.lifted) for arg in self.arguments.values()))
+
     def parameter_form(self, p):
         length = len(p) if isinstance(p, list) else 1
         self.n_parameters += length
@@ -179,6 +215,9 @@ class ConstraintUnmergeable(Constraint):
     def close_to(self, other):
         return False
 
+    def signature(self):
+        return None
+
 
 class ConstraintWithCondition(Constraint):
     def __init__(self, name):
@@ -210,6 +249,9 @@ class ConstraintIntension(Constraint):
             return False
         return Diffs() if self.abstract_tree() == other.abstract_tree() else False
 
+    def signature(self):
+        return super().signature() + (self.abstract_tree(),)
+
 
 class ConstraintExtension(Constraint):
     cache = dict()
@@ -257,9 +299,34 @@ class ConstraintExtension(Constraint):
             table = tbl
         return table
 
+    def process_array(self, scope, table):
+        # the table is a 2-dimensional NumPy array of integers: hashing, sorting and removing duplicates are vectorized
+        import numpy as np
+        table = np.ascontiguousarray(table)
+        h = (table.shape, table.dtype.str, hashlib.blake2b(table).digest())  # the hash is computed over the raw buffer
+        domains = [x.dom for x in scope] if self.restrict_table_wrt_domains else None
+        if h in ConstraintExtension.cache:  # we need to be careful about domains when caching here
+            table_ordinary_cache, domains_cache, table_s_cache = ConstraintExtension.cache[h]
+            if domains == domains_cache:
+                self.original_small_ordinary_table = table_ordinary_cache
+                return table_s_cache
+        table = table[np.lexsort(table.T[::-1])]  # lexicographic sort (the last key of lexsort is the primary one)
+        if not options.safe_tables:
+            kept = np.ones(len(table), dtype=bool)
+            kept[1:] = np.any(table[1:] != table[:-1], axis=1)
+            table = table[kept]
+        recordable_ordinary = len(table) < 2_000
+        table_ordinary = [tuple(t) for t in table.tolist()] if recordable_ordinary else None
+        table_s = table_to_string(table, restricting_domains=domains)
+        ConstraintExtension.cache[h] = (table_ordinary, domains, table_s)
+        self.original_small_ordinary_table = table_ordinary
+        return table_s
+
     def process_table(self, scope, table):
         if len(table) == 0:
             return None
+        if is_ndarray(table):
+            return self.process_array(scope, table)
         # we compute the hash code of the table
         try:
             h = hash(tuple(table) + (self.keep_hybrid,))  # if ever we change the value of keep_hybrid
@@ -368,6 +435,10 @@ class ConstraintExtension(Constraint):
             return False
         return Diffs([(TypeCtrArg.LIST, False)])
 
+    def signature(self):
+        table = self.arguments[TypeCtrArg.SUPPORTS if TypeCtrArg.SUPPORTS in self.arguments else TypeCtrArg.CONFLICTS].content
+        return super().signature() + (len(self.arguments[TypeCtrArg.LIST].content), table)
+
 
 ''' Constraints defined from languages'''
 
@@ -384,6 +455,9 @@ class ConstraintRegular(Constraint):
         diffs = super().close_to(other)
         return False if not diffs or TypeCtrArg.TRANSITIONS in diffs.argument_names else diffs
 
+    def signature(self):
+        return super().signature() + (self.arguments[TypeCtrArg.TRANSITIONS].content,)
+
 
 class ConstraintMdd(Constraint):
     def __init__(self, lst, mdd):
@@ -824,6 +898,9 @@ class ConstraintKnapsack(ConstraintWithCondition):
     def close_to(self, other):
         return False
 
+    def signature(self):
+        return None
+
 
 class ConstraintFlow(Constraint):  # TODO inheriting from ConstraintWithCondition instead?
     def __init__(self, lst, balance, arcs, weights, condition):
@@ -1366,6 +1443,8 @@ class _Auxiliary:
         self._collected_extension_constraints = []  # notably, for element
         self.prefix = "aux_gb"
         self.cache = []
+        self.cache_index = dict()  # keys are given by key_except_condition() of cached partial constraints
+        self.cache_unkeyed = []  # cached partial constraints for which no key can be built
 
     def new_var(self, *args):
         dom = args[0] if len(args) == 1 and isinstance(args[0], Domain) else Domain(*args)
@@ -1384,6 +1463,8 @@ class _Auxiliary:
         self._introduced_variables = []
         self._collected_constraints = []
         self.cache = []
+        self.cache_index = dict()
+        self.cache_unkeyed = []
 
     def __replace(self, replaced_element, dom, *, systematically_append_obj=True):
         aux = self.new_var(dom)
@@ -1396,12 +1477,14 @@ class _Auxiliary:
 
     def replace_partial_constraint(self, pc):
         assert isinstance(pc, PartialConstraint)
+        key = pc.constraint.key_except_condition()
         if not options.dont_use_aux_cache:
-            for c, x in self.cache:
-                if pc.constraint.equal_except_condition(c):
-                    # if functions.protect().execute(pc.constraint.equal_except_condition(c)):
-                    # if functions.protect().execute(pc.constraint == c):
-                    return x
+            if key in self.cache_index:
+                return self.cache_index[key]
+            if key is None:
+                for c, x in self.cache_unkeyed:
+                    if pc.constraint.equal_except_condition(c):
+                        return x
         else:  # partial use
             if len(self.cache) > 0:
                 c, x = self.cache[0]
@@ -1418,6 +1501,10 @@ class _Auxiliary:
             values = range(pc.constraint.min_possible_value(), pc.constraint.max_possible_value() + 1)
         aux = self.__replace(pc, Domain(values))
         self.cache.append((pc.constraint, aux))
+        if key is None:
+            self.cache_unkeyed.append((pc.constraint, aux))
+        elif key is not False:
+            self.cache_index.setdefault(key, aux)
         return aux
 
     def replace_scalar_product(self, sp):
@@ -1,13 +1,48 @@
 import math
 import re
+import struct
+from array import array
+from bisect import bisect_right
 
 from pycsp3 import functions
 from pycsp3.classes import main
 from pycsp3.classes.auxiliary.enums import TypeVar
-from pycsp3.tools.utilities import error_if, flatten
+from pycsp3.tools.utilities import error_if, flatten, ANY
+
+DENSE_LIMIT = 4096  # hard coding (maximal span of an integer domain for which a bitset is built)
+
+
+def _bits_of(intervals, offset):
+    # the bitset (int) of the values in the specified intervals, with bit i corresponding to the value offset+i
+    bits = 0
+    for lo, hi in intervals:
+        bits |= ((1 << (hi - lo + 1)) - 1) << (lo - offset)
+    return bits
+
+
+def _intervals_of(bits, offset):
+    t = []
+    while bits:
+        low = (bits & -bits).bit_length() - 1  # number of trailing zeros
+        bits >>= low
+        offset += low
+        run = (~bits & (bits + 1)).bit_length() - 1  # number of trailing ones
+        t.append((offset, offset + run - 1))
+        bits >>= run
+        offset += run
+    return t
 
 
 class Domain:
+    pool = dict()  # interned domains (keys and values are the same objects), so that variables with identical domains share them
+
+    @staticmethod
+    def intern(dom):
+        """
+        Returns the domain from the pool that is equal to the specified one (after recording it, if absent)
+        """
+        return Domain.pool.setdefault(dom, dom)
+
     def __init__(self, *args):
         def set_type(d_type):
             if self.type is None:
@@ -60,9 +95,34 @@ class Domain:
                     assert v < w
             self.original_values = [v for i, v in enumerate(self.original_values) if not discard[i]]
             self.values = None  # will be defined later if necessary as either a range, or a list of int or a list of str
+        self._hash = None  # computed (and stored) when necessary
+        self._intervals = None  # sorted disjoint intervals (pairs (min,max)) of an integer domain, computed when necessary
+        self._starts = None  # the lower bounds of the intervals (for binary search)
+        self._bits = None  # bitset of a dense integer domain (bit i for the value smallest_value()+i), computed with the intervals
+        self._symbols = None  # frozenset of the values of a symbolic domain, computed when necessary
+
+    @staticmethod
+    def of_intervals(intervals):
+        """
+        Returns the (interned) integer domain composed of the values in the specified intervals (pairs (min,max)), or None if empty
+        """
+        if len(intervals) == 0:
+            return None
+        return Domain.intern(Domain([range(lo, hi + 1) if lo < hi else lo for lo, hi in intervals]))
+
+    def without(self, v):
+        """
+        Returns the (interned) domain obtained by removing the specified value, or the domain itself if the value is not present.
+        Note that interned domains are shared, and so, must never be modified in place.
+        """
+        if self.is_infinite():
+            return self
+        dom = Domain(self.original_values)
+        return Domain.intern(dom) if dom.remove(v) else self
 
     def remove(self, v):
         assert self.values is None
+        self._hash = self._intervals = self._starts = self._bits = self._symbols = None
         if v in self.original_values:
             self.original_values.remove(v)
             return True
@@ -102,6 +162,107 @@ class Domain:
                 self.values = t
         return self.values
 
+    def intervals(self):
+        """
+        Returns the sorted list of disjoint (and non-adjacent) intervals, given as pairs (min,max), composing the integer domain
+        """
+        assert self.type == TypeVar.INTEGER and not self.is_infinite()
+        if self._intervals is None:
+            t = []
+            for v in self.original_values:
+                lo, hi = (v.start, v.stop - 1) if isinstance(v, range) else (v, v)
+                if len(t) > 0 and t[-1][1] + 1 >= lo:
+                    t[-1] = (t[-1][0], max(t[-1][1], hi))
+                else:
+                    t.append((lo, hi))
+            self._starts = [lo for lo, _ in t]
+            if len(t) > 1 and t[-1][1] - t[0][0] < DENSE_LIMIT:
+                self._bits = _bits_of(t, t[0][0])
+            self._intervals = t
+        return self._intervals
+
+    def size(self):
+        """
+        Returns the number of values in the domain
+        """
+        if self.is_infinite():
+            return math.inf
+        if self.type == TypeVar.SYMBOLIC:
+            return len(self.original_values)
+        return sum(hi - lo + 1 for lo, hi in self.intervals())
+
+    def __contains__(self, v):
+        if self.type == TypeVar.SYMBOLIC:
+            if self._symbols is None:
+                self._symbols = frozenset(self.original_values)
+            return v in self._symbols
+        if self.is_infinite() or not isinstance(v, int):
+            return v in self.all_values()  # e.g., for NumPy integers
+        t = self.intervals()
+        if self._bits is not None:
+            return t[0][0] <= v <= t[-1][1] and (self._bits >> (v - t[0][0])) & 1 == 1
+        i = bisect_right(self._starts, v) - 1
+        return i >= 0 and v <= t[i][1]
+
+    def _combine(self, other, op):
+        # op is either '&' (intersection), '|' (union) or '-' (difference)
+        other = other if isinstance(other, Domain) else Domain(other)
+        assert self.type == other.type, "domains must be either both integer or both symbolic"
+        if self.type == TypeVar.SYMBOLIC:
+            s1, s2 = set(self.original_values), set(other.original_values)
+            s = s1 & s2 if op == '&' else s1 | s2 if op == '|' else s1 - s2
+            return Domain.intern(Domain(s)) if len(s) > 0 else None
+        assert not self.is_infinite() and not other.is_infinite()
+        t1, t2 = self.intervals(), other.intervals()
+        offset, last = min(t1[0][0], t2[0][0]), max(t1[-1][1], t2[-1][1])
+        if last - offset < DENSE_LIMIT:  # using bitsets
+            b1, b2 = _bits_of(t1, offset), _bits_of(t2, offset)
+            return Domain.of_intervals(_intervals_of(b1 & b2 if op == '&' else b1 | b2 if op == '|' else b1 & ~b2, offset))
+        t = []
+        if op == '|':
+            for lo, hi in sorted(t1 + t2):
+                if len(t) > 0 and t[-1][1] + 1 >= lo:
+                    t[-1] = (t[-1][0], max(t[-1][1], hi))
+                else:
+                    t.append((lo, hi))
+        else:
+            i = j = 0
+            while i < len(t1):
+                lo, hi = t1[i]
+                while j < len(t2) and t2[j][1] < lo:
+                    j += 1
+                k = j
+                while k < len(t2) and t2[k][0] <= hi:  # t2[k] overlaps the interval [lo,hi] of t1
+                    if op == '&':
+                        t.append((max(lo, t2[k][0]), min(hi, t2[k][1])))
+                    else:
+                        if lo < t2[k][0]:
+                            t.append((lo, t2[k][0] - 1))
+                        lo = t2[k][1] + 1
+                    k += 1
+                if op == '-' and lo <= hi:
+                    t.append((lo, hi))
+                i += 1
+        return Domain.of_intervals(t)
+
+    def intersection(self, other):
+        """
+        Returns the (interned) domain containing the values present in both this domain and the specified one, or None if empty
+        """
+        return self._combine(other, '&')
+
+    def union(self, other):
+        """
+        Returns the (interned) domain containing the values present in this domain or in the specified one
+        """
+        return self._combine(other, '|')
+
+    def difference(self, other):
+        """
+        Returns the (interned) domain containing the values of this domain that are not present in the specified one, or None if empty
+        """
+        return self._combine(other, '-')
+
     def is_binary(self):
         if self.type == TypeVar.SYMBOLIC:
             return False
@@ -135,10 +296,12 @@ class Domain:
         return self.all_values().__getitem__(item)
 
     def __eq__(self, other):
-        return isinstance(other, Domain) and self.type == other.type and self.original_values == other.original_values
+        return self is other or isinstance(other, Domain) and self.type == other.type and self.original_values == other.original_values
 
     def __hash__(self):
-        return super().__hash__()
+        if self._hash is None:
+            self._hash = hash((self.type, tuple(self.original_values)))
+        return self._hash
 
     def __repr__(self):
         if self.is_infinite():  # len(self.original_values) == 1 and self.original_values[0] == math.inf:
@@ -146,6 +309,211 @@ class Domain:
         return " ".join(str(v.start) + ".." + str(v.stop - 1) if isinstance(v, range) else str(v) for v in self.original_values)
 
 
+class SolutionStore:
+    """
+    The solutions found by the last solving operation, recorded as a 2-D array of 64-bit integers (in row-major order),
+    with one row per solution and one column per variable (following the order of declaration of the variables).
+    A symbolic value is recorded by its code (index in the list symbols), and * (ANY) by a special code.
+    An integer that cannot be recorded as is (not a 64-bit integer, or equal to a special code) is recorded apart (in the dict others),
+    with a special code in the array.
+    """
+
+    ANY_CODE = -(1 << 63)  # hard coding (code of *)
+    NONE_CODE = ANY_CODE + 1  # hard coding (code of a variable not assigned in a solution)
+    OTHER_CODE = ANY_CODE + 2  # hard coding (code of an integer recorded in others)
+    MAX_INT = (1 << 63) - 1
+
+    columns = dict()  # the column of each variable (key: id)
+    data = array("q")
+    n_rows = 0
+    symbols = []  # the symbolic values encountered in solutions
+    codes = dict()  # the code of each symbolic value
+    positions = dict()  # for each list of variables given to add() (key: id), the columns of its variables
+    others = dict()  # the integers that cannot be recorded in the array (key: index in the array)
+
+    @staticmethod
+    def reset(variables=()):
+        """
+        Removes all recorded solutions, and sets the columns for the specified variables (in order)
+        """
+        SolutionStore.columns = dict()
+        for x in variables:
+            SolutionStore.columns.setdefault(x.id, len(SolutionStore.columns))
+        SolutionStore.data = array("q")  # a new array, since buffers may be still exported for the previous one
+        SolutionStore.n_rows = 0
+        SolutionStore.symbols, SolutionStore.codes = [], dict()
+        SolutionStore.positions = dict()
+        SolutionStore.others = dict()
+
+    @staticmethod
+    def _code(v, index):
+        # the code of the specified value, to be recorded at the specified index of the array
+        if v is ANY:
+            return SolutionStore.ANY_CODE
+        if isinstance(v, int):
+            if SolutionStore.OTHER_CODE < v <= SolutionStore.MAX_INT:
+                return v
+            SolutionStore.others[index] = v
+            return SolutionStore.OTHER_CODE
+        code = SolutionStore.codes.get(v)
+        if code is None:
+            code = SolutionStore.codes[v] = len(SolutionStore.symbols)
+            SolutionStore.symbols.append(v)
+        return code
+
+    @staticmethod
+    def _positions(variables):
+        # the columns of the specified variables (-1 for None), or None if they are exactly the columns in order; computed once per list
+        entry = SolutionStore.positions.get(id(variables))
+        if entry is None or entry[0] is not variables:
+            columns = SolutionStore.columns
+            t = [-1 if x is None else columns.get(x.id, -1) for x in variables]
+            entry = SolutionStore.positions[id(variables)] = (variables, None if t == list(range(len(columns))) else t)
+        return entry[1]
+
+    @staticmethod
+    def add(variables, values):
+        """
+        Records a solution, given by the specified variables (possibly None) and their values
+        """
+        positions = SolutionStore._positions(variables)
+        start = len(SolutionStore.data)
+        if positions is None:  # the most usual case: all variables, in order
+            try:
+                row = array("q", values)
+                if len(row) > 0 and min(row) <= SolutionStore.OTHER_CODE:
+                    raise OverflowError  # a special code, to be recorded apart
+            except (TypeError, OverflowError):  # symbolic values, * or integers to be recorded apart
+                row = array("q", [SolutionStore._code(v, start + i) for i, v in enumerate(values)])
+        else:
+            row = array("q", [SolutionStore.NONE_CODE]) * len(SolutionStore.columns)
+            for pos, v in zip(positions, values):
+                if pos >= 0:
+                    row[pos] = SolutionStore._code(v, start + pos)
+        SolutionStore.data.extend(row)
+        SolutionStore.n_rows += 1
+
+    @staticmethod
+    def _decode(x, code, index):
+        if code == SolutionStore.ANY_CODE:
+            return ANY
+        if code == SolutionStore.NONE_CODE:
+            return None
+        if code == SolutionStore.OTHER_CODE:
+            return SolutionStore.others[index]
+        return SolutionStore.symbols[code] if isinstance(x, VariableSymbolic) else code
+
+    @staticmethod
+    def value(x, sol=-1):
+        """
+        Returns the value of the specified variable in the solution at the specified index, or None
+        """
+        col = SolutionStore.columns.get(x.id)
+        if col is None or SolutionStore.n_rows == 0:
+            return None
+        index = (sol if sol >= 0 else SolutionStore.n_rows + sol) * len(SolutionStore.columns) + col
+        return SolutionStore._decode(x, SolutionStore.data[index], index)
+
+    @staticmethod
+    def column(x):
+        """
+        Returns the list of values of the specified variable in the successive solutions
+        """
+        col = SolutionStore.columns.get(x.id)
+        if col is None:
+            return []
+        indexes = range(col, len(SolutionStore.data), len(SolutionStore.columns))
+        return [SolutionStore._decode(x, code, index) for code, index in zip(SolutionStore.data[col::len(SolutionStore.columns)], indexes)]
+
+    @staticmethod
+    def _column(x):
+        # the column of the specified variable, added (with no value in the recorded solutions) if necessary
+        col = SolutionStore.columns.get(x.id)
+        if col is None:
+            n = len(SolutionStore.columns)
+            col = SolutionStore.columns[x.id] = n
+            data, old = array("q"), SolutionStore.data
+            for i in range(SolutionStore.n_rows):
+                data.extend(old[i * n:(i + 1) * n])
+                data.append(SolutionStore.NONE_CODE)
+            SolutionStore.data = data
+            SolutionStore.others = {index // n * (n + 1) + index % n: v for index, v in SolutionStore.others.items()}
+            SolutionStore.positions = dict()  # since computed for the previous columns
+        return col
+
+    @staticmethod
+    def set_value(x, v, sol=-1):
+        """
+        Sets the value of the specified variable in the solution at the specified index (a solution being added if there is none)
+        """
+        col = SolutionStore._column(x)
+        if SolutionStore.n_rows == 0:
+            SolutionStore.add([], [])
+        index = (sol if sol >= 0 else SolutionStore.n_rows + sol) * len(SolutionStore.columns) + col
+        SolutionStore.others.pop(index, None)
+        SolutionStore.data[index] = SolutionStore.NONE_CODE if v is None else SolutionStore._code(v, index)
+
+    @staticmethod
+    def set_column(x, values):
+        """
+        Sets the values of the specified variable in the successive solutions (solutions being added if there are less of them)
+        """
+        SolutionStore._column(x)
+        while SolutionStore.n_rows < len(values):
+            SolutionStore.add([], [])
+        for sol in range(SolutionStore.n_rows):
+            SolutionStore.set_value(x, values[sol] if sol < len(values) else None, sol)
+
+    @staticmethod
+    def names():
+        """
+        Returns the names of the variables, in the order of the columns
+        """
+        return list(SolutionStore.columns)
+
+    @staticmethod
+    def _check_others():
+        error_if(len(SolutionStore.others) > 0, "Some integers in solutions are not 64-bit integers (or are reserved codes): "
+                 + str(sorted(set(SolutionStore.others.values()))[:5]) + "; the solutions cannot be exported as a 2-D array of 64-bit integers")
+
+    @staticmethod
+    def as_buffer():
+        """
+        Returns a read-only 2-D view (memoryview, with format 'q') of the recorded solutions, without any copy;
+        it can be given to numpy.asarray() or pyarrow.py_buffer(), for example.
+        No more solution can be recorded while such a view is alive.
+        """
+        SolutionStore._check_others()
+        view = memoryview(SolutionStore.data).toreadonly()
+        return view.cast("B").cast("q", (SolutionStore.n_rows, len(SolutionStore.columns)))
+
+    @staticmethod
+    def to_numpy():
+        """
+        Returns a 2-D numpy array with (a copy of) the recorded solutions (numpy must be installed).
+        Being a copy, the array can be kept while other solutions are recorded; see as_buffer() for a view without any copy.
+        """
+        import numpy as np
+        SolutionStore._check_others()
+        return np.array(np.frombuffer(SolutionStore.data, dtype=np.int64), copy=True).reshape(SolutionStore.n_rows, len(SolutionStore.columns))
+
+    @staticmethod
+    def save(filename):
+        """
+        Saves the recorded solutions in the specified file, in the .npy format (numpy being not required)
+        """
+        SolutionStore._check_others()
+        header = "{'descr': '<i8', 'fortran_order': False, 'shape': (" + str(SolutionStore.n_rows) + ", " + str(len(SolutionStore.columns)) + "), }"
+        header += " " * (63 - (len(header) + 10) % 64) + "\n"  # the total length of the preamble must be a multiple of 64
+        with open(filename, "wb") as f:
+            f.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1"))
+            data = SolutionStore.data
+            if struct.pack("=q", 1) != struct.pack("<q", 1):  # big-endian platform
+                data = array("q", data)
+                data.byteswap()
+            data.tofile(f)
+
+
 class Variable:
     name2obj = dict()  # Dictionary (keys: names of variables - values: variable objects)
 
@@ -223,7 +591,7 @@ class Variable:
 
     def __init__(self, name, dom, *, inverse=False, negation=False):
         self.id = name
-        self.dom = dom
+        self.dom = Domain.intern(dom) if isinstance(dom, Domain) else dom
         pos = self.id.find("[")
         if pos == -1:
             self.indexes = None
@@ -232,8 +600,22 @@ class Variable:
             self.indexes = [int(v) for v in re.split("]\\[", self.suffix[1:-1])]
         self.inverse = inverse  # arithmetic inverse
         self.negation = negation  # logical negation
-        self.value = None  # value of the last found solution
-        self.values = []  # values of the successive found solutions
+
+    @property
+    def value(self):  # value of the last found solution
+        return SolutionStore.value(self)
+
+    @value.setter
+    def value(self, v):
+        SolutionStore.set_value(self, v)
+
+    @property
+    def values(self):  # values of the successive found solutions
+        return SolutionStore.column(self)
+
+    @values.setter
+    def values(self, t):
+        SolutionStore.set_column(self, t)
 
     def name(self, name):
         def _valid_identifier(s):
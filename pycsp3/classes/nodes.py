@@ -550,7 +550,9 @@ class Node(Entity):
     @staticmethod
     def build(node_type, *args):
         if node_type in (DIV, MOD) and len(args) == 2 and isinstance(args[1], Variable):
-            removed = args[1].dom.remove(0)
+            dom = args[1].dom.without(0)  # domains are shared, and so are never modified in place
+            removed = dom is not args[1].dom
+            args[1].dom = dom
             warning_if(removed, "value 0 removed from the domain of " + str(args[1]) + " because involved in a division")
         tn = TypeNode.value_of(node_type)  # for handling the cases where type is of type str or TypeConditionOperator
         if tn is SET:
@@ -4,22 +4,31 @@ import lzma
 import os
 import os.path
 import platform
+import shutil
+import subprocess
 import sys  # for DataVisitor import ast, inspect
-from collections import OrderedDict
+import tempfile
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from multiprocessing import cpu_count
 from importlib import util
 
 from lxml import etree
 
 
+from pycsp3.classes.entities import VarEntities, ObjEntities
 from pycsp3.dashboard import options
 from pycsp3.problems.data import parsing
+from pycsp3.tools import cacher
 from pycsp3.tools.aggregator import build_similar_constraints
 from pycsp3.tools.compactor import build_compact_forms
 from pycsp3.tools.curser import OpOverrider, convert_to_namedtuples, is_namedtuple
 from pycsp3.tools.inspector import build_dynamic_object
+from pycsp3.tools.profiler import Profiler, profiled
 from pycsp3.tools.slider import handle_slides
 from pycsp3.tools.utilities import Stopwatch, GREEN, WHITE, Error, error
-from pycsp3.tools.xcsp import build_document
+from pycsp3.tools.xcsp import build_document, write_document, StreamedDocument
 
 None_Values = ['None', '', 'null']  # adding 'none'?
 
@@ -35,11 +44,32 @@ class Compilation:
     done = False
     pathname = ""
     filename = ""
+    cache_key = None  # key of the compilation in the persistent cache, or None if the cache cannot be used
 
     @staticmethod
     def load(console=False):
         _load(console=console)
 
+    @staticmethod
+    def load_from_cache():
+        """
+        Returns True if the compiled form of the model (with the current data and options) is found in the cache,
+        in which case the XCSP3 file is directly generated from it (and the model has not to be executed)
+        """
+        if Compilation.cache_key is None:
+            return False
+        fullname, _ = _fullname()
+        if not cacher.lookup(Compilation.cache_key, fullname):
+            return False
+        print("  * Generating the file " + fullname + " (from the cache) completed in " + GREEN + Compilation.stopwatch.elapsed_time() + WHITE + " seconds.")
+        _record_output(fullname)
+        if options.lzma:
+            with open(fullname, "rb") as f, lzma.open(fullname + ".lzma", "w") as g:
+                shutil.copyfileobj(f, g)
+            print("\tGeneration of the file " + fullname + ".lzma completed.\n")
+        Compilation.done = True
+        return True
+
     @staticmethod
     def set_path_file_name(name):
         if name is None or len(name) == 0:
@@ -57,19 +87,21 @@ class Compilation:
             Compilation.filename = name if len(name) == 0 or name.endswith(".xml") else name + ".xml"
 
     @staticmethod
-    def compile(filename="", disabling_opoverrider=False, verbose=1):
+    def compile(filename="", disabling_opoverrider=False, verbose=1, in_memory=False):
         # functions.satisfy_from_auxiliary()
         Compilation.set_path_file_name(filename)
-        return _compile(disabling_opoverrider, verbose=verbose)
+        return _compile(disabling_opoverrider, verbose=verbose, in_memory=in_memory)
 
 
 def _load_options():
     # note that parser and export are automatically rewritten as dataparser and dataexport
-    options.set_values("data", "dataparser", "dataexport", "dataformat", "variant", "to_csp", "checker", "solver", "output", "suffix", "callback")
+    options.set_values("data", "dataparser", "dataexport", "dataformat", "variant", "to_csp", "checker", "solver", "output", "suffix", "callback",
+                       "cache_dir", "cache_size", "log_tail", "output_record")
     options.set_flags("dataexport", "data_sober", "solve", "display", "verbose", "lzma", "sober", "ev", "safe", "recognize_slides", "keep_hybrid",
                       "keep_smart_transitions", "keep_sum", "unchange_scalar", "restrict_tables_wrt_domains", "dont_run_compactor", "dont_compact_Values",
                       "group_sum_coeffs", "use_meta", "dont_use_aux_cache", "dont_adjust_indexing", "dont_build_similar_constraints", "debug", "mini",
-                      "uncurse", "exist_by_element", "safe_tables", "force_element_index", "dont_display_warnings", "accept_and_or_extensional_use")
+                      "uncurse", "exist_by_element", "safe_tables", "force_element_index", "dont_display_warnings", "accept_and_or_extensional_use", "no_cache",
+                      "cache", "profile", "profile_stats", "profile_allocations", "log_lzma", "pipe", "solve_cache")
 
     if options.checker is None:
         options.checker = "fast"
@@ -216,11 +248,13 @@ def _load(*, console=False):
 
     _load_options()
     if console is False:
-        Compilation.model, Compilation.string_model = _load_model()
-        if options.dataparser:
-            Compilation.data, Compilation.string_data = _load_dataparser(options.dataparser, options.data)
-        else:
-            Compilation.data, Compilation.string_data = _load_data()
+        with profiled("model load"):
+            Compilation.model, Compilation.string_model = _load_model()
+        with profiled("data load"):
+            if options.dataparser:
+                Compilation.data, Compilation.string_data = _load_dataparser(options.dataparser, options.data)
+            else:
+                Compilation.data, Compilation.string_data = _load_data()
         Compilation.data = convert_to_namedtuples(Compilation.data)
         Compilation.string_data = Compilation.string_data.replace("/", "-")
         Compilation.original_data = Compilation.data
@@ -228,6 +262,12 @@ def _load(*, console=False):
             Compilation.data = None
         elif len(Compilation.data) == 1:
             Compilation.data = Compilation.data[0]  # the value instead of a tuple of size 1
+        if os.path.isfile(sys.argv[0]):  # the model may also be executed without any source file (e.g., python -c)
+            with open(sys.argv[0], encoding='utf-8') as f:
+                model_source = f.read()
+            if cacher.cacheable(model_source):
+                Compilation.cache_key = cacher.cache_key(model_source, Compilation.data)
+        Profiler.start("model execution")  # stopped when compiling
     else:
         Compilation.string_model = "Console"
         Compilation.string_data = ""
@@ -293,7 +333,81 @@ def default_data(filename):
     return load_json_data(filename, storing=True)
 
 
-def _compile(disabling_opoverrider=False, verbose=1):
+CompilationOutcome = namedtuple("CompilationOutcome", ("data", "filename", "wck", "error"))
+
+
+def _record_output(fullname):
+    # writes the name of the generated file into the file specified with the option -output_record (used by compile_many)
+    if options.output_record:
+        with open(options.output_record, "w", encoding="utf-8") as f:
+            f.write(os.path.abspath(fullname))
+
+
+def _compile_in_fresh_process(model, data, args, timeout):
+    stopwatch = Stopwatch()
+    fd, record = tempfile.mkstemp(prefix="pycsp3-", suffix=".out")  # the child process writes there the name of the generated file
+    os.close(fd)
+    try:
+        try:
+            p = subprocess.run([sys.executable, model, "-data=" + data, "-output_record=" + record] + args, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return CompilationOutcome(data, None, stopwatch.elapsed_time(), "Timeout after " + str(timeout) + " seconds")
+        with open(record, encoding="utf-8") as f:
+            filename = f.read()
+    finally:
+        os.remove(record)
+    if p.returncode == 0 and len(filename) > 0:
+        return CompilationOutcome(data, filename, stopwatch.elapsed_time(), None)
+    lines = [line for line in (p.stdout + p.stderr).splitlines() if line.strip()]
+    return CompilationOutcome(data, None, stopwatch.elapsed_time(), "\n".join(lines[-10:]) if lines else "Exit code " + str(p.returncode))
+
+
+def compile_many(model, data, *, workers=None, args="", timeout=None):
+    """
+    Compiles the specified model with each of the specified data (typically, names of JSON files), and generates
+    the outcomes (data, filename, wck, error) as soon as compilations are finished (so, not necessarily in the order of the data).
+    Because the state of the compiler is global, each compilation is executed in a fresh Python process,
+    at most 'workers' compilations being run at the same time.
+
+    :param model: the path of a Python file containing a PyCSP3 model
+    :param data: a list of data (names of JSON files, or any value accepted by the option -data)
+    :param workers: the maximum number of simultaneous compilations (the number of cores if None)
+    :param args: other options given to the compiler (e.g., "-variant=table -lzma"), as a string or a list
+    :param timeout: the maximum number of seconds for each compilation, or None
+    :return: a generator of CompilationOutcome objects
+    """
+    args = args.split() if isinstance(args, str) else list(args)
+    with ThreadPoolExecutor(max_workers=workers if workers else cpu_count()) as executor:
+        futures = [executor.submit(_compile_in_fresh_process, model, d, args, timeout) for d in data]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:  # if the generator is closed before the end, pending compilations are cancelled
+            for future in futures:
+                future.cancel()
+
+
+def _fullname():
+    filename_prefix = None
+    assert options.output is None or options.suffix is None
+    if Compilation.filename == "" and options.output is not None:  # why the first part of the condition?
+        Compilation.set_path_file_name(options.output)
+    if len(Compilation.filename) > 0:
+        if Compilation.filename.endswith(".xml"):
+            filename_prefix = Compilation.filename[:-4]  # can be useful if data are exported
+        fullname = Compilation.pathname + Compilation.filename
+    else:
+        same_prefix = Compilation.string_data.startswith("-" + Compilation.string_model)
+        suffix = Compilation.string_data if not same_prefix else Compilation.string_data[1 + len(Compilation.string_model):]
+        filename_prefix = Compilation.string_model + ("-" + options.variant if options.variant else "") + suffix
+        fullname = Compilation.pathname + filename_prefix + ".xml"
+    if options.suffix:
+        fullname = fullname + options.suffix if not fullname.endswith(".xml") else fullname[:-4] + options.suffix + ".xml"
+    return fullname, filename_prefix
+
+
+def _compile(disabling_opoverrider=False, verbose=1, in_memory=False):
+    # if in_memory is True, a StreamedDocument is returned (instead of the name of the generated file)
     # used to save data in jSON
     def prepare_for_json(obj):
         if is_namedtuple(obj):
@@ -313,40 +427,33 @@ def _compile(disabling_opoverrider=False, verbose=1):
     if disabling_opoverrider:
         OpOverrider.disable()
 
-    assert options.output is None or options.suffix is None
-    if Compilation.filename == "" and options.output is not None:  # why the first part of the condition?
-        Compilation.set_path_file_name(options.output)
-    if len(Compilation.filename) > 0:
-        if Compilation.filename.endswith(".xml"):
-            filename_prefix = Compilation.filename[:-4]  # can be useful if data are exported
-        fullname = Compilation.pathname + Compilation.filename
-    else:
-        same_prefix = Compilation.string_data.startswith("-" + Compilation.string_model)
-        suffix = Compilation.string_data if not same_prefix else Compilation.string_data[1 + len(Compilation.string_model):]
-        filename_prefix = Compilation.string_model + ("-" + options.variant if options.variant else "") + suffix
-        fullname = Compilation.pathname + filename_prefix + ".xml"
-    if options.suffix:
-        fullname = fullname + options.suffix if not fullname.endswith(".xml") else fullname[:-4] + options.suffix + ".xml"
+    Profiler.stop()
+    fullname, filename_prefix = _fullname()
     stopwatch = Stopwatch()
     options.verbose and print("  PyCSP3 (Python:" + platform.python_version() + ", Path:" + os.path.abspath(__file__) + ")\n")
     if not options.dont_build_similar_constraints:
-        build_similar_constraints()
+        with profiled("build_similar_constraints"):
+            build_similar_constraints()
     options.verbose and print("\tWCK for generating groups:", stopwatch.elapsed_time(reset=True), "seconds")
-    handle_slides()
+    with profiled("handle_slides"):
+        handle_slides()
     options.verbose and print("\tWCK for handling slides:", stopwatch.elapsed_time(reset=True), "seconds")
     if options.dont_run_compactor is False:
-        build_compact_forms()
+        with profiled("build_compact_forms"):
+            build_compact_forms()
         options.verbose and print("\tWCK for compacting forms:", stopwatch.elapsed_time(reset=True), "seconds")
 
+    cop, document = False, None
     if options.callback is not None:
         obj = build_dynamic_object(options.callback, options.callback)
         obj.loadInstance()
 
-        root = None
-
-    else:
-        root = build_document()
+    elif options.display or len(VarEntities.items) == 0:
+        with profiled("build_document"):
+            root = build_document()
         if root is not None:
+            Profiler.start("file write")
+            cop = root.attrib and root.attrib["type"] == "COP"
             pretty_text = etree.tostring(root, pretty_print=True, xml_declaration=False, encoding='UTF-8').decode("UTF-8")
             if options.display:
                 print("\n", pretty_text)
@@ -355,34 +462,66 @@ def _compile(disabling_opoverrider=False, verbose=1):
                     f.write(pretty_text)
                     if verbose > 0:
                         print("  * Generating the file " + fullname + " completed in " + GREEN + Compilation.stopwatch.elapsed_time() + WHITE + " seconds.")
+                _record_output(fullname)
             if options.lzma:
                 with lzma.open(fullname + ".lzma", "w") as f:
                     f.write(bytes(pretty_text, 'utf-8'))
                     print("\tGeneration of the file " + fullname + ".lzma completed.\n")
             options.verbose and print("\tWCK for generating files:", stopwatch.elapsed_time(reset=True), "seconds")
 
-        if options.dataexport:
-            if isinstance(options.dataexport, bool):
-                if options.data is None:
-                    json_prefix = "data" + Compilation.string_data
-                elif options.dataparser is None:
-                    json_prefix = filename_prefix
-                else:
-                    if options.data[0] == '[':
-                        assert options.data[-1] == ']'
-                        json_prefix = "-".join(_basic_token(tok) for tok in options.data[1:-1].split(","))
-                    else:
-                        json_prefix = _basic_token(options.data) if options.data else None
-                    # json_prefix = options.data.split(os.sep)[-1].split(".")[:1][0] if options.dataparser else filename_prefix
-                # TODO if data are given with name as e.g., in [k=3,l=9,b=0,r=0,v=9] for BIBD, maybe we should sort them
+    elif in_memory:  # the document is generated (element by element) only when given to the solver, without being written in a file
+        document, cop = StreamedDocument(write_document), len(ObjEntities.items) > 0
+        if options.lzma:
+            with profiled("build_document"), lzma.open(fullname + ".lzma", "w") as f:
+                write_document(*Profiler.timed([f]))
+            Profiler.split_writes("file write")
+        if verbose > 0:
+            print("  * Compiling the model (the document being streamed to the solver) completed in " + GREEN + Compilation.stopwatch.elapsed_time()
+                  + WHITE + " seconds.")
+        if options.lzma:
+            print("\tGeneration of the file " + fullname + ".lzma completed.\n")
+        options.verbose and print("\tWCK for generating files:", stopwatch.elapsed_time(reset=True), "seconds")
+
+    else:  # the document is streamed (element by element) into the file(s), without building the whole lxml tree
+        with profiled("build_document"), ExitStack() as stack:
+            outputs = [stack.enter_context(open(fullname, "wb"))]
+            if options.lzma:
+                outputs.append(stack.enter_context(lzma.open(fullname + ".lzma", "w")))
+            cop = write_document(*Profiler.timed(outputs))
+        Profiler.split_writes("file write")  # building the document and writing it are interleaved, but reported as two phases
+        if Compilation.cache_key is not None:
+            cacher.store(Compilation.cache_key, fullname)
+        _record_output(fullname)
+        if verbose > 0:
+            print("  * Generating the file " + fullname + " completed in " + GREEN + Compilation.stopwatch.elapsed_time() + WHITE + " seconds.")
+        if options.lzma:
+            print("\tGeneration of the file " + fullname + ".lzma completed.\n")
+        options.verbose and print("\tWCK for generating files:", stopwatch.elapsed_time(reset=True), "seconds")
+
+    if options.callback is None and options.dataexport:
+        if isinstance(options.dataexport, bool):
+            if options.data is None:
+                json_prefix = "data" + Compilation.string_data
+            elif options.dataparser is None:
+                json_prefix = filename_prefix
             else:
-                json_prefix = str(options.dataexport)
-            with open(Compilation.pathname + json_prefix + '.json', 'w') as f:
-                json.dump(prepare_for_json(Compilation.original_data if Compilation.original_data else Compilation.data), f)
-            print("  * Saving data in the file " + (Compilation.pathname + json_prefix) + '.json' + " completed.")
+                if options.data[0] == '[':
+                    assert options.data[-1] == ']'
+                    json_prefix = "-".join(_basic_token(tok) for tok in options.data[1:-1].split(","))
+                else:
+                    json_prefix = _basic_token(options.data) if options.data else None
+                # json_prefix = options.data.split(os.sep)[-1].split(".")[:1][0] if options.dataparser else filename_prefix
+            # TODO if data are given with name as e.g., in [k=3,l=9,b=0,r=0,v=9] for BIBD, maybe we should sort them
+        else:
+            json_prefix = str(options.dataexport)
+        with open(Compilation.pathname + json_prefix + '.json', 'w') as f:
+            json.dump(prepare_for_json(Compilation.original_data if Compilation.original_data else Compilation.data), f)
+        print("  * Saving data in the file " + (Compilation.pathname + json_prefix) + '.json' + " completed.")
 
+    Profiler.save(fullname[:-4] if fullname.endswith(".xml") else fullname)
     Compilation.done = True
-    cop = root is not None and root.attrib and root.attrib["type"] == "COP"
+    if in_memory:
+        return document, cop
     return fullname, cop
 
 
@@ -20,12 +20,13 @@ from pycsp3.classes.main.constraints import (
     ConstraintBinPacking, ConstraintKnapsack, ConstraintFlow, ConstraintCircuit, ConstraintClause, ConstraintAdhoc, ConstraintRefutation,
     ConstraintDummyConstant, ConstraintSlide, PartialConstraint, ScalarProduct, auxiliary, manage_global_indirection)
 from pycsp3.classes.main.objectives import ObjectiveExpression, ObjectivePartial
-from pycsp3.classes.main.variables import Domain, Variable, VariableInteger, VariableSymbolic
+from pycsp3.classes.main.variables import Domain, Variable, VariableInteger, VariableSymbolic, SolutionStore
 from pycsp3.classes.nodes import TypeNode, Node
 from pycsp3.dashboard import options
 from pycsp3.tools.curser import queue_in, columns, OpOverrider, ListInt, ListVar, ListMultipleVar, ListCtr, cursing, convert_to_namedtuples
 from pycsp3.tools.inspector import checkType, extract_declaration_for, comment_and_tags_of, comments_and_tags_of_parameters_of
-from pycsp3.tools.utilities import (flatten, is_containing, is_1d_list, is_1d_tuple, is_matrix, ANY, ALL, error, warning, warning_if, error_if, is_2d_list)
+from pycsp3.tools.utilities import (flatten, is_containing, is_1d_list, is_1d_tuple, is_matrix, ANY, ALL, error, warning, warning_if, error_if, is_2d_list,
+                                    is_ndarray)
 
 from pycsp3.classes.auxiliary.tables import to_starred_table_for_no_overlap1, to_starred_table_for_no_overlap2
 
@@ -796,9 +797,14 @@ def _Extension(*, scope, table, positive=True):
     scope = flatten(scope)
     assert len(scope) == len(set(scope))
     checkType(scope, [Variable])
+    checkType(positive, bool)
+    if is_ndarray(table):  # a 2-dimensional array of integers is kept as it is (see ConstraintExtension)
+        assert table.ndim == 2 and table.shape[1] == len(scope) and table.dtype.kind in "iu", \
+            "A table given as an array must be a 2-dimensional array of integers, with as many columns as variables in the scope"
+        assert len(table) > 0, "A table must be a non-empty array of tuples"
+        return ECtr(ConstraintExtension(scope, table, positive, options.keep_hybrid, options.restrict_tables_wrt_domains))
     assert isinstance(table, list)
     assert len(table) > 0, "A table must be a non-empty list of tuples or integers (or symbols)"
-    checkType(positive, bool)
 
     if len(table) < 100 and any(isinstance(t, (list, types.GeneratorType)) for t in table):  # TODO hard coding (100)
         new_table = []
@@ -837,8 +843,8 @@ def Table(*, scope, supports=None, conflicts=None):
     Builds and returns a constraint Table.
 
     :param scope: the sequence of (distinct) involved variables
-    :param supports: the set/list of tuples, seen as supports (positive table)
-    :param conflicts: the set/list of tuples, seen as conflicts (negative table)
+    :param supports: the set/list of tuples (or 2-dimensional NumPy array of integers), seen as supports (positive table)
+    :param conflicts: the set/list of tuples (or 2-dimensional NumPy array of integers), seen as conflicts (negative table)
 
     :return: a constraint Table (Extension)
     """
@@ -846,7 +852,10 @@ def Table(*, scope, supports=None, conflicts=None):
     assert scope is not None and (supports is None) != (conflicts is None)
     positive = supports is not None
     table = supports if positive else conflicts
-    table = list(table)  # if isinstance(table, (tuple, set, frozenset, types.GeneratorType)) else table
+    if is_ndarray(table):
+        table = table.ravel().tolist() if len(scope) == 1 else table  # for a non-unary table, the array is kept (avoiding building tuples)
+    else:
+        table = list(table)  # if isinstance(table, (tuple, set, frozenset, types.GeneratorType)) else table
     if not positive and len(conflicts) == 0:
         return None
     return _Extension(scope=scope, table=table, positive=positive)
@@ -2412,8 +2421,8 @@ def value(model_variable, *, sol=-1):
     :param model_variable: a variable of the model
     :param sol: the index of a found solution
     """
-    assert isinstance(model_variable, Variable) and len(model_variable.values) > 0
-    return model_variable.values[sol]
+    assert isinstance(model_variable, Variable) and SolutionStore.n_rows > 0
+    return SolutionStore.value(model_variable, sol)
 
 
 def values(model_variables, *model_variables_complement, sol=-1):
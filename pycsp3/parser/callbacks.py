@@ -55,6 +55,10 @@ class Callbacks:
         pass  # not sure that overriding this method it can be useful
 
     def load_constraints(self, entries):
+        """
+        Called before the constraints are loaded, with the list of their entries (blocks, groups, slides and constraints).
+        In streaming mode (see ParserXCSP3), the top-level entries are not known in advance, and an empty list is given instead.
+        """
         self._unimplemented(entries, general_method=True)
 
     def load_block(self, block):
@@ -10,6 +10,8 @@ DELIMITER_SETS = "\s*\}\s*\{\s*|\s*\{\s*|\s*\}\s*"
 
 VALID_IDENTIFIER = "[a-zA-Z][_a-zA-Z0-9\[\]]*"
 
+VARIABLES, CONSTRAINTS, OBJECTIVES, ANNOTATIONS = "variables", "constraints", "objectives", "annotations"
+
 ID = "id"
 CLASS = "class"
 AS = "as"
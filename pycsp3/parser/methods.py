@@ -1,6 +1,4 @@
 import re
-from io import StringIO
-from numpy import loadtxt
 from xml.etree.ElementTree import Element
 
 from pycsp3.classes.auxiliary.conditions import Condition, ConditionVariable
@@ -15,9 +13,14 @@ from pycsp3.tools.utilities import ANY
 re_lists = re.compile(DELIMITER_LISTS)
 re_whitespace = re.compile(DELIMITER_WHITESPACE)
 re_two_dots = re.compile(DELIMITER_TWO_DOTS)
+re_empty_tuple = re.compile(r"\(\s*\)")
 
 is_int = re.compile(r'^-?\d+$').match
 
+# for the vectorized parsing of ordinary/starred tuples: parentheses and commas become whitespace, and * is replaced by a sentinel value
+TUPLE_DELIMITERS = str.maketrans("(),", "   ")
+STAR_SENTINEL = -(1 << 63)  # hard coding (the smallest 64-bit integer, assumed to never occur in tables)
+
 
 # A class to represent several occurrences of the same value.
 class Occurrences:
@@ -252,10 +255,67 @@ def parse_symbolic_tuple(s, domains=None):
     return t, starred
 
 
+def _domain_values(dom):
+    # returns the set of values in the specified parsed domain (list of integers and ranges, or list of symbols)
+    return {v for w in dom for v in (w if isinstance(w, range) else (w,))}
+
+
+def parse_ordinary_tuples(s, domains=None):
+    """
+    Parses the specified string of ordinary/starred tuples, of the form (a,b,c)(d,e,f)..., with NumPy, and returns the list of tuples
+    (lists, with ANY for *), discarding the tuples with a value not present in the domains (sets of values, one per column) if specified.
+    Returns None if NumPy is not available or if the string is not a well-formed table of integers (so that the usual parsing must be performed).
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    n_tuples, n_stars = s.count("("), s.count("*")
+    if n_tuples == 0 or n_tuples != s.count(")") or (n_stars > 0 and str(STAR_SENTINEL) in s) or re_empty_tuple.search(s):
+        return None
+    try:
+        a = numpy.fromstring(s.translate(TUPLE_DELIMITERS).replace("*", str(STAR_SENTINEL)), dtype=numpy.int64, sep=" ")
+    except ValueError:  # a token that is not an integer
+        return None
+    arity = len(a) // n_tuples
+    if arity == 0 or len(a) != n_tuples * arity:
+        return None
+    chars = numpy.frombuffer(s.encode(), dtype=numpy.uint8)
+    padded = numpy.concatenate(([0], chars, [0]))
+    after_signs = padded[numpy.flatnonzero(chars == ord("-")) + 2]
+    if numpy.any((after_signs < ord("0")) | (after_signs > ord("9"))):  # e.g., (- 1,2), not accepted by the usual parsing
+        return None
+    if n_stars > 0:
+        positions = numpy.flatnonzero(chars == ord("*"))
+        before, after = padded[positions], padded[positions + 2]
+        if numpy.any(((before != ord("(")) & (before != ord(","))) | ((after != ord(")")) & (after != ord(",")))):  # e.g., (1, *)
+            return None
+    commas = numpy.cumsum(chars == ord(","))
+    if numpy.any(numpy.diff(commas[chars == ord("(")], append=commas[-1]) != arity - 1):  # each tuple must have the same arity
+        return None
+    stars = a == STAR_SENTINEL
+    if numpy.count_nonzero(stars) != n_stars or numpy.any(a == numpy.iinfo(numpy.int64).max):  # values out of 64-bit integers are saturated
+        return None
+    a, stars = a.reshape(n_tuples, arity), stars.reshape(n_tuples, arity)
+    if domains is not None:
+        assert len(domains) == arity
+        mask = numpy.ones(n_tuples, dtype=bool)
+        for i, dom in enumerate(domains):
+            mask &= numpy.isin(a[:, i], numpy.fromiter(dom, dtype=numpy.int64, count=len(dom))) | stars[:, i]
+        a, stars = a[mask], stars[mask]
+    m = a.tolist()
+    if n_stars > 0:
+        for i in numpy.flatnonzero(stars.any(axis=1)).tolist():
+            m[i] = [ANY if star else v for v, star in zip(m[i], stars[i].tolist())]
+    return m
+
+
 def parse_tuples(elt, symbolic, domains=None):
     s = elt.text.strip()
     if len(s) == 0:
         return None, False, False
+    if domains is not None:
+        domains = [_domain_values(dom) for dom in domains]
     if s[0] != '(':  # if unary (when left parenthesis not present as first character)
         tokens = re.split(DELIMITER_WHITESPACE, s)
         assert all(tok != "*" for tok in tokens)  # ANY not handled in unary lists
@@ -267,8 +327,8 @@ def parse_tuples(elt, symbolic, domains=None):
                 return [parse_integer_or_interval(tok) for tok in tokens], False, False
             return [value for tok in tokens if (value := int(tok),) and (domains is None or value in domains[0])], False, domains is not None
     starred = ("*" in s)
-    if True:  # symbolic or (domains is not None) or starred:
-        # original code, some tweaks
+    m = None if symbolic else parse_ordinary_tuples(s, domains)  # vectorized parsing, when possible
+    if m is None:
         func = parse_symbolic_tuple if symbolic else parse_ordinary_tuple  # reference to function
         tokens = re_lists.split(s[1:-1])  # cut first and last '(', ')'
         m = []
@@ -276,10 +336,4 @@ def parse_tuples(elt, symbolic, domains=None):
             t, tok_is_star = func(tok, domains)
             if t is not None:  # if not filtered-out parsed tuple
                 m.append(t)
-    # else: DISABLED till tested more thoroughly (e.g. instancesXCSP22/MiniCOP/Fapp-ext-01-0200_c18.xml)
-    #    # optimized code for non-symbolic, non-star, non-domains case with NumPy
-    #    csv_string = s[1:-1].replace(')(','\n')  # convert to CSV
-    #    array = loadtxt(StringIO(csv_string), delimiter=',', dtype=int)
-    #    m = array.tolist()  # this part is the most time consuming
-
     return m, starred, domains is not None
@@ -0,0 +1,192 @@
+"""
+Binary snapshots of parsed XCSP3 instances, so that an instance parsed once can be loaded back in a few milliseconds.
+
+A snapshot is composed of a header (pickle of the entries of the parser) followed by the integer tables (supports and conflicts),
+stored as 64-bit integers (STAR_SENTINEL for *) when NumPy is available. By default, the tables are given back to the callbacks
+exactly as after parsing (lists of tuples, with ANY for *). If arrays are requested, the tables without * are given as read-only
+2-dimensional NumPy arrays memory-mapped from the snapshot (so that several processes loading the same snapshot share the same pages
+of table data); the callbacks must then accept such arrays. Snapshots are stored in the cache directory (see tools/cacher.py),
+and are keyed by the content (hash and size) of the XCSP3 file, so that a modified file is automatically parsed again.
+"""
+import hashlib
+import os
+import pickle
+import struct
+
+from pycsp3.classes.auxiliary.enums import TypeCtr
+from pycsp3.parser.constants import STARRED
+from pycsp3.parser.methods import STAR_SENTINEL
+from pycsp3.parser.xentries import XBlock, XGroup, XSlide, XCtr
+from pycsp3.parser.xparser import ParserXCSP3
+from pycsp3.tools import cacher
+from pycsp3.tools.utilities import ANY
+
+MAGIC = b"PYCSP3-SNAPSHOT2"  # hard coding
+ALIGNMENT = 64  # hard coding (in bytes, for the table data following the header)
+
+STATE = ("vEntries", "cEntries", "oEntries", "aEntries", "map_for_vars", "map_for_arrays", "framework", "discarded_classes")
+
+
+def _numpy():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def _aligned(n):
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def snapshot_key(filename, discarded_classes=None):
+    """
+    Returns the key (hash) identifying the snapshot of the specified XCSP3 file, given its content and size,
+    the discarded classes and the state of the library
+    """
+    h = hashlib.sha256()
+    for piece in (cacher._fingerprint(), str(os.path.getsize(filename)), " ".join(sorted(discarded_classes or ()))):
+        h.update(piece.encode("UTF-8"))
+        h.update(b"\0")
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _integer_tables(entries, harvest):
+    # collects the integer tables (lists of tuples) of the specified constraint entries, with the flag indicating if they are starred
+    for e in entries:
+        if isinstance(e, XBlock):
+            _integer_tables(e.subentries, harvest)
+        elif isinstance(e, (XGroup, XSlide)):
+            _integer_tables([e.template], harvest)
+        elif isinstance(e, XCtr) and e.type == TypeCtr.EXTENSION:
+            arg = e.ctr_args[-1]
+            table = arg.value
+            if isinstance(table, list) and len(table) > 0 and isinstance(table[0], list) \
+                    and all(v is ANY or (isinstance(v, int) and STAR_SENTINEL < v < (1 << 63)) for t in table for v in t):
+                harvest[id(table)] = (table, STARRED in arg.flags)
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, file, tables):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.tables = tables  # map (id of table) -> (start, n_tuples, arity, starred)
+
+    def persistent_id(self, obj):
+        if obj is ANY:  # for keeping the identity of ANY
+            return "*"
+        return self.tables.get(id(obj))
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, data, arrays):
+        super().__init__(file)
+        self.data = data  # function returning the memory-mapped table data
+        self.arrays = arrays  # True if tables without * must be given as NumPy arrays
+        self.tables = {}  # tables already loaded (a table may be shared by several constraints)
+
+    def persistent_load(self, pid):
+        if pid == "*":
+            return ANY
+        if pid not in self.tables:
+            start, n_tuples, arity, starred = pid
+            a = self.data()[start:start + n_tuples * arity].reshape(n_tuples, arity)
+            if not self.arrays or starred:
+                a = a.tolist()
+                if starred:
+                    a = [[ANY if v == STAR_SENTINEL else v for v in t] if STAR_SENTINEL in t else t for t in a]
+            self.tables[pid] = a
+        return self.tables[pid]
+
+
+def save_snapshot(parser, filename):
+    """
+    Saves the entries of the specified parser (which must not be in streaming mode) into a snapshot file
+
+    :param parser: a ParserXCSP3 object
+    :param filename: the name of the snapshot file
+    """
+    assert not parser.streaming, "A snapshot requires all entries to have been parsed"
+    numpy = _numpy()
+    tables, arrays, start = {}, [], 0
+    if numpy is not None:
+        harvest = {}
+        _integer_tables(parser.cEntries, harvest)
+        for key, (table, starred) in harvest.items():
+            a = numpy.array([[STAR_SENTINEL if v is ANY else v for v in t] for t in table] if starred else table, dtype=numpy.int64)
+            tables[key] = (start, a.shape[0], a.shape[1], starred)
+            arrays.append(a)
+            start += a.size
+    tmp = filename + "." + str(os.getpid())  # in order to never let a partially written snapshot be visible
+    try:
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + bytes(8))
+            _Pickler(f, tables).dump({name: getattr(parser, name) for name in STATE})
+            n = f.tell() - len(MAGIC) - 8
+            f.write(bytes(_aligned(f.tell()) - f.tell()))
+            for a in arrays:
+                f.write(a.astype("<i8", copy=False).tobytes())
+            f.seek(len(MAGIC))
+            f.write(struct.pack("<Q", n))
+        os.replace(tmp, filename)
+    finally:  # the temporary file still exists only if the snapshot could not be written entirely
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load_snapshot(filename, arrays=False):
+    """
+    Returns a parser (ParserXCSP3 object) with the entries loaded from the specified snapshot file,
+    or None if the file is not a valid snapshot (or if NumPy is required but not available)
+
+    :param filename: the name of the snapshot file
+    :param arrays: True if the tables without * must be given as (memory-mapped) NumPy arrays instead of lists
+    """
+    numpy = _numpy()
+    try:
+        with open(filename, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            n = struct.unpack("<Q", f.read(8))[0]
+            offset = _aligned(len(MAGIC) + 8 + n)
+            data = []
+
+            def mapped():
+                if len(data) == 0:
+                    if numpy is None:
+                        raise pickle.UnpicklingError("NumPy is required for the tables of this snapshot")
+                    data.append(numpy.memmap(filename, dtype="<i8", mode="r", offset=offset))
+                return data[0]
+
+            state = _Unpickler(f, mapped, arrays).load()
+            values = [state[name] for name in STATE]
+    except Exception:  # whatever the problem (truncated or corrupted file, another version of the library, ...), the snapshot is ignored
+        return None
+    parser = ParserXCSP3.__new__(ParserXCSP3)
+    for name, value in zip(STATE, values):
+        setattr(parser, name, value)
+    parser.streaming, parser.tree, parser.ids, parser.referenced = False, None, {}, None
+    return parser
+
+
+def parse(filename, discarded_classes=None, *, arrays=False):
+    """
+    Returns a parser (ParserXCSP3 object) for the specified XCSP3 file, loaded from its snapshot in the cache if it exists,
+    and otherwise built by parsing the file (its snapshot being then saved in the cache)
+
+    :param filename: the name of the XCSP3 file (possibly compressed)
+    :param discarded_classes: the classes of elements (constraints, blocks, ...) that must be ignored
+    :param arrays: True if, when loaded from a snapshot, the tables without * must be given as (memory-mapped) NumPy arrays instead of lists
+    """
+    entry = cacher.snapshot_entry(snapshot_key(filename, discarded_classes))
+    parser = load_snapshot(entry, arrays)
+    if parser is not None:
+        os.utime(entry)  # the modification time is used for LRU eviction
+        return parser
+    parser = ParserXCSP3(filename, discarded_classes)
+    os.makedirs(cacher.cache_dir(), exist_ok=True)
+    save_snapshot(parser, entry)
+    cacher.trim()
+    return parser
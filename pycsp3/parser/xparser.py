@@ -1,6 +1,10 @@
+import bz2
+import gzip
+import lzma
 import os
 import re
 import sys
+from contextlib import nullcontext
 from xml.etree import ElementTree
 
 from pycsp3.classes.auxiliary.conditions import Condition, ConditionValue, ConditionVariable
@@ -14,7 +18,8 @@ from pycsp3.classes.nodes import (TypeNode, Node, x_relop_k, k_relop_x, x_ariop_
 from pycsp3.parser.callbacks import Callbacks
 from pycsp3.parser.constants import (COVERED, CLOSED, RANK, START_INDEX, START_ROW_INDEX, START_COL_INDEX, ZERO_IGNORED, STATIC,
                                      DELIMITER_LISTS, DELIMITER_COMMA, DELIMITER_WHITESPACE, ID, CLASS, VAR, ARRAY, DOMAIN, SIZE, AS, FOR, TYPE, GROUP, BLOCK,
-                                     INTENSION, MATRIX, INDEX, OFFSET, COLLECT, CIRCULAR, STARRED, UNCLEANED, MINIMIZE, ORDER)
+                                     INTENSION, MATRIX, INDEX, OFFSET, COLLECT, CIRCULAR, STARRED, UNCLEANED, MINIMIZE, ORDER, VARIABLES, CONSTRAINTS,
+                                     OBJECTIVES, ANNOTATIONS)
 from pycsp3.parser.methods import (parse_domain, parse_expression, parse_sequence, parse_double_sequence, parse_double_sequence_of_vars, parse_condition,
                                    parse_conditions, parse_data, parse_tuples, replace_intern_commas)
 from pycsp3.parser.xentries import XCtr, XBlock, XGroup, XSlide, XObjExpr, XVar, XVarArray, domains_for, XCtrArg, XObjSpecial, XAnn
@@ -23,22 +28,77 @@ from pycsp3.tools.utilities import flatten
 
 OpOverrider.disable()  # because activated due to the imports (and this causes problem with XVar inheriting from Variable)
 
+# the first bytes of compressed files, with the functions to be called for decompressing them as streams
+COMPRESSION_MAGICS = [(b"\xfd7zXZ\x00", lzma.open), (b"\x5d\x00\x00", lzma.open), (b"\x1f\x8b", gzip.open), (b"BZh", bz2.open)]
+
+AS_TAIL = 1024  # hard coding (number of bytes of a chunk scanned again with the next one, when looking for 'as' attributes)
+
+
+def open_source(source):
+    """
+    Returns a context manager giving a binary stream for the specified XCSP3 source, which is either a filename
+    or a file-like object (used as is, and not closed). A compressed file (xz/lzma, gzip or bz2, determined by its first bytes)
+    is decompressed on the fly, so that it is never inflated on disk or in memory.
+
+    :param source: the name of a (possibly compressed) XCSP3 file, or a file-like object
+    """
+    if hasattr(source, "read"):
+        return nullcontext(source)
+    with open(source, "rb") as f:
+        head = f.read(6)
+    opener = next((opener for (magic, opener) in COMPRESSION_MAGICS if head.startswith(magic)), None)
+    return opener(source, "rb") if opener else open(source, "rb")
+
+
+def referenced_ids(source, chunk_size=1 << 20):
+    """
+    Returns the set of ids referred to by 'as' attributes in the specified XCSP3 source (filename or file-like object), by scanning
+    its text by chunks (without parsing it), or None if the source cannot be read twice (file-like object not seekable).
+    The set may contain a few more ids than necessary (e.g., when 'as' occurs in comments).
+
+    :param source: the name of a (possibly compressed) XCSP3 file, or a file-like object
+    :param chunk_size: the number of bytes read at each step
+    """
+    if hasattr(source, "read") and not (hasattr(source, "seekable") and source.seekable()):
+        return None
+    position = source.tell() if hasattr(source, "read") else None
+    ids, tail = set(), b""
+    with open_source(source) as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            text = tail + chunk
+            ids.update(id.decode() for id in re.findall(rb"""\sas\s*=\s*["']([^"']*)["']""", text))
+            tail = text[-AS_TAIL:]  # an attribute may be cut between two chunks
+    if position is not None:
+        source.seek(position)
+    return ids
+
+
 
 class ParserXCSP3:
 
     def must_discard_element(self, elt):
         return CLASS in elt.attrib and len(set(re.split(DELIMITER_WHITESPACE, elt.attrib[CLASS])).intersection(self.discarded_classes)) > 0
 
-    def parse_variables(self, elements):
-        def actual_element(elt):
-            return elt if AS not in elt.attrib else self.tree.find(".//*[@id='" + elt.attrib[AS] + "']")
+    def index_ids(self, elt):
+        # records in the index used for managing aliases ('as' indirection) the elements with an id in the subtree of elt
+        # (in streaming mode, only the elements that are referred to, if known, so as to release the other ones)
+        for e in elt.iter():
+            if ID in e.attrib and (self.referenced is None or e.attrib[ID] in self.referenced):
+                self.ids[e.attrib[ID]] = e
+
+    def actual_element(self, elt):
+        if AS not in elt.attrib:
+            return elt
+        assert elt.attrib[AS] in self.ids, "The id " + elt.attrib[AS] + " is not defined"
+        return self.ids[elt.attrib[AS]]
 
+    def parse_variables(self, elements):
         cache_id_to_domain = {}  # a map for managing pairs(id, domain); remember that aliases can be encountered
         for elt in elements:
             id = elt.attrib[ID]
             tp = None if TYPE not in elt.attrib else elt.attrib[TYPE]
             tp = TypeVar.INTEGER if tp is None else TypeVar[tp.upper()]
-            actual_elt = actual_element(elt)  # managing aliases, i.e., 'as' indirection
+            actual_elt = self.actual_element(elt)  # managing aliases, i.e., 'as' indirection
             assert actual_elt is not None
             dom = cache_id_to_domain.get(actual_elt.attrib[ID], None)  # may be not None when 'as' indirection
             if elt.tag == VAR:
@@ -54,7 +114,7 @@ class ParserXCSP3:
                     if len(domains) > 0:
                         va = XVarArray(id, tp, sizes)
                         for child in domains:
-                            actual_child = actual_element(child)
+                            actual_child = self.actual_element(child)
                             dom_child = None if ID not in actual_child.attrib else cache_id_to_domain.get(actual_child.attrib[ID], None)
                             if dom_child is None:
                                 dom_child = parse_domain(actual_child.text.strip(), tp)
@@ -165,7 +225,7 @@ class ParserXCSP3:
                 assert len(leafs) == 1 and leafs[0].type == TypeCtrArg.LIST
                 variables = leafs[0].value if all(isinstance(v, XVar) for v in leafs[0].value) else None  # may be null if a constraint template
                 domains = domains_for(args) if args is not None else domains_for(variables) if variables is not None else None
-                tuples, starred, cleaned = parse_tuples(elt[1], domains is not None and isinstance(domains[0][0], str))
+                tuples, starred, cleaned = parse_tuples(self.actual_element(elt[1]), domains is not None and isinstance(domains[0][0], str))
                 leafs.append(XCtrArg(type_tuples, tuples))
                 if starred:
                     leafs[-1].flags.add(STARRED)
@@ -248,44 +308,117 @@ class ParserXCSP3:
                 entry = XAnn(ta, d)
             self.aEntries.append(entry)
 
-    def compute_var_degrees(self):
-
-        def update_degrees_wrt(t):  # NB: it is not possible to directly call collect_vars()
-            for e in t:
-                if isinstance(e, XBlock):
-                    update_degrees_wrt(e.subentries)
-                elif isinstance(e, XGroup):
-                    for i in range(len(e.all_args)):
-                        for x in e.get_scope(i):
-                            x.increment_degree()
-                else:
-                    assert isinstance(e, (XCtr, XSlide))
-                    for x in e.involved_vars():
+    @staticmethod
+    def update_degrees_wrt(t):  # NB: it is not possible to directly call collect_vars()
+        for e in t:
+            if isinstance(e, XBlock):
+                ParserXCSP3.update_degrees_wrt(e.subentries)
+            elif isinstance(e, XGroup):
+                for i in range(len(e.all_args)):
+                    for x in e.get_scope(i):
                         x.increment_degree()
+            else:
+                assert isinstance(e, (XCtr, XSlide, XObjExpr, XObjSpecial))
+                for x in e.involved_vars():
+                    x.increment_degree()
 
-        update_degrees_wrt(self.cEntries)
-        for entry in self.oEntries:
-            for x in entry.involved_vars():
-                x.increment_degree()
-
-    def __init__(self, filename, discarded_classes=None):
+    def compute_var_degrees(self):
+        ParserXCSP3.update_degrees_wrt(self.cEntries)
+        ParserXCSP3.update_degrees_wrt(self.oEntries)
+
+    def iterparse(self, source):
+        # generates pairs (tag, elt) for the sections of the instance and the top-level elements of <constraints>, as soon as they are entirely read;
+        # each top-level constraint (or block or group) is discarded after having been generated, so that the tree is never entirely in memory
+        depth, root, section = 0, None, None
+        with open_source(source) as f:  # the stream remains open until the end of the parsing
+            for event, elt in ElementTree.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if depth == 1:
+                        root = elt
+                        self.framework = TypeFramework[elt.attrib.get(TYPE, TypeFramework.CSP.name).upper()]
+                    elif depth == 2:
+                        section = elt
+                    continue
+                depth -= 1
+                if depth == 2 and section.tag == CONSTRAINTS:
+                    yield CONSTRAINTS, elt
+                    if self.ids.get(elt.attrib.get(ID)) is not elt:  # kept if referred to later
+                        elt.clear()
+                    section.remove(elt)
+                elif depth == 1:
+                    if section.tag != CONSTRAINTS:
+                        yield section.tag, section
+                    section.clear()
+                    root.remove(section)
+
+    def constraints(self):
+        """
+        Returns the constraint entries (constraints, blocks, groups and meta-constraints) of the instance.
+        In streaming mode, this is a generator: entries are parsed one by one from the file, and the objectives and annotations
+        are parsed once the constraints have all been generated.
+        """
+        return self.streamed_constraints() if self.streaming else self.cEntries
+
+    def streamed_constraints(self):
+        for tag, elt in self.sections:
+            if tag == CONSTRAINTS:
+                self.index_ids(elt)  # the elements referred to later are kept
+                entries = []
+                self.recursive_parsing_of_constraints(elt, entries)
+                ParserXCSP3.update_degrees_wrt(entries)
+                yield from entries
+            elif tag == OBJECTIVES:
+                self.parse_objectives(list(elt))
+                ParserXCSP3.update_degrees_wrt(self.oEntries)
+            elif tag == ANNOTATIONS:
+                self.parse_annotations(list(elt))
+
+    def __init__(self, filename, discarded_classes=None, *, streaming=False):
+        """
+        Parses the specified XCSP3 file, possibly compressed (xz/lzma, gzip or bz2), or file-like object.
+        In streaming mode, only the variables are parsed here: constraints, objectives and annotations are parsed
+        when iterating over constraints(), and cEntries remains empty. Peak memory is then bounded by the largest single constraint,
+        but the degrees of the variables are not known when variables are loaded, and the callback load_constraints() is given an empty list
+        for the top-level entries.
+
+        :param filename: the name of the XCSP3 file (possibly compressed), or a file-like object
+        :param discarded_classes: the classes of elements (constraints, blocks, ...) that must be ignored
+        :param streaming: True if the file must be parsed incrementally (with iterparse)
+        """
         self.map_for_vars = {}  # The map that stores pairs (id, variable).
         self.map_for_arrays = {}  # The map that stores pairs (id, array of variables).
+        self.ids = {}  # The map that stores pairs (id, element), for managing aliases
+        self.referenced = None  # The set of ids referred to by 'as' attributes, when computed (in streaming mode)
 
         self.vEntries = []
         self.cEntries = []
         self.oEntries = []
         self.aEntries = []
 
-        self.tree = ElementTree.parse(filename)
         self.discarded_classes = set() if discarded_classes is None else set(discarded_classes)
+        self.streaming = streaming
+
+        if streaming:
+            self.framework = TypeFramework.CSP
+            self.referenced = referenced_ids(filename)
+            self.sections = self.iterparse(filename)
+            tag, elt = next(self.sections)
+            assert tag == VARIABLES, "The section <variables> is expected first"
+            self.tree = None
+            self.index_ids(elt)
+            self.parse_variables(list(elt))
+        else:
+            with open_source(filename) as f:
+                self.tree = ElementTree.parse(f)
+            self.index_ids(self.tree.getroot())
+            self.parse_variables(self.tree.findall("./variables/"))
+            self.parse_constraints(self.tree.findall("./constraints/"))
+            self.parse_objectives(self.tree.findall("./objectives/"))
+            self.parse_annotations(self.tree.findall("./annotations/"))
+            self.framework = TypeFramework.COP if len(self.oEntries) > 0 else TypeFramework.CSP
 
-        self.parse_variables(self.tree.findall("./variables/"))
-        self.parse_constraints(self.tree.findall("./constraints/"))
-        self.parse_objectives(self.tree.findall("./objectives/"))
-        self.parse_annotations(self.tree.findall("./annotations/"))
-
-        self.compute_var_degrees()
+            self.compute_var_degrees()
 
 
 class Recognizer:
@@ -421,9 +554,9 @@ class CallbackerXCSP3:
 
     def load_instance(self, discarded_classes=None):
         self.cb.load_instance(discarded_classes)
-        self.cb.begin_instance(TypeFramework.COP if len(self.parser.oEntries) > 0 else TypeFramework.CSP)
+        self.cb.begin_instance(self.parser.framework)
         self.load_variables(self.parser.vEntries)
-        self.load_constraints(self.parser.cEntries)
+        self.load_constraints(self.parser.constraints())
         self.load_objectives(self.parser.oEntries)
         self.load_annotations(self.parser.aEntries)
         self.cb.end_instance()
@@ -438,7 +571,7 @@ class CallbackerXCSP3:
 
     def load_var(self, x):
         self.cb.load_var(x)
-        if not self.cb.discard_variables_of_degree_0 or x.degree is not None:
+        if not self.cb.discard_variables_of_degree_0 or self.parser.streaming or x.degree is not None:  # degrees unknown yet when streaming
             assert len(x.domain) > 0
             if x.type == TypeVar.SYMBOLIC:
                 assert all(isinstance(v, str) for v in x.domain)
@@ -457,7 +590,8 @@ class CallbackerXCSP3:
                 self.cb.var_undefined()
 
     def load_constraints(self, entries):
-        self.cb.load_constraints(entries)
+        # in streaming mode, top-level entries are given by a generator (that can only be iterated once)
+        self.cb.load_constraints(entries if isinstance(entries, list) else [])
         for entry in entries:
             if isinstance(entry, XBlock):
                 self.load_block(entry)
@@ -803,7 +937,12 @@ class CallbackerXCSP3:
 
 if __name__ == "__main__":
     assert len(sys.argv) >= 2
-    parser = ParserXCSP3(os.path.join("./", sys.argv[1]))
+    if "-snapshot" in sys.argv:
+        from pycsp3.parser.snapshots import parse
+
+        parser = parse(os.path.join("./", sys.argv[1]))
+    else:
+        parser = ParserXCSP3(os.path.join("./", sys.argv[1]), streaming="-streaming" in sys.argv)
     callbacks = Callbacks()
     # e.g., callbacks.force_exit = True
     # e.g., callbacks.recognize_unary_primitives = False
@@ -0,0 +1,44 @@
+import os
+import sys
+
+# the library is imported in test mode (see pycsp3/__init__.py), so that no model is compiled when running the tests
+sys.argv = [os.path.abspath(__file__)]
+
+import pytest
+
+from pycsp3 import clear
+from pycsp3.compiler import _load_options
+from pycsp3.dashboard import options
+from pycsp3.tools.curser import OpOverrider
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    # an empty cache directory used by the tested operations
+    monkeypatch.setattr(options, "cache_dir", str(tmp_path / "cache"), raising=False)
+    monkeypatch.setattr(options, "cache_size", None, raising=False)
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def model():
+    # the default options (no option being given in sys.argv) and an empty model (with operators overridden for posting constraints), cleared after the test
+    _load_options()
+    clear()
+    OpOverrider.enable()
+    yield
+    OpOverrider.disable()
+    clear()
+
+
+@pytest.fixture
+def java(tmp_path, monkeypatch):
+    # a fake java command (found first in PATH) executing the Python code given by set_code() instead of the solver, with a fake instance
+    def set_code(code):
+        filename = tmp_path / "java"
+        filename.write_text("#!" + sys.executable + "\n" + code + "\n")
+        filename.chmod(0o755)
+
+    monkeypatch.setenv("PATH", str(tmp_path) + os.pathsep + os.environ["PATH"])
+    (tmp_path / "instance.xml").write_text("<instance/>")
+    return set_code, str(tmp_path / "instance.xml")
@@ -0,0 +1,93 @@
+from pycsp3 import VarArray, satisfy, Sum, AllDifferent, Table, Regular, Automaton, Count, Maximum
+from pycsp3.classes.entities import CtrEntities, ECtr, EGroup, EToGather
+from pycsp3.classes.main.constraints import Diffs
+from pycsp3.tools.aggregator import detecting_groups_recursively
+
+
+def _post():
+    # posts constraints of various kinds, some of them being similar (and so, possibly grouped)
+    x = VarArray(size=12, dom=range(10))
+    y = VarArray(size=12, dom=range(5))
+    a = Automaton(start="q0", final="q1", transitions=[("q0", 0, "q0"), ("q0", 1, "q1"), ("q1", 1, "q1")])
+    b = Automaton(start="q0", final="q0", transitions=[("q0", 0, "q0"), ("q0", 1, "q0")])
+    satisfy(
+        [x[i] != x[i + 1] for i in range(11)],
+        [x[i] + y[i] <= 5 for i in range(12)],
+        [x[i] * 2 > y[(i + 5) % 12] for i in range(6)],
+        [Sum(x[i], y[i], x[(i + 3) % 12]) >= 2 for i in range(6)],
+        [Sum(x[i:i + 2]) >= 2 for i in range(6)],
+        [Sum(x[i:i + 3]) >= 2 for i in range(3)],
+        AllDifferent(x),
+        [AllDifferent(x[i], y[i], x[i + 1]) for i in range(4)],
+        [Table(scope=[x[i], y[i]], supports=[(0, 1), (1, 2)]) for i in range(5)],
+        [Table(scope=[x[i], y[i]], supports=[(0, 1), (2, 2)]) for i in range(3)],
+        [Table(scope=[x[i], y[i], x[i + 1]], conflicts=[(0, 1, 0)]) for i in range(3)],
+        [Regular(scope=y[i:i + 3], automaton=a) for i in range(3)],
+        [Regular(scope=y[i:i + 3], automaton=b) for i in range(3)],
+        [Count(x[i:i + 4], value=0) == 1 for i in range(4)],
+        [Maximum(x[i], y[i]) == x[i + 1] for i in range(4)],
+    )
+
+
+def _constraints(entities):
+    for e in entities:
+        if isinstance(e, ECtr):
+            yield e.constraint
+        elif hasattr(e, "entities"):
+            yield from _constraints(e.entities)
+
+
+def _reference_detection(entities):
+    # the pairwise scan of all constraints (as done before constraints were bucketed), without the early stop
+    for i, e1 in enumerate(entities):
+        if e1 is None or isinstance(e1, EGroup):
+            continue
+        Diffs.reset()
+        group = EGroup()
+        group.entities.append(e1)
+        for j in range(i + 1, len(entities)):
+            e2 = entities[j]
+            if e2 is not None and not isinstance(e2, EGroup):
+                diffs = e2.constraint.close_to(e1.constraint)
+                if diffs is not False:
+                    diffs.merge()
+                    group.entities.append(e2)
+                    entities[j] = None
+        if len(group.entities) > 1:
+            entities[i] = group
+    return [e for e in entities if e is not None]
+
+
+def _groups(entities):
+    # the structure of the specified entities (constraints given by their textual forms, and groups by pairs)
+    return [("group", _groups(e.entities)) if isinstance(e, EGroup) else _groups(e.entities) if hasattr(e, "entities") else str(e.constraint)
+            for e in entities]
+
+
+def _n_groups(structure):
+    return sum(1 + _n_groups(t[1]) if isinstance(t, tuple) else _n_groups(t) if isinstance(t, list) else 0 for t in structure)
+
+
+def test_signatures_of_close_constraints(model):
+    _post()
+    constraints = list(_constraints(CtrEntities.items))
+    assert len(constraints) > 60
+    n_close = 0
+    for i, c1 in enumerate(constraints):
+        for c2 in constraints[i + 1:]:
+            if c2.close_to(c1) is not False:
+                n_close += 1
+                assert c1.signature() is not None and c1.signature() == c2.signature()
+    assert n_close > 100
+
+
+def test_same_groups_as_pairwise_scan(model):
+    _post()
+    gathered = [e for e in CtrEntities.items[0].entities if isinstance(e, EToGather) and len(e.entities) > 0]
+    entities = [list(e.entities) for e in gathered]
+    detecting_groups_recursively(CtrEntities.items)
+    groups = _groups(CtrEntities.items)
+    assert _n_groups(groups) >= 10
+    for e, t in zip(gathered, entities):
+        e.entities = _reference_detection(t)
+    assert _groups(CtrEntities.items) == groups
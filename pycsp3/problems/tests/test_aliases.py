@@ -0,0 +1,85 @@
+import time
+
+import pytest
+
+from pycsp3.parser.xparser import ParserXCSP3
+
+INSTANCE = """
+<instance format="XCSP3" type="CSP">
+  <variables>
+    <var id="y"> 0..5 </var>
+    <var id="w" as="y"/>
+    <array id="x" size="[3]"> 1..6 </array>
+    <array id="v" size="[3]" as="x"/>
+    <array id="u" size="[3]">
+      <domain for="u[0]" id="d0"> 2 4 8 </domain>
+      <domain for="u[1]" as="d0"/>
+      <domain for="u[2]" as="y"/>
+    </array>
+  </variables>
+  <constraints>
+    <extension>
+      <list> x[0] x[1] </list>
+      <supports id="t1"> (1,2)(2,3)(6,1) </supports>
+    </extension>
+    <extension>
+      <list> v[0] v[1] </list>
+      <supports as="t1"/>
+    </extension>
+    <extension>
+      <list> x[2] y </list>
+      <conflicts id="t2"> (1,0)(2,2) </conflicts>
+    </extension>
+    <extension>
+      <list> v[2] w </list>
+      <conflicts as="t2"/>
+    </extension>
+  </constraints>
+</instance>
+"""
+
+
+def _parser(tmp_path, content, streaming):
+    filename = tmp_path / "instance.xml"
+    filename.write_text(content)
+    return ParserXCSP3(str(filename), streaming=streaming)
+
+
+def _domains(parser):
+    return {var.id: str(var.domain) for entry in parser.vEntries for var in (entry.variables if hasattr(entry, "variables") else [entry])}
+
+
+def _tables(parser):
+    entries = list(parser.constraints()) if parser.streaming else parser.cEntries
+    return [(entry.ctr_args[-1].type.name, entry.ctr_args[-1].value) for entry in entries]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_aliased_domains(tmp_path, streaming):
+    domains = _domains(_parser(tmp_path, INSTANCE, streaming))
+    assert domains["w"] == domains["y"] and domains["u[2]"] == domains["y"]
+    assert all(domains["v[" + str(i) + "]"] == domains["x[" + str(i) + "]"] for i in range(3))
+    assert domains["u[1]"] == domains["u[0]"] != domains["x[0]"]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_aliased_tables(tmp_path, streaming):
+    tables = _tables(_parser(tmp_path, INSTANCE, streaming))
+    assert [name for name, _ in tables] == ["SUPPORTS", "SUPPORTS", "CONFLICTS", "CONFLICTS"]
+    assert tables[1][1] == tables[0][1] == [[1, 2], [2, 3], [6, 1]] and tables[3][1] == tables[2][1] == [[1, 0], [2, 2]]
+
+
+def test_undefined_alias(tmp_path):
+    with pytest.raises(AssertionError, match="The id z is not defined"):
+        _parser(tmp_path, INSTANCE.replace('<var id="w" as="y"/>', '<var id="w" as="z"/>'), False)
+
+
+def test_many_aliases(tmp_path):
+    # each alias is resolved with the index of ids, and not by searching the whole tree
+    n = 20000
+    variables = "\n".join('<var id="w' + str(i) + '" as="y"/>' for i in range(n))
+    start = time.perf_counter()
+    parser = _parser(tmp_path, INSTANCE.replace('<var id="w" as="y"/>', '<var id="w" as="y"/>\n' + variables), False)
+    assert time.perf_counter() - start < 5
+    domains = _domains(parser)
+    assert all(domains["w" + str(i)] == domains["y"] for i in range(n))
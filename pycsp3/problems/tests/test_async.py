@@ -0,0 +1,113 @@
+import asyncio
+import contextlib
+import sys
+import time
+
+import pytest
+
+from pycsp3 import VarArray
+from pycsp3.classes.auxiliary.enums import TypeStatus
+from pycsp3.compiler import Compilation
+from pycsp3.solvers.ace import Ace
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="the fake solver is an executable script")
+
+# a fake solver finding a first solution, sleeping (for the number of seconds given by the option -sleep), and then finding an optimal solution;
+# when interrupted (SIGINT), it stops after outputting its status
+CODE = """import signal, sys, time
+def stop(*args):
+    print("s SATISFIABLE", flush=True)
+    sys.exit(0)
+signal.signal(signal.SIGINT, stop)
+print("o 5", flush=True)
+print("v <instantiation> <list> x[] </list> <values> 0 1 </values> </instantiation>", flush=True)
+time.sleep(float(next((arg[7:] for arg in sys.argv if arg.startswith("-sleep=")), "0")))
+print("o 3", flush=True)
+print("v <instantiation> <list> x[] </list> <values> 1 1 </values> </instantiation>", flush=True)
+print("s OPTIMUM FOUND", flush=True)"""
+
+
+@pytest.fixture
+def instance(model, java, tmp_path, monkeypatch):
+    set_code, filename = java
+    set_code(CODE)
+    monkeypatch.setattr(Compilation, "pathname", str(tmp_path))  # for the log files
+    x = VarArray(size=2, dom=range(2))
+    return filename, True
+
+
+def _solver(sleep):
+    solver = Ace()
+    solver.setting("-sleep=" + str(sleep))
+    return solver
+
+
+def test_concurrent_solving(instance):
+    async def main():
+        ticks = []
+
+        async def ticker():  # the event loop must never be blocked
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.05)
+
+        task = asyncio.create_task(ticker())
+        solvers = [_solver(1) for _ in range(4)]
+        start = time.perf_counter()
+        statuses = await asyncio.gather(*(solver.solve_async(instance, "[ace]", recording=False) for solver in solvers))
+        elapsed = time.perf_counter() - start
+        task.cancel()
+        return solvers, statuses, elapsed, max(b - a for a, b in zip(ticks, ticks[1:]))
+
+    solvers, statuses, elapsed, max_gap = asyncio.run(main())
+    assert statuses == [TypeStatus.OPTIMUM] * 4 and all(solver.bound == 3 for solver in solvers)
+    assert elapsed < 3 and max_gap < 0.5
+
+
+def test_events_as_found(instance):
+    async def main():
+        events = []
+        async for kind, value in _solver(1).iter_async(instance, "[ace]", recording=False):
+            events.append((kind, value if kind == "bound" else value.values, time.perf_counter()))
+        return events
+
+    events = asyncio.run(main())
+    assert [(kind, value) for kind, value, _ in events] == [("bound", 5), ("solution", [0, 1]), ("bound", 3), ("solution", [1, 1])]
+    assert events[2][2] - events[1][2] > 0.5  # the first solution is given before the solver sleeps
+
+
+def test_timeout(instance):
+    solver = _solver(30)
+    start = time.perf_counter()
+    assert asyncio.run(solver.solve_async(instance, "[ace]", timeout=0.5, recording=False)) == TypeStatus.SAT
+    assert time.perf_counter() - start < 5 and solver.bound == 5
+
+
+def test_early_stop(instance):
+    solver = _solver(30)
+
+    async def main():
+        async with contextlib.aclosing(solver.iter_async(instance, "[ace]", recording=False)) as events:
+            async for kind, value in events:
+                if kind == "solution":
+                    break  # the iteration is closed early, so the solver is killed
+        assert solver.process.returncode is not None
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    assert time.perf_counter() - start < 5 and solver.process.returncode is not None
+
+
+def test_cancelled_task(instance):
+    solver = _solver(30)
+
+    async def main():
+        task = asyncio.create_task(solver.solve_async(instance, "[ace]", recording=False))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    assert time.perf_counter() - start < 5 and solver.process.returncode is not None
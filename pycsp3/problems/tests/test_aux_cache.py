@@ -0,0 +1,53 @@
+import pytest
+
+from pycsp3 import VarArray, satisfy, Sum, Maximum, Minimum, Count, protect
+from pycsp3.classes.main.constraints import Constraint, auxiliary
+from pycsp3.dashboard import options
+
+
+@pytest.fixture
+def xy(model):
+    x = VarArray(size=4, dom=range(5))
+    y = VarArray(size=4, dom=range(5))
+    return x, y
+
+
+def test_keys_agree_with_equality(xy):
+    x, y = xy
+    constraints = [pc.constraint for pc in (Sum(x), Sum(x[1], x[0]), Sum(x[0], x[1]), Sum(x[0], x[1]), Sum(x[0] * 2, x[1] * 3), Sum(x[0] * 2, x[1] * 3),
+                                            Sum(x[0] * 3, x[1] * 2), Maximum(x), Maximum(x), Maximum(x[:3]), Minimum(x), Minimum(y), Count(x, value=1),
+                                            Count(x, value=1), Count(x, value=2))]
+    n_equal = 0
+    for c1 in constraints:
+        for c2 in constraints:
+            k1, k2 = c1.key_except_condition(), c2.key_except_condition()
+            assert k1 is not None and k1 is not False
+            equal = protect().execute(c1.equal_except_condition(c2))
+            assert (k1 == k2) == equal and (hash(k1) == hash(k2) or not equal)
+            n_equal += c1 is not c2 and equal
+    assert n_equal == 2 * 4
+
+
+def _post(x, y):
+    satisfy(
+        Minimum(x[0], x[1]) + y[0] == 1,
+        Maximum(x) + y[1] == 2,
+        Minimum(x[2], x[3]) + y[2] == 3,
+        Maximum(x) + y[3] == 4,
+        Minimum(x[0], x[1]) * 2 == y[3]
+    )
+    return auxiliary().n_introduced_variables()
+
+
+def test_auxiliary_variables_reused(xy):
+    assert _post(*xy) == 3
+
+
+def test_auxiliary_variables_reused_without_keys(xy, monkeypatch):
+    monkeypatch.setattr(Constraint, "key_except_condition", lambda self: None)  # the linear scan is then used
+    assert _post(*xy) == 3
+
+
+def test_partial_use_of_cache(xy, monkeypatch):
+    monkeypatch.setattr(options, "dont_use_aux_cache", True)  # only the first and last cached constraints are considered
+    assert _post(*xy) == 4
@@ -0,0 +1,33 @@
+import signal
+import sys
+
+import pytest
+
+from pycsp3 import ACE, Job, solve_many
+from pycsp3.solvers import batch
+
+# the fake solver is an executable script, and limits are set only on POSIX systems
+pytestmark = pytest.mark.skipif(batch.resource is None or sys.platform == "win32", reason="resource limits are not available")
+
+
+def test_cpu_limit_kills_job(java):
+    set_code, instance = java
+    set_code("while True: pass")
+    result = next(solve_many([Job(instance, ACE)], cpu_limit=1, wall_limit=30))
+    assert result["limit"] == "cpu" and result["returncode"] in (-signal.SIGXCPU, -signal.SIGKILL)
+    assert 0.9 <= result["cpu"] < 10 and result["wck"] < 10
+
+
+def test_wall_limit_kills_job(java, monkeypatch):
+    set_code, instance = java
+    set_code("import signal, time\nsignal.signal(signal.SIGINT, signal.SIG_IGN)\ntime.sleep(60)")  # SIGINT is ignored, so SIGKILL is needed
+    monkeypatch.setattr(batch.SolverProcess, "KILL_DELAY", 1)
+    result = next(solve_many([(instance, ACE)], wall_limit=1))
+    assert result["limit"] == "wall" and result["returncode"] == -signal.SIGKILL and result["wck"] < 10
+
+
+def test_job_without_limit(java):
+    set_code, instance = java
+    set_code("print('s UNSATISFIABLE')")
+    result = next(solve_many([Job(instance, ACE)], cpu_limit=10, wall_limit=10))
+    assert result["status"] == "UNSAT" and result["limit"] is None and result["returncode"] == 0
@@ -0,0 +1,97 @@
+import importlib
+import sys
+
+from pycsp3.dashboard import options
+from pycsp3.tools import cacher
+
+
+def test_cache_key(monkeypatch):
+    monkeypatch.setattr(options, "values", ["variant", "output"])
+    monkeypatch.setattr(options, "flags", ["sober", "cache"])
+    for name in ("variant", "output", "sober", "cache"):
+        monkeypatch.setattr(options, name, None, raising=False)
+    key = cacher.cache_key("x = VarArray(size=n, dom=range(3))", {"n": 3})
+    assert key == cacher.cache_key("x = VarArray(size=n, dom=range(3))", {"n": 3})
+    assert key != cacher.cache_key("x = VarArray(size=n, dom=range(4))", {"n": 3})
+    assert key != cacher.cache_key("x = VarArray(size=n, dom=range(3))", {"n": 4})
+    monkeypatch.setattr(options, "output", "other.xml")
+    monkeypatch.setattr(options, "cache", True)
+    assert key == cacher.cache_key("x = VarArray(size=n, dom=range(3))", {"n": 3})  # neutral options
+    monkeypatch.setattr(options, "sober", True)
+    assert key != cacher.cache_key("x = VarArray(size=n, dom=range(3))", {"n": 3})
+    monkeypatch.setattr(options, "sober", None)
+    monkeypatch.setattr(options, "variant", "v2")
+    assert key != cacher.cache_key("x = VarArray(size=n, dom=range(3))", {"n": 3})
+
+
+def test_cache_is_opt_in(monkeypatch):
+    for name in ("cache", "no_cache", "display", "solve", "solver", "callback", "dataexport", "profile"):
+        monkeypatch.setattr(options, name, None, raising=False)
+    assert not cacher.cacheable("x = VarArray(size=3, dom=range(3))")
+    monkeypatch.setattr(options, "cache", True)
+    assert cacher.cacheable("x = VarArray(size=3, dom=range(3))")
+    assert not cacher.cacheable("x = VarArray(size=3, dom=range(3))\nsolve()")
+    monkeypatch.setattr(options, "no_cache", True)
+    assert not cacher.cacheable("x = VarArray(size=3, dom=range(3))")
+
+
+def test_compiled_form_depends_on_local_modules(cache_dir, tmp_path, monkeypatch):
+    helper = tmp_path / "cached_helper.py"
+    helper.write_text("N = 3\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "cached_helper", raising=False)  # so that the module is no more imported after the test
+    importlib.import_module("cached_helper")  # a local module imported by the model
+    compiled, copy = tmp_path / "m.xml", tmp_path / "copy.xml"
+    compiled.write_text("<instance/>")
+    cacher.store("k", str(compiled))
+    assert cacher.lookup("k", str(copy)) and copy.read_text() == "<instance/>"
+    assert not cacher.lookup("other", str(copy))
+    helper.write_text("N = 4\n")
+    assert not cacher.lookup("k", str(copy))
+
+
+def test_eviction(cache_dir, tmp_path, monkeypatch):
+    compiled = tmp_path / "m.xml"
+    compiled.write_bytes(b"x" * 600 * 1024)
+    monkeypatch.setattr(options, "cache_size", "1", raising=False)  # in MB
+    cacher.store("k1", str(compiled))
+    cacher.store("k2", str(compiled))  # the least recently used entry is evicted
+    assert not cacher.lookup("k1", str(tmp_path / "copy.xml")) and cacher.lookup("k2", str(tmp_path / "copy.xml"))
+
+
+def _result(status, limit, wck=1.0):
+    return {"status": status, "bound": None, "n_solutions": None, "solution": None, "wck": wck, "limit": limit}
+
+
+def test_result_key_ignores_time_limit(tmp_path):
+    model = tmp_path / "m.xml"
+    model.write_text("<instance/>")
+    key = cacher.result_key(str(model), "ACE java", {}, {"limit_time": "10", "seed": "1"})
+    assert key == cacher.result_key(str(model), "ACE java", {}, {"limit_time": "20", "seed": "1"})
+    assert key == cacher.result_key(model.read_bytes(), "ACE java", {}, {"limit_time": "20", "seed": "1"})
+    assert key != cacher.result_key(str(model), "ACE java", {}, {"seed": "2"})
+    model.write_text("<instance type='COP'/>")
+    assert key != cacher.result_key(str(model), "ACE java", {}, {"seed": "1"})
+
+
+def test_definitive_result(cache_dir):
+    cacher.store_result("k", _result("OPTIMUM", None, wck=5.0))
+    assert cacher.lookup_result("k", None, True)["status"] == "OPTIMUM"
+    assert cacher.lookup_result("k", 10.0, True) is not None
+    assert cacher.lookup_result("k", 2.0, True) is None  # not obtained within the time limit
+
+
+def test_non_definitive_result(cache_dir):
+    cacher.store_result("k", _result("SAT", 10.0))
+    assert cacher.lookup_result("k", 10.0, True)["status"] == "SAT"
+    assert cacher.lookup_result("k", 20.0, True) is None
+    assert cacher.lookup_result("k", None, True) is None
+    assert cacher.lookup_result("k", None, False) is not None  # SAT is definitive for a CSP
+    cacher.store_result("k", _result("UNKNOWN", None))  # such an entry is never stored by solvers, and never used
+    assert cacher.lookup_result("k", None, True) is None
+
+
+def test_fingerprint_is_computed_once(monkeypatch):
+    fingerprint = cacher._fingerprint()
+    monkeypatch.setattr(cacher.os, "walk", None)  # the tree of the library is no more walked
+    assert cacher._fingerprint() == fingerprint
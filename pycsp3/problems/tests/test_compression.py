@@ -0,0 +1,105 @@
+import bz2
+import gzip
+import inspect
+import io
+import lzma
+import re
+
+import pytest
+
+from pycsp3.parser.callbacks import Callbacks
+from pycsp3.parser.xparser import ParserXCSP3, CallbackerXCSP3, open_source, referenced_ids
+
+INSTANCE = """<?xml version="1.0" encoding="UTF-8"?>
+<instance format="XCSP3" type="COP">
+  <variables>
+    <var id="y"> 0..5 </var>
+    <var id="w" as="y"/>
+    <array id="x" size="[4]"> 1..6 </array>
+  </variables>
+  <constraints>
+    <allDifferent> x[] </allDifferent>
+    <extension>
+      <list> x[0] x[1] </list>
+      <supports id="t1"> (1,2)(2,3)(3,*)(6,1) </supports>
+    </extension>
+    <extension>
+      <list> x[2] x[3] </list>
+      <supports as="t1"/>
+    </extension>
+    <intension> ne(w,y) </intension>
+  </constraints>
+  <objectives>
+    <minimize type="sum"> x[] </minimize>
+  </objectives>
+</instance>
+"""
+
+COMPRESSORS = {"xz": lzma.compress, "lzma": lambda data: lzma.compress(data, format=lzma.FORMAT_ALONE), "gz": gzip.compress, "bz2": bz2.compress}
+
+
+class _Recorder(Callbacks):
+    # records the calls to the callbacks (with the textual forms of their arguments)
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def _unimplemented(self, *args, general_method=False):
+        name = inspect.currentframe().f_back.f_code.co_name
+        self.calls.append((name, [re.sub(r" at 0x[0-9a-f]+", "", str(sorted(arg) if isinstance(arg, set) else arg)) for arg in args]))
+
+
+def _calls(source, streaming):
+    recorder = _Recorder()
+    CallbackerXCSP3(ParserXCSP3(source, streaming=streaming), recorder).load_instance()
+    return recorder.calls
+
+
+@pytest.fixture
+def plain_file(tmp_path):
+    filename = tmp_path / "instance.xml"
+    filename.write_text(INSTANCE)
+    return str(filename)
+
+
+@pytest.mark.parametrize("suffix", sorted(COMPRESSORS))
+@pytest.mark.parametrize("streaming", [False, True])
+def test_compressed_file(tmp_path, plain_file, suffix, streaming):
+    # the format is determined by the first bytes of the file, and not by its name
+    filename = tmp_path / "instance.data"
+    filename.write_bytes(COMPRESSORS[suffix](INSTANCE.encode()))
+    with open_source(str(filename)) as f:
+        assert f.read() == INSTANCE.encode()
+    assert _calls(str(filename), streaming) == _calls(plain_file, streaming)
+    assert referenced_ids(str(filename)) == referenced_ids(plain_file) == {"y", "t1"}
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_file_like_object(plain_file, streaming):
+    stream = io.BytesIO(INSTANCE.encode())
+    assert _calls(stream, streaming) == _calls(plain_file, streaming)
+    assert not stream.closed  # the stream is used as is, and is not closed
+
+
+def test_unseekable_stream(plain_file):
+    class _Unseekable(io.RawIOBase):  # e.g., a pipe
+        def __init__(self, data):
+            self.data = io.BytesIO(data)
+
+        def readable(self):
+            return True
+
+        def readinto(self, b):
+            return self.data.readinto(b)
+
+    parser = ParserXCSP3(_Unseekable(INSTANCE.encode()), streaming=True)
+    assert parser.referenced is None  # the stream cannot be scanned beforehand, so all ids are kept
+    recorder = _Recorder()
+    CallbackerXCSP3(parser, recorder).load_instance()
+    assert recorder.calls == _calls(plain_file, True)
+
+
+def test_compressed_stream(plain_file):
+    # a file-like object is used as is, so it must be given already decompressed
+    with gzip.open(io.BytesIO(gzip.compress(INSTANCE.encode()))) as stream:
+        assert _calls(stream, False) == _calls(plain_file, False)
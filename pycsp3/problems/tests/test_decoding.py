@@ -0,0 +1,49 @@
+from pycsp3 import VarArray, Var, clear, satisfy, AllDifferent
+from pycsp3.classes.auxiliary.enums import TypeStatus
+from pycsp3.classes.entities import VarEntities, EVar, EVarArray
+from pycsp3.solvers.ace import Ace
+from pycsp3.solvers.solver import _SolvingRun
+from pycsp3.tools.utilities import ANY
+
+OUTPUT = """c some comment
+v <instantiation id='sol1' type='solution'>
+v   <list> x[] y z[][] </list>
+v   <values> 0 1 2 a 1x2 0 * </values>
+v </instantiation>
+v <instantiation id='sol2' type='solution'> <list> x[] y z[][] </list> <values> 2x3 b * 0 1 0 </values> </instantiation>
+s SATISFIABLE
+"""
+
+
+def _model():
+    x = VarArray(size=3, dom=range(3))
+    y = Var("a", "b")
+    z = VarArray(size=[2, 2], dom={0, 1})
+    satisfy(AllDifferent(x))
+    return x, y, z
+
+
+def test_items_with_names(model):
+    x, y, z = _model()
+    assert isinstance(VarEntities.get_item_with_name("y"), EVar) and VarEntities.get_item_with_name("y").variable is y
+    assert VarEntities.get_item_with_name("x[1]") is x[1] and VarEntities.get_item_with_name("z[1][0]") is z[1][0]
+    assert isinstance(VarEntities.get_item_with_name("z[][]"), EVarArray) and VarEntities.get_item_with_name("w") is None
+    clear()
+    assert VarEntities.get_item_with_name("y") is None
+
+
+def test_solutions_decoded(model, monkeypatch):
+    x, y, z = _model()
+    n_lookups = []
+    get_item_with_name = VarEntities.get_item_with_name
+    monkeypatch.setattr(VarEntities, "get_item_with_name", lambda s: n_lookups.append(s) or get_item_with_name(s))
+    solutions = []
+    run = _SolvingRun(Ace(), False, extraction=False, multiple=True, recording=True, on_bound=None,
+                      on_solution=lambda instantiation: solutions.append(instantiation.values))
+    for line in OUTPUT.splitlines(keepends=True):
+        run.parser.feed(line)
+    assert run.result() == TypeStatus.SAT
+    assert len(n_lookups) == 3  # the list of variables is decoded once, and not for each solution
+    assert solutions == [[0, 1, 2, "a", 1, 1, 0, ANY], [2, 2, 2, "b", ANY, 0, 1, 0]]
+    assert x[0].values == [0, 2] and y.values == ["a", "b"] and z[0][1].values == [1, 0] and z[1][1].values == [ANY, 0]
+    assert [x[i].value for i in range(3)] == [2, 2, 2] and z[0][0].value is ANY and z[1][0].value == 1
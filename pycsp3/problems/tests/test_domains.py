@@ -0,0 +1,55 @@
+import io
+
+from pycsp3 import VarArray, Var, clear, satisfy
+from pycsp3.classes.main.variables import Domain
+from pycsp3.tools.xcsp import write_document
+
+
+def test_identical_domains_are_shared(model):
+    x = VarArray(size=5, dom=range(5))
+    y = Var(dom={0, 1, 2, 3, 4})
+    z = VarArray(size=3, dom=lambda i: {0, 2} if i == 0 else range(4))
+    w = Var("a", "b")
+    s = Var(dom={"b", "a"})
+    assert all(x[i].dom is x[0].dom for i in range(5)) and y.dom is x[0].dom
+    assert z[1].dom is z[2].dom and z[0].dom is not z[1].dom and z[1].dom is not x[0].dom
+    assert w.dom is s.dom
+    assert len(Domain.pool) == 4
+
+
+def test_hash_consistent_with_equality(model):
+    domains = [Domain(range(5)), Domain([0, 1, 2, 3, 4]), Domain(0, 1, 2, 3, 4), Domain(range(6)), Domain(0, 2, 4), Domain({4, 0, 2}), Domain("a", "b"),
+               Domain(["b", "a"]), Domain(range(1, 5)), Domain(0, range(1, 5))]
+    for d1 in domains:
+        for d2 in domains:
+            assert (d1 == d2) == (d2 == d1) and (d1 != d2 or hash(d1) == hash(d2) and list(d1) == list(d2))
+    interned = [Domain.intern(d) for d in domains]
+    assert interned[0] is interned[2] and interned[4] is interned[5] and interned[6] is interned[7] and interned[0] is not interned[3]
+    assert all(interned[i] is interned[j] or domains[i] != domains[j] for i in range(len(domains)) for j in range(len(domains)))
+
+
+def test_without_never_modifies_shared_domains(model):
+    x = VarArray(size=2, dom=range(-2, 3))
+    dom = x[0].dom
+    d = dom.without(0)
+    assert list(dom) == [-2, -1, 0, 1, 2] and x[1].dom is dom
+    assert list(d) == [-2, -1, 1, 2] and Domain.pool[d] is d and dom.without(0) is d
+    assert dom.without(5) is dom
+
+
+def test_pool_cleared(model):
+    x = VarArray(size=2, dom=range(7))
+    assert x[0].dom in Domain.pool
+    clear()
+    assert len(Domain.pool) == 0
+
+
+def test_document_refers_to_identical_domains(model):
+    u = Var(dom=set(range(0, 400, 2)))
+    v = Var(dom=set(range(0, 400, 2)))
+    w = Var(dom=set(range(0, 400, 3)))
+    satisfy(u != v, v != w)
+    output = io.BytesIO()
+    write_document(output)
+    document = output.getvalue().decode()
+    assert '<var id="v" as="u"/>' in document and 'id="w" as' not in document
@@ -0,0 +1,43 @@
+import lzma
+import os
+
+from pycsp3.solvers.solver import Logger
+
+LINES = ["line " + str(i) + "\n" for i in range(10000)]
+
+
+def test_buffered_log(tmp_path):
+    log = Logger("test", path=str(tmp_path))
+    handle = log.log
+    for line in LINES:
+        log.write(line)
+    assert log.log is handle  # a single handle, never reopened
+    assert log.read() == "".join(LINES) and log.tail() is None  # read while the log is open
+    log.close()
+    assert log.read() == "".join(LINES) and os.path.basename(log.log_file).endswith("_test.log")
+    log = Logger("test", path=str(tmp_path))  # a previous log with the same name is replaced
+    log.close()
+    assert log.read() == ""
+
+
+def test_tail(tmp_path):
+    log = Logger(path=str(tmp_path), tail_size=100)
+    for line in LINES:
+        log.write(line)
+    assert len(log.tail()) <= 100 and log.tail().endswith("line 9999\n") and "".join(LINES).endswith(log.tail())
+    log.write("x" * 500 + "\n")  # the last line is kept, even if longer than tail_size
+    assert log.tail() == "x" * 500 + "\n"
+    log.close()
+
+
+def test_compressed_log(tmp_path):
+    log = Logger("test", path=str(tmp_path), compress=True)
+    name = log.log_file
+    for line in LINES:
+        log.write(line)
+    log.close()
+    assert log.log_file == name + ".lzma" and not os.path.exists(name)
+    assert log.read() == "".join(LINES)
+    with lzma.open(log.log_file, "rt") as f:
+        assert f.read() == "".join(LINES)
+    assert os.path.getsize(log.log_file) < len("".join(LINES)) // 4
@@ -0,0 +1,55 @@
+import pytest
+
+from pycsp3 import VarArray, Table
+from pycsp3.classes.auxiliary.enums import TypeCtrArg
+from pycsp3.classes.main.constraints import ConstraintExtension
+from pycsp3.tools.utilities import table_to_string
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def scope(model, monkeypatch):
+    monkeypatch.setattr(ConstraintExtension, "cache", {})  # the cache is shared by all tables, whatever the option restrict_tables_wrt_domains
+    x = VarArray(size=3, dom=range(4))
+    return list(x)
+
+
+def _table(c):
+    return c.arguments[TypeCtrArg.SUPPORTS if TypeCtrArg.SUPPORTS in c.arguments else TypeCtrArg.CONFLICTS].content
+
+
+@pytest.mark.parametrize("restrict", [False, True])
+def test_same_table_as_tuples(scope, restrict):
+    array = np.random.default_rng(0).integers(-1, 6, size=(300, 3))  # with duplicates, and values outside the domains
+    tuples = [tuple(t) for t in array.tolist()]
+    c1 = ConstraintExtension(scope, array, restrict_table_wrt_domains=restrict)
+    c2 = ConstraintExtension(scope, tuples, restrict_table_wrt_domains=restrict)
+    assert _table(c1) == _table(c2) and len(_table(c1)) > 0
+    assert c1.original_small_ordinary_table == sorted(set(tuples))
+    c3 = ConstraintExtension(scope, array.astype(np.int8), positive=False, restrict_table_wrt_domains=restrict)
+    assert _table(c3) == _table(c1) and TypeCtrArg.CONFLICTS in c3.arguments
+
+
+def test_cached_array(scope):
+    array = np.array([[2, 1, 0], [0, 1, 2], [2, 1, 0]])
+    c1 = ConstraintExtension(scope, array)
+    c2 = ConstraintExtension(scope, array.copy())  # the same content (so, the same hash of the buffer)
+    assert _table(c1) == _table(c2) == "(0,1,2)(2,1,0)"
+    assert c2.original_small_ordinary_table is c1.original_small_ordinary_table
+    assert _table(ConstraintExtension(scope, np.asfortranarray(array))) == _table(c1)  # not contiguous in row-major order
+
+
+def test_table_to_string(scope):
+    array = np.array([[0, 1, 3], [1, 5, 2], [3, 3, 3]], dtype=np.uint16)
+    assert table_to_string(array) == table_to_string(array.tolist()) == "(0,1,3)(1,5,2)(3,3,3)"
+    assert table_to_string(array, restricting_domains=[x.dom for x in scope]) == "(0,1,3)(3,3,3)"
+
+
+def test_table_function(scope):
+    array = np.array([[0, 1, 2], [1, 2, 3]])
+    assert _table(Table(scope=scope, supports=array).constraint) == "(0,1,2)(1,2,3)"
+    assert _table(Table(scope=scope[:1], conflicts=np.array([[2], [0]])).constraint) == "0 2"  # a unary table is given as a list of values
+    for wrong in (np.array([[0, 1], [1, 2]]), np.array([[0.5, 1, 2]]), np.zeros((0, 3), dtype=int)):
+        with pytest.raises(AssertionError):
+            Table(scope=scope, supports=wrong)
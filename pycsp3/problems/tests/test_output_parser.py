@@ -0,0 +1,74 @@
+import pytest
+
+from pycsp3.classes.auxiliary.enums import TypeStatus
+from pycsp3.solvers.solver import OutputParser
+
+OUTPUT = """c ACE 2.6
+o 10
+v <instantiation id='sol1' type='solution' cost='10'>
+v   <list> x[] </list>
+v   <values> 3 1 2 </values>
+v </instantiation>
+o 7  (hint)
+o 5
+v <instantiation id='sol2' type='solution' cost='5'> <list> x[] </list> <values> 1 2 3 </values> </instantiation>
+s OPTIMUM FOUND
+d FOUND SOLUTIONS 2
+"""
+
+
+class _Callbacks:
+    def __init__(self, stop_at=None):
+        self.events, self.lines, self.stop_at = [], [], stop_at
+
+    def on_instantiation(self, root):
+        self.events.append(("solution", root.get("id"), root[1].text.split()))
+        return False if self.stop_at == len(self.events) else None
+
+    def on_bound(self, bound):
+        self.events.append(("bound", bound))
+        return False if self.stop_at == len(self.events) else None
+
+
+def _parser(callbacks):
+    return OutputParser(callbacks.on_instantiation, callbacks.on_bound, callbacks.lines.append)
+
+
+def test_events_in_order():
+    callbacks = _Callbacks()
+    parser = _parser(callbacks)
+    for line in OUTPUT.splitlines(keepends=True):
+        assert parser.feed(line) is None
+    assert callbacks.events == [("bound", 10), ("solution", "sol1", ["3", "1", "2"]), ("bound", 5), ("solution", "sol2", ["1", "2", "3"])]
+    assert not any("<" in line for line in callbacks.lines) and len(callbacks.lines) == 6  # lines of instantiations are not given to on_line
+    assert parser.status() == TypeStatus.OPTIMUM and parser.bound == 5 and parser.n_solutions == 2 and parser.n_instantiations == 2
+    assert parser.buffer is None and parser.last_root.get("id") == "sol2" and parser.n_lines == len(OUTPUT.splitlines())
+
+
+@pytest.mark.parametrize("stop_at", [1, 2])
+def test_stop_asked_by_callbacks(stop_at):
+    callbacks = _Callbacks(stop_at)
+    parser = _parser(callbacks)
+    results = [parser.feed(line) for line in OUTPUT.splitlines(keepends=True)]
+    assert results.count(False) == 1 and len(callbacks.events) == 4
+    assert callbacks.events[stop_at - 1][0] == ("bound" if stop_at == 1 else "solution")
+    assert results.index(False) == (1 if stop_at == 1 else 5)
+
+
+@pytest.mark.parametrize("lines, status", [(["s UNSATISFIABLE\n"], TypeStatus.UNSAT), (["c nothing\n", "s UNKNOWN\n"], TypeStatus.UNKNOWN),
+                                           ([OUTPUT.splitlines(keepends=True)[8]], TypeStatus.SAT)])
+def test_status(lines, status):
+    parser = OutputParser()
+    for line in lines:
+        parser.feed(line)
+    assert parser.status() == status
+
+
+def test_unfinished_instantiation_and_core():
+    parser = OutputParser()
+    for line in OUTPUT.splitlines(keepends=True)[:4]:  # the output of the solver is interrupted inside an instantiation
+        parser.feed(line)
+    assert parser.status() == TypeStatus.UNKNOWN and parser.buffer is not None
+    parser = OutputParser()
+    parser.feed("c CORE #C=2 => [c1, c7]\n")
+    assert parser.core == "c CORE #C=2 => [c1, c7]"
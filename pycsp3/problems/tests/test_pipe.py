@@ -0,0 +1,56 @@
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from pycsp3.solvers.solver import _model_path
+from pycsp3.tools import cacher
+from pycsp3.tools.xcsp import StreamedDocument
+
+CONTENT = b"<instance/>\n" * 50000  # larger than the buffer of a pipe
+
+fifo = pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="named pipes are not available")
+
+
+def _document():
+    return StreamedDocument(lambda output: [output.write(CONTENT[i:i + 1000]) for i in range(0, len(CONTENT), 1000)])
+
+
+@fifo
+def test_document_fed_through_fifo():
+    with _model_path(_document()) as path:
+        assert stat.S_ISFIFO(os.stat(path).st_mode)
+        with open(path, "rb") as f:
+            assert f.read() == CONTENT
+    assert not os.path.exists(os.path.dirname(path))
+
+
+@fifo
+@pytest.mark.parametrize("read", [None, 100])
+def test_fifo_not_entirely_read(read):
+    # the solver stops before opening the pipe (read is None), or after reading only a part of the document
+    n_threads = threading.active_count()
+    start = time.perf_counter()
+    with _model_path(_document()) as path:
+        if read is not None:
+            with open(path, "rb") as f:
+                assert f.read(read) == CONTENT[:read]
+    assert time.perf_counter() - start < 2
+    assert not os.path.exists(os.path.dirname(path)) and threading.active_count() == n_threads
+
+
+def test_document_written_for_several_reads():
+    with _model_path(_document(), single_read=False) as path:
+        assert stat.S_ISREG(os.stat(path).st_mode)
+        for _ in range(2):
+            with open(path, "rb") as f:
+                assert f.read() == CONTENT
+    assert not os.path.exists(os.path.dirname(path))
+
+
+def test_streamed_document():
+    document = _document()
+    assert bytes(document) == CONTENT
+    assert cacher.result_key(document, "ACE java", {}, {}) == cacher.result_key(CONTENT, "ACE java", {}, {})
@@ -0,0 +1,50 @@
+import sys
+import time
+
+import pytest
+
+from pycsp3 import VarArray
+from pycsp3.classes.auxiliary.enums import TypeStatus
+from pycsp3.compiler import Compilation
+from pycsp3.solvers.ace import Ace
+from pycsp3.solvers.solver import solve_portfolio
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="the fake solver is an executable script")
+
+# a fake solver finding a solution at once, or after 30 seconds with the option -slow (being stopped by SIGINT)
+CODE = """import sys, time
+if "-slow" in sys.argv:
+    time.sleep(30)
+print("v <instantiation> <list> x[] </list> <values> 0 1 </values> </instantiation>")
+print("s SATISFIABLE")"""
+
+
+@pytest.fixture
+def instance(model, java, tmp_path, monkeypatch):
+    set_code, filename = java
+    set_code(CODE)
+    monkeypatch.setattr(Compilation, "pathname", str(tmp_path))  # for the log files
+    x = VarArray(size=2, dom=range(2))
+    return filename, False
+
+
+def _solver(option=""):
+    solver = Ace()
+    solver.setting(option)
+    return solver
+
+
+def test_slow_solvers_cancelled(instance):
+    runs = [(_solver("-slow"), "[ace]", {}, {}), (_solver(), "[ace]", {}, {}), (_solver("-slow"), "[ace]", {}, {})]
+    start = time.perf_counter()
+    winner, status = solve_portfolio(instance, runs)
+    assert winner is runs[1][0] and status == TypeStatus.SAT and time.perf_counter() - start < 10
+    assert runs[0][0].cancelled and runs[2][0].cancelled and not runs[1][0].cancelled
+    assert all(run[0].process.returncode is not None for run in runs)
+
+
+def test_solver_cancelled_before_starting(instance):
+    solver = _solver("-slow")
+    solver.cancel()  # e.g., by a portfolio, before the process of the solver is started
+    start = time.perf_counter()
+    assert solver.solve(instance, "[ace]", recording=False) == TypeStatus.UNKNOWN and time.perf_counter() - start < 10
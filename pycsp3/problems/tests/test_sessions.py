@@ -0,0 +1,44 @@
+import re
+import shutil
+
+import pytest
+
+pytest.importorskip("py4j")
+if shutil.which("java") is None:
+    pytest.skip("java is required for solver sessions", allow_module_level=True)
+
+from pycsp3.solvers.ace import AcePy4J
+
+INSTANCE = """
+<instance format="XCSP3" type="COP">
+  <variables>
+    <array id="x" size="[3]"> 0..4 </array>
+  </variables>
+  <constraints>
+    <allDifferent> x[] </allDifferent>
+  </constraints>
+  <objectives>
+    <minimize type="sum"> x[] </minimize>
+  </objectives>
+</instance>
+"""
+
+
+def _status(lines):
+    return [re.sub(r"\x1b\[[0-9;]*m", "", line).strip() for line in lines if re.sub(r"\x1b\[[0-9;]*m", "", line).startswith(("s ", "v "))]
+
+
+def test_session_reuses_jvm(tmp_path):
+    instance, invalid = tmp_path / "instance.xml", tmp_path / "invalid.xml"
+    instance.write_text(INSTANCE)
+    invalid.write_text(INSTANCE.replace("allDifferent", "unknown"))  # ACE calls System.exit() when parsing fails
+    session = AcePy4J()
+    try:
+        outputs = [_status(session.run([str(instance)])) for _ in range(3)]
+        assert outputs[0][0] == "s OPTIMUM FOUND" and outputs[0] == outputs[1] == outputs[2]
+        assert session.n_starts == 1
+        assert _status(session.run([str(invalid)])) == []
+        assert _status(session.run([str(instance)])) == outputs[0]  # the JVM is restarted
+        assert session.n_starts == 2
+    finally:
+        session.close()
@@ -0,0 +1,128 @@
+import inspect
+import os
+import pickle
+import re
+import struct
+
+import pytest
+
+from pycsp3.parser.callbacks import Callbacks
+from pycsp3.parser.snapshots import MAGIC, parse, load_snapshot, save_snapshot, snapshot_key
+from pycsp3.parser.xparser import ParserXCSP3, CallbackerXCSP3
+from pycsp3.tools import cacher
+from pycsp3.tools.utilities import ANY
+
+INSTANCE = """
+<instance format="XCSP3" type="CSP">
+  <variables>
+    <array id="x" size="[4]"> 1..6 </array>
+    <array id="z" size="[3]"> 0 1 </array>
+  </variables>
+  <constraints>
+    <extension>
+      <list> x[0] x[1] </list>
+      <supports id="t1"> (1,2)(2,3)(3,4)(6,1) </supports>
+    </extension>
+    <extension>
+      <list> x[2] x[3] </list>
+      <supports as="t1"/>
+    </extension>
+    <extension>
+      <list> x[1] x[2] </list>
+      <supports> (1,*)(2,3) </supports>
+    </extension>
+    <extension>
+      <list> z[] </list>
+      <conflicts> (0,0,0)(1,1,1) </conflicts>
+    </extension>
+    <allDifferent> x[] </allDifferent>
+  </constraints>
+</instance>
+"""
+
+
+class _Recorder(Callbacks):
+    # records the calls to the callbacks (with the textual forms of their arguments)
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def _unimplemented(self, *args, general_method=False):
+        name = inspect.currentframe().f_back.f_code.co_name
+        self.calls.append((name, [re.sub(r" at 0x[0-9a-f]+", "", str(sorted(arg) if isinstance(arg, set) else arg)) for arg in args]))
+
+
+def _calls(parser):
+    recorder = _Recorder()
+    CallbackerXCSP3(parser, recorder).load_instance()
+    return recorder.calls
+
+
+def _tables(parser):
+    return [e.ctr_args[-1].value for e in parser.cEntries if hasattr(e, "ctr_args") and e.ctr_args[-1].value is not None
+            and e.ctr_args[-1].type.name in ("SUPPORTS", "CONFLICTS")]
+
+
+@pytest.fixture
+def instance_file(tmp_path):
+    filename = tmp_path / "instance.xml"
+    filename.write_text(INSTANCE)
+    return str(filename)
+
+
+def test_snapshot_round_trip(instance_file, cache_dir):
+    parsed = parse(instance_file)  # the snapshot is saved in the cache
+    entry = cacher.snapshot_entry(snapshot_key(instance_file))
+    assert os.path.isfile(entry)
+    loaded = load_snapshot(entry)
+    assert loaded is not None and loaded.framework == parsed.framework
+    assert _calls(loaded) == _calls(ParserXCSP3(instance_file))
+    assert _calls(parse(instance_file)) == _calls(ParserXCSP3(instance_file))
+    for table in _tables(loaded):  # the same values as after parsing: lists of tuples, with ANY for *
+        assert isinstance(table, list) and all(isinstance(t, list) and all(v is ANY or type(v) is int for v in t) for t in table)
+
+
+def test_snapshot_arrays(instance_file, cache_dir):
+    numpy = pytest.importorskip("numpy")
+    parse(instance_file)
+    tables = _tables(parse(instance_file, arrays=True))
+    assert any(isinstance(table, numpy.ndarray) for table in tables)
+    for table in tables:
+        if isinstance(table, numpy.ndarray):
+            assert table.ndim == 2 and not table.flags.writeable
+        else:  # starred tables are never given as arrays
+            assert any(v is ANY for t in table for v in t)
+
+
+def test_modified_file_is_parsed_again(instance_file, cache_dir):
+    parse(instance_file)
+    key = snapshot_key(instance_file)
+    with open(instance_file, "a") as f:
+        f.write("\n")
+    assert snapshot_key(instance_file) != key and not os.path.isfile(cacher.snapshot_entry(snapshot_key(instance_file)))
+    parse(instance_file)
+    assert os.path.isfile(cacher.snapshot_entry(snapshot_key(instance_file)))
+
+
+def test_invalid_snapshot(tmp_path):
+    filename = tmp_path / "invalid.snap"
+    filename.write_bytes(b"not a snapshot")
+    assert load_snapshot(str(filename)) is None
+
+
+@pytest.mark.parametrize("state", [{"vEntries": []}, ["not", "a", "dict"], pickle.loads])
+def test_unusable_snapshot(tmp_path, state):
+    # valid pickles that do not give the expected state (e.g., written by another version of the library)
+    content = pickle.dumps(state)
+    filename = tmp_path / "unusable.snap"
+    filename.write_bytes(MAGIC + struct.pack("<Q", len(content)) + content)
+    assert load_snapshot(str(filename)) is None
+
+
+def test_failed_save_leaves_no_file(instance_file, tmp_path):
+    parser = ParserXCSP3(instance_file)
+    parser.framework = lambda: None  # cannot be pickled
+    filename = str(tmp_path / "failed.snap")
+    with pytest.raises(Exception):
+        save_snapshot(parser, filename)
+    assert not os.path.exists(filename) and os.listdir(tmp_path) == ["instance.xml"]
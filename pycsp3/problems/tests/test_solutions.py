@@ -0,0 +1,80 @@
+import struct
+
+import pytest
+
+from pycsp3 import VarArray, Var, solutions, value, values
+from pycsp3.classes.main.variables import SolutionStore
+from pycsp3.tools.utilities import ANY
+
+
+@pytest.fixture
+def variables(model):
+    # three integer variables and a symbolic one, the store having one column per variable
+    x = VarArray(size=3, dom=range(10))
+    y = Var(dom={"a", "b", "c"})
+    t = list(x) + [y]
+    SolutionStore.reset(t)
+    return x, y, t
+
+
+def test_add_and_read(variables):
+    x, y, t = variables
+    SolutionStore.add(t, [1, 2, 3, "b"])
+    SolutionStore.add(t, [4, ANY, 6, "c"])
+    SolutionStore.add([x[2], None, y], [7, 8, "a"])  # a partial solution
+    assert SolutionStore.n_rows == 3 and SolutionStore.names() == [v.id for v in t]
+    assert [x[0].value, x[1].value, x[2].value, y.value] == [None, None, 7, "a"]
+    assert value(x[1], sol=1) is ANY and value(y, sol=0) == "b"
+    assert x[0].values == [1, 4, None] and y.values == ["b", "c", "a"]
+    assert values(x, sol=0) == [1, 2, 3]
+
+
+def test_out_of_range_integers(variables):
+    x, y, t = variables
+    specials = [SolutionStore.ANY_CODE, SolutionStore.NONE_CODE, SolutionStore.OTHER_CODE]
+    for v in specials + [1 << 63, -(1 << 70)]:
+        SolutionStore.add(t, [v, 0, v, "a"])
+        SolutionStore.add([x[1], y], [v, "b"])
+    assert x[0].values == [v for v in specials + [1 << 63, -(1 << 70)] for v in (v, None)]
+    assert x[1].values == [v for v in specials + [1 << 63, -(1 << 70)] for v in (0, v)]
+    assert x[2].values == x[0].values
+    with pytest.raises(SystemExit):
+        SolutionStore.to_numpy()
+
+
+def test_setters(variables):
+    x, y, t = variables
+    x[0].value = 5  # a solution is added, since there is none
+    assert SolutionStore.n_rows == 1 and x[0].value == 5 and x[1].value is None
+    x[1].values = [1, 2, 1 << 64]
+    y.value = "c"
+    assert SolutionStore.n_rows == 3 and x[0].values == [5, None, None] and x[1].values == [1, 2, 1 << 64] and y.values == [None, None, "c"]
+    z = Var(dom=range(3))  # a variable without any column
+    z.values = [0, 1]
+    assert z.values == [0, 1, None] and x[1].values == [1, 2, 1 << 64] and SolutionStore.names()[-1] == z.id
+
+
+def test_exports(variables, tmp_path):
+    numpy = pytest.importorskip("numpy")
+    x, y, t = variables
+    SolutionStore.add(t, [1, 2, 3, "b"])
+    SolutionStore.add(t, [4, 5, ANY, "a"])
+    expected = [[1, 2, 3, 0], [4, 5, SolutionStore.ANY_CODE, 1]]
+    assert solutions() is SolutionStore and SolutionStore.to_numpy().tolist() == expected
+    assert numpy.asarray(SolutionStore.as_buffer()).tolist() == expected
+    array = SolutionStore.to_numpy()
+    SolutionStore.add(t, [7, 8, 9, "c"])  # the copy is not modified
+    assert array.shape == (2, 4) and SolutionStore.to_numpy().shape == (3, 4)
+    SolutionStore.save(str(tmp_path / "sols.npy"))
+    assert numpy.load(str(tmp_path / "sols.npy")).tolist() == expected + [[7, 8, 9, 2]]
+
+
+def test_save_without_numpy(variables, tmp_path):
+    x, y, t = variables
+    SolutionStore.add(t, [1, -2, 3, "a"])
+    SolutionStore.save(str(tmp_path / "sols.npy"))
+    content = (tmp_path / "sols.npy").read_bytes()
+    assert content.startswith(b"\x93NUMPY\x01\x00")
+    header_length = struct.unpack("<H", content[8:10])[0]
+    assert (10 + header_length) % 64 == 0 and b"'shape': (1, 4)" in content[10:10 + header_length]
+    assert struct.unpack("<4q", content[10 + header_length:]) == (1, -2, 3, 0)
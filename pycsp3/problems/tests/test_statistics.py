@@ -0,0 +1,65 @@
+from pycsp3.solvers.ace import Ace
+from pycsp3.solvers.choco import Choco
+from pycsp3.solvers.solver import Statistics, _SolvingRun, _number
+
+ACE_OUTPUT = """
+  \x1b[1;32mPreprocessing\x1b[0m  filters=1,250  revisions(3,124)  wck=0.12s  cpu=0.2
+  Run  num=0  dead=0  wrgs=12  nodes=40  wck=0.3s
+  Run  num=1  dead=0  wrgs=1,024  nodes=2,500  wck=1.05s
+  Global  effs=4,321  revisions=10  wrgs=1,036  wck=1.4s
+d WRONG DECISIONS 1036
+d NRUNS 2
+d COMPLETE EXPLORATION
+"""
+
+CHOCO_OUTPUT = """
+c Model[Queens], 1 Solutions, Building time : 0,150s, Resolution time 1.250s, Time to best solution 0.75s
+c 25 Nodes (20.0 n/s), 30 Backtracks, 0 Backjumps, 15 Fails, 2 Restarts
+"""
+
+
+def _statistics(solver, output):
+    statistics = Statistics()
+    for line in output.splitlines():
+        solver.parse_statistics(line, statistics)
+    return statistics
+
+
+def test_number():
+    assert _number("12") == 12 and _number("-3s") == -3 and _number("0.5s") == 0.5 and _number("0,5") == 0.5
+    assert _number("1,250", grouping=True) == 1250 and _number("1,25", grouping=True) == 1.25 and _number("abc") is None
+
+
+def test_ace_statistics():
+    statistics = _statistics(Ace(), ACE_OUTPUT)
+    assert statistics["preprocessing_filters"] == 1250 and statistics["preprocessing_time"] == 0.12 and statistics["preprocessing_cpu"] == 0.2
+    assert statistics["runs"] == 2 and statistics["restarts"] == 1  # the last run overwrites the values of the previous ones
+    assert statistics["run_nodes"] == 2500 and statistics["run_wrong_decisions"] == 1024 and statistics["run_time"] == 1.05
+    assert statistics["effective_filterings"] == 4321 and statistics["global_revisions"] == 10 and statistics["time"] == 1.4
+    assert statistics["wrong_decisions"] == 1036 and statistics["nruns"] == 2 and statistics["complete_exploration"] is True
+    assert not any(name.startswith("preprocessing_revisions") for name in statistics.counters)  # no value given
+
+
+def test_choco_statistics():
+    statistics = _statistics(Choco(), CHOCO_OUTPUT)
+    assert statistics["solutions"] == 1 and statistics["nodes"] == 25 and statistics["backtracks"] == 30
+    assert statistics["backjumps"] == 0 and statistics["fails"] == 15 and statistics["restarts"] == 2
+    assert statistics["building_time"] == 0.15 and statistics["preprocessing_time"] == 0.15
+    assert statistics["resolution_time"] == 1.25 and statistics["best_solution_time"] == 0.75
+
+
+def test_unrelated_lines():
+    for solver in (Ace(), Choco()):
+        assert _statistics(solver, "v <instantiation> </instantiation>\ns SATISFIABLE\nc some comment 12\nRun\n").as_dict() == {"bounds": []}
+
+
+def test_bounds_trajectory():
+    solver = Ace()
+    run = _SolvingRun(solver, True, extraction=False, multiple=False, recording=False, on_solution=None, on_bound=None)
+    for line in ("o 10", "o 7", "Run  num=0  nodes=3", "o 4", "s OPTIMUM FOUND"):
+        run.parser.feed(line + "\n")
+    statistics = solver.last_statistics
+    assert statistics is run.statistics and [bound for _, bound in statistics.bounds] == [10, 7, 4]
+    times = [t for t, _ in statistics.bounds]
+    assert times == sorted(times) and all(t >= 0 for t in times)
+    assert statistics.as_dict() == {"bounds": statistics.bounds, "runs": 1, "restarts": 0, "run_num": 0, "run_nodes": 3}
@@ -0,0 +1,149 @@
+import inspect
+import re
+
+import pytest
+
+from pycsp3.parser.callbacks import Callbacks
+from pycsp3.parser.xparser import ParserXCSP3, CallbackerXCSP3, referenced_ids
+
+INSTANCE = """
+<instance format="XCSP3" type="COP">
+  <variables>
+    <var id="y"> 0..5 </var>
+    <array id="x" size="[4]"> 1..6 </array>
+    <array id="z" size="[2][3]"> 0 1 </array>
+  </variables>
+  <constraints>
+    <allDifferent> x[] </allDifferent>
+    <extension>
+      <list> x[0] x[1] </list>
+      <supports id="t1"> (1,2)(2,3)(3,*)(6,1) </supports>
+    </extension>
+    <extension>
+      <list> x[2] x[3] </list>
+      <supports as="t1"/>
+    </extension>
+    <extension>
+      <list> z[0][0] z[0][1] z[0][2] </list>
+      <conflicts> (0,0,0)(1,1,1) </conflicts>
+    </extension>
+    <group>
+      <intension> ne(%0,%1) </intension>
+      <args> x[0] y </args>
+      <args> x[1] y </args>
+    </group>
+    <block class="symmetryBreaking">
+      <intension> le(x[0],x[1]) </intension>
+      <sum>
+        <list> z[1][] </list>
+        <condition> (ge,1) </condition>
+      </sum>
+    </block>
+    <element>
+      <list> x[] </list>
+      <index> y </index>
+      <value> 3 </value>
+    </element>
+  </constraints>
+  <objectives>
+    <minimize type="sum"> x[] </minimize>
+  </objectives>
+</instance>
+"""
+
+
+class _Recorder(Callbacks):
+    # records the calls to the callbacks (with the textual forms of their arguments)
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def _unimplemented(self, *args, general_method=False):
+        name = inspect.currentframe().f_back.f_code.co_name
+        self.calls.append((name, [re.sub(r" at 0x[0-9a-f]+", "", str(sorted(arg) if isinstance(arg, set) else arg)) for arg in args]))
+
+
+def _calls(filename, streaming):
+    recorder = _Recorder()
+    CallbackerXCSP3(ParserXCSP3(filename, streaming=streaming), recorder).load_instance()
+    return recorder.calls
+
+
+@pytest.mark.parametrize("suffix", ["", ".xz"])
+def test_streaming_gives_same_callbacks(tmp_path, suffix):
+    filename = tmp_path / ("instance.xml" + suffix)
+    if suffix == "":
+        filename.write_text(INSTANCE)
+    else:
+        import lzma
+        filename.write_bytes(lzma.compress(INSTANCE.encode()))
+    calls, streamed_calls = _calls(str(filename), False), _calls(str(filename), True)
+    assert len(calls) == len(streamed_calls) > 30
+    for (name, args), (streamed_name, streamed_args) in zip(calls, streamed_calls):
+        assert name == streamed_name
+        if name == "load_constraints" and streamed_args == ["[]"]:  # top-level entries are not known in advance when streaming
+            continue
+        assert args == streamed_args
+    assert sum(1 for name, args in streamed_calls if name == "load_constraints" and args == ["[]"]) == 1
+
+
+ALIASES = """
+<instance format="XCSP3" type="CSP">
+  <variables>
+    <var id="y"> 0..5 </var>
+    <var id="w" as="y"/>
+    <array id="x" size="[4]"> 1..6 </array>
+  </variables>
+  <constraints>
+    <extension id="c1">
+      <list> x[0] x[1] </list>
+      <supports id="t1"> (1,2)(2,3)(3,4)(6,1) </supports>
+    </extension>
+    <extension>
+      <list> x[1] x[2] </list>
+      <supports id="t2"> (1,2)(2,3) </supports>
+    </extension>
+    <extension>
+      <list> x[2] x[3] </list>
+      <supports as="t1"/>
+    </extension>
+    <intension id="c2"> ne(w,y) </intension>
+  </constraints>
+</instance>
+"""
+
+
+def test_only_referenced_ids_are_kept(tmp_path):
+    filename = tmp_path / "instance.xml"
+    filename.write_text(ALIASES)
+    parser = ParserXCSP3(str(filename), streaming=True)
+    assert parser.referenced == {"y", "t1"}
+    recorder = _Recorder()
+    CallbackerXCSP3(parser, recorder).load_instance()
+    assert set(parser.ids) == {"y", "t1"}  # and not x, c1, t2 or c2
+    calls = _calls(str(filename), False)
+    assert [call for call in recorder.calls if call[0] != "load_constraints"] == [call for call in calls if call[0] != "load_constraints"]
+
+
+def test_referenced_ids(tmp_path):
+    filename = tmp_path / "instance.xml"
+    filename.write_text(ALIASES)
+    assert all(referenced_ids(str(filename), chunk_size=size) == {"y", "t1"} for size in (1, 7, 100))
+    with open(filename, "rb") as f:
+        f.seek(10)
+        assert referenced_ids(f) == {"y", "t1"} and f.tell() == 10  # the position of the stream is restored
+
+    class _Unseekable:
+        def read(self, size=-1):
+            return b""
+
+    assert referenced_ids(_Unseekable()) is None
+
+
+def test_referenced_constraint_is_kept(tmp_path):
+    filename = tmp_path / "instance.xml"
+    filename.write_text(ALIASES.replace('<intension id="c2"> ne(w,y) </intension>', '<intension id="c2"> ne(w,y) </intension>\n<block as="c1"/>'))
+    parser = ParserXCSP3(str(filename), streaming=True)
+    assert "c1" in parser.referenced
+    list(parser.constraints())
+    assert len(parser.ids["c1"]) == 2  # the children of the referred element (list and supports) are not discarded
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from pycsp3.parser.methods import parse_ordinary_tuple, parse_ordinary_tuples, re_lists
+from pycsp3.tools.utilities import ANY
+
+MALFORMED = ["(1,2)(3)", "(1,,2)", "(- 1,2)", "(1,- 2)(3,4)", "(1,-)", "(-,1)", "(1,2", "1,2)", "()", "(1,2)()", "(1 2)", "(1,2)(3,4,)", "(a,b)",
+             "(1.5,2)", "(1,2)x(3,4)", "(1,2)(3,4)5", "(1, *)", "( * ,1)", "(**,1)", "(1*,2)", "(1,--2)", "(1,-9223372036854775808)(*,1)",
+             "(99999999999999999999,1)", "(9223372036854775807,1)", "(1e3,2)", "(0x10,1)", "(1_0,2)", "((1,2))", "(1,(2)", "(1,2))(3,4)", "(\t- 3,1)"]
+
+
+def _reference(s, domains=None):
+    # the parsing of tuples one by one (as performed when NumPy is not available)
+    m = []
+    for tok in re_lists.split(s[1:-1]):
+        t, _ = parse_ordinary_tuple(tok, domains)
+        if t is not None:
+            m.append(t)
+    return m
+
+
+def _table(rnd):
+    arity, n_tuples = rnd.randint(1, 5), rnd.randint(1, 30)
+    values = rnd.choice([range(-3, 4), range(0, 100), range(-(1 << 62), 1 << 62, 1 << 58)])
+    table = [[ANY if rnd.random() < 0.1 else rnd.choice(values) for _ in range(arity)] for _ in range(n_tuples)]
+    sep = rnd.choice(["", "", " ", "\n  "])
+    s = sep.join("(" + ",".join("*" if v is ANY else str(v) for v in t) + ")" for t in table)
+    domains = None
+    if rnd.random() < 0.5:
+        domains = [set(rnd.sample(values, min(len(values), rnd.randint(1, 10)))) for _ in range(arity)]
+    return s, domains
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_vectorized_parsing_conforms(seed):
+    pytest.importorskip("numpy")
+    rnd = random.Random(seed)
+    for _ in range(100):
+        s, domains = _table(rnd)
+        m = parse_ordinary_tuples(s, domains)
+        assert m is not None and m == _reference(s, domains), s
+        assert all(v is ANY or type(v) is int for t in m for v in t)
+
+
+@pytest.mark.parametrize("s", MALFORMED)
+def test_malformed_tuples(s):
+    try:
+        expected = _reference(s)
+    except (ValueError, IndexError):
+        expected = None
+    m = parse_ordinary_tuples(s)
+    assert m is None or m == expected, s  # when the string is malformed, the usual parsing (and its error) must be performed
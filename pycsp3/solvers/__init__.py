@@ -1,9 +1,9 @@
+import atexit
 
-# import atexit
-# from pycsp3.solvers.solver import SolverPy4J
-#
-# @atexit.register
-# def end():
-#     for process in SolverPy4J.processes:
-#         process.kill()
-#         SolverPy4J.close()
+from pycsp3.solvers.solver import SolverPy4J
+
+
+@atexit.register
+def end():
+    for session in SolverPy4J.sessions:  # stopping the JVMs of all solver sessions
+        session.close()
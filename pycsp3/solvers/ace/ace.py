@@ -1,10 +1,16 @@
 import os
+import re
 
-from pycsp3.solvers.solver import SolverProcess  # , SolverPy4J
+from pycsp3.solvers.solver import SolverProcess, SolverPy4J, _number
 
 ACE_DIR = os.sep.join(__file__.split(os.sep)[:-1]) + os.sep
 ACE_CP = ACE_DIR + (os.pathsep + ACE_DIR).join(["ACE-2.6.jar"])
 
+ACE_SECTIONS = {"Preprocessing", "Run", "Search", "Global"}  # the blocs of statistics output by ACE (with entries key=value)
+ACE_KEYS = {"wrgs": "wrong_decisions", "decs": "decisions", "backs": "backtracks", "effs": "effective_filterings", "wck": "time"}  # hard coding
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
 
 class Ace(SolverProcess):
     def __init__(self):
@@ -13,6 +19,31 @@ class Ace(SolverProcess):
     def switch_to_extraction(self):
         self.command = "java -cp " + self.cp + " main.HeadExtraction"
 
+    def parse_statistics(self, line, statistics):
+        line = ANSI_ESCAPE.sub("", line).strip()
+        if line.startswith("d "):  # e.g., d WRONG DECISIONS 12, d NRUNS 3, d COMPLETE EXPLORATION
+            tokens = line.split()
+            if tokens[-1] == "EXPLORATION":
+                statistics["complete_exploration"] = tokens[1] == "COMPLETE"
+            elif len(tokens) > 2 and _number(tokens[-1]) is not None:
+                statistics["_".join(tokens[1:-1]).lower()] = _number(tokens[-1])
+            return
+        tokens = line.split()
+        if len(tokens) < 2 or tokens[0] not in ACE_SECTIONS:
+            return
+        section = tokens[0].lower()
+        if section == "run":
+            statistics["runs"] = (statistics["runs"] or 0) + 1
+            statistics["restarts"] = statistics["runs"] - 1
+        for token in tokens[1:]:
+            key, _, value = token.partition("=")
+            value = _number(value, grouping=True)
+            if value is not None:
+                key = ACE_KEYS.get(key, key)
+                statistics[section + "_" + key] = value
+                if section == "global":  # values for the whole solving operation
+                    statistics[key] = value
+
     def parse_general_options(self, string_options, dict_options, dict_simplified_options):
         args_solver = ""
         if "limit_time" in dict_simplified_options:
@@ -94,9 +125,25 @@ class Ace(SolverProcess):
             args_solver += " -npc"  # no print colors
         return args_solver
 
-# class AcePy4J(SolverPy4J):  # TODO in progress
-#     def __init__(self):
-#         cp = ACE_CP + os.pathsep + ACE_DIR + "../py4j0.10.8.1.jar" + os.pathsep + ACE_DIR + " AcePy4J"
-#         super().__init__(name="Ace", command="java -cp " + cp, cp=ACE_CP)
 
-# command="java -cp /usr/local/share/py4j/py4j0.10.8.1.jar:.:./pyAce/ StackEntryPoint"
+class AcePy4J(SolverPy4J, Ace):
+    """
+    ACE run in a persistent JVM (session), so as to avoid paying the startup of the JVM for each solving operation
+    """
+
+    def __init__(self):
+        SolverPy4J.__init__(self, name="ACE", command="java -jar " + ACE_CP, cp=ACE_CP, main_class="main.Head")
+
+    def switch_to_extraction(self):
+        Ace.switch_to_extraction(self)
+        self.main_class = "main.HeadExtraction"
+
+    def call(self, jvm, args):
+        if self.main_class != "main.Head":
+            return SolverPy4J.call(self, jvm, args)
+        # what Head.main() does, except for the portfolio mode (never used here), which is the only one where Head.run() calls System.exit()
+        # arguments are loaded again (static state of ACE), and a new Head (with its own state) solves the instance and stops
+        jvm.dashboard.Input.loadArguments(args)
+        head = jvm.main.Head(jvm.dashboard.Input.controlFilename)
+        head.start()  # ACE expects to be run in its own thread (Head)
+        head.join()
@@ -0,0 +1,168 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from multiprocessing import cpu_count
+
+from pycsp3.classes.auxiliary.enums import TypeSolver, TypeStatus
+from pycsp3.solvers.ace import Ace
+from pycsp3.solvers.choco import Choco
+from pycsp3.solvers.solver import OutputParser, SolverProcess, Statistics, process_options, _model_path
+from pycsp3.tools.utilities import Stopwatch, is_windows
+
+try:
+    import resource  # not available on Windows
+except ImportError:
+    resource = None
+
+Job = namedtuple("Job", ("instance", "solver", "options"), defaults=("",))
+Job.__doc__ = """A solving job: a compiled instance (filename or bytes), a solver (e.g., ACE or "[choco,limit=10s]") and specific options"""
+
+
+def _solving_of(solver):
+    # returns the string of options for the specified solver (TypeSolver or string)
+    if isinstance(solver, TypeSolver):
+        return "[" + solver.name.lower() + "]"
+    return solver if solver.startswith("[") else "[" + solver + "]"
+
+
+def _solver_of(solving):
+    # returns the solver object, the string of options and the normalized options for the specified solver (TypeSolver or string)
+    solving = _solving_of(solving)
+    name, args, args_recursive = process_options(solving)
+    solver = Choco() if name.lower() == TypeSolver.CHOCO.name.lower() else Ace()
+    return solver, solving, args, args_recursive
+
+
+def _limits(cpu_limit, memory_limit):
+    # returns the resource limits to be set for the process of the solver
+    limits = []
+    if cpu_limit is not None:  # SIGXCPU is sent after cpu_limit seconds, and SIGKILL a few seconds later
+        limits.append((resource.RLIMIT_CPU, (int(cpu_limit), int(cpu_limit) + SolverProcess.KILL_DELAY)))
+    if memory_limit is not None:
+        limits.append((resource.RLIMIT_AS, (memory_limit, memory_limit)))
+    return limits
+
+
+def _wrapped(argv, limits):
+    # returns the arguments of a command that sets the specified resource limits before executing the specified one
+    # (so that the limits hold from the start of the solver, preexec_fn being not safe in the presence of threads)
+    code = "import os, resource, sys; [resource.setrlimit(r, l) for r, l in " + repr(limits) + "]; os.execvp(sys.argv[1], sys.argv[1:])"
+    return [sys.executable, "-c", code] + argv
+
+
+def _record(index, job):
+    # returns the result of the specified job, with only the fields known before running it
+    solving = _solving_of(job.solver) if isinstance(job.solver, (TypeSolver, str)) else repr(job.solver)
+    return {"index": index, "instance": job.instance if isinstance(job.instance, str) else None, "solver": solving, "options": job.options}
+
+
+def _run(index, job, wall_limit, cpu_limit, memory_limit):
+    solver, solving, args, args_recursive = _solver_of(job.solver)
+    solver.setting(job.options)
+    stopwatch = Stopwatch()
+    statistics = Statistics()
+    parser = OutputParser(on_bound=statistics.add_bound, on_line=lambda line: solver.parse_statistics(line, statistics))
+    record = _record(index, job)
+    with _model_path(job.instance, solver.SINGLE_READ) as model:
+        command, _ = solver._command(model, solving, args, args_recursive, True)
+        record["command"] = command
+        limited = resource is not None and not is_windows()
+        limits = _limits(cpu_limit, memory_limit) if limited else []
+        argv = command.split() if len(limits) == 0 else _wrapped(command.split(), limits)
+        # the solver (and its possible children) is run in its own process group
+        p = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True, start_new_session=limited)
+        reasons = []
+        lock = threading.Lock()
+        reaped = False
+
+        def _signal(sig, reason):
+            with lock:  # no signal must be sent once the solver is reaped, since its pid may be reused
+                if reaped or p.returncode is not None:
+                    return
+                reasons.append(reason)
+                try:
+                    if limited:
+                        os.killpg(p.pid, sig)
+                    else:
+                        p.send_signal(sig)
+                except ProcessLookupError:
+                    pass
+
+        timers = []
+        if wall_limit is not None:  # the solver is interrupted (so as to output its results), and then killed if it does not stop
+            timers = [threading.Timer(wall_limit, _signal, (signal.SIGINT, "wall")),
+                      threading.Timer(wall_limit + SolverProcess.KILL_DELAY, _signal, (signal.SIGKILL if limited else signal.SIGTERM, "wall"))]
+        for timer in timers:
+            timer.daemon = True
+            timer.start()
+        for line in p.stdout:
+            parser.feed(line)
+        if limited:  # CPU time and peak RSS of the solver, measured by the kernel
+            if hasattr(os, "waitid"):  # waits for the end of the solver without reaping it, so that timers can still signal it
+                os.waitid(os.P_PID, p.pid, os.WEXITED | os.WNOWAIT)
+            with lock:
+                reaped = True
+                _, wait_status, usage = os.wait4(p.pid, 0)
+            p.returncode = os.waitstatus_to_exitcode(wait_status)
+            record["cpu"] = round(usage.ru_utime + usage.ru_stime, 3)
+            record["peak_rss_kb"] = usage.ru_maxrss
+        else:
+            p.wait()
+        for timer in timers:
+            timer.cancel()
+    # SIGXCPU may be received while the measured CPU time is slightly less than the limit (because of the granularity of the kernel accounting)
+    if limited and cpu_limit is not None and len(reasons) == 0 and (p.returncode == -signal.SIGXCPU
+                                                                    or p.returncode == -signal.SIGKILL and record["cpu"] >= cpu_limit):
+        reasons.append("cpu")
+    status = parser.status()
+    record.update({"status": status.name, "bound": parser.bound if status in (TypeStatus.SAT, TypeStatus.OPTIMUM) else None,
+                   "n_solutions": parser.n_solutions, "wck": float(stopwatch.elapsed_time()), "returncode": p.returncode,
+                   "limit": reasons[0] if reasons else None, "statistics": statistics.as_dict()})
+    return record
+
+
+def solve_many(jobs, *, output=None, workers=None, wall_limit=None, cpu_limit=None, memory_limit=None):
+    """
+    Solves the specified jobs (compiled instances with solvers and options), at most 'workers' of them being run at the same time,
+    and generates the results (dictionaries) as soon as jobs are finished (so, not necessarily in the order of the jobs).
+    Each result is also appended to the specified JSONL file (if any) as soon as it is known, so that finished jobs are never lost.
+    A job that cannot be run (e.g., because of a missing file) gives a result with status ERROR and the message of the error (key error).
+    On Linux and macOS, the limits are hard ones, set (with setrlimit) in the process of the solver before it starts, and the CPU time and peak RSS
+    of the solver (measured with wait4) are given in the results. Note that a JVM reserves a large address space when starting,
+    so the memory limit must be rather loose for Java solvers.
+
+    :param jobs: a list of Job objects, or tuples (instance, solver) or (instance, solver, options) where instance is the name of an XCSP3 file,
+                 solver is as for the function solve() (e.g., ACE or "[ace,limit=10s]") and options is a string of specific options
+    :param output: the name of a JSONL file where results are appended, or None
+    :param workers: the maximum number of simultaneous jobs (the number of cores if None)
+    :param wall_limit: the maximum number of seconds (wall clock) for each job, or None
+    :param cpu_limit: the maximum number of seconds (CPU) for each job, or None
+    :param memory_limit: the maximum size (in bytes) of the address space of each job, or None
+    :return: a generator of results (dictionaries with keys index, instance, solver, options, command, status, bound, n_solutions,
+             wck, cpu, peak_rss_kb, returncode, limit, statistics, or error)
+    """
+    jobs = [job if isinstance(job, Job) else Job(*job) for job in jobs]
+    with ThreadPoolExecutor(max_workers=workers if workers else cpu_count()) as executor, ExitStack() as stack:
+        f = stack.enter_context(open(output, "a")) if output is not None else None
+        futures = {executor.submit(_run, i, job, wall_limit, cpu_limit, memory_limit): i for i, job in enumerate(jobs)}
+        try:
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:  # the other jobs are not impacted
+                    result = _record(futures[future], jobs[futures[future]])
+                    result.update({"status": "ERROR", "error": type(e).__name__ + ": " + str(e)})
+                if f is not None:
+                    f.write(json.dumps(result) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())  # the result is on disk, even if the process crashes later
+                yield result
+        finally:  # if the generator is closed before the end, pending jobs are cancelled
+            for future in futures:
+                future.cancel()
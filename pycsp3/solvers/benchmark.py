@@ -0,0 +1,77 @@
+"""
+Measures the latency saved by solving XCSP3 instances with a warm solver session (persistent JVM) instead of a new JVM per solving operation.
+
+Usage: python pycsp3/solvers/benchmark.py [-runs=<n>] [-options=<solver options>] <file.xml> ...
+"""
+import subprocess
+import sys
+import time
+
+from pycsp3.solvers.ace import Ace, AcePy4J
+
+DEFAULT_RUNS = 5  # hard coding
+
+
+def _cold(files, options, runs):
+    command = Ace().command.split()
+    times = []
+    for file in files:
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command + [file] + options, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def _warm(files, options, runs):
+    session = AcePy4J()
+    start = time.perf_counter()
+    session.start()
+    startup = time.perf_counter() - start
+    times = []
+    try:
+        for file in files:
+            for _ in range(runs):
+                start = time.perf_counter()
+                for _ in session.run([file] + options):
+                    pass
+                times.append(time.perf_counter() - start)
+    finally:
+        session.close()
+    return startup, times, session.n_starts
+
+
+def _summary(times):
+    times = sorted(times)
+    return "mean={:.3f}s median={:.3f}s min={:.3f}s max={:.3f}s".format(sum(times) / len(times), times[len(times) // 2], times[0], times[-1])
+
+
+def benchmark(files, *, runs=DEFAULT_RUNS, options=""):
+    """
+    Solves each specified instance several times with a new JVM per solving operation, and then with a warm session,
+    and returns a pair composed of the lists of elapsed times (in seconds) for the two modes
+
+    :param files: the filenames of the XCSP3 instances
+    :param runs: the number of solving operations per instance and per mode
+    :param options: the options given to the solver (e.g., "-t=10s")
+    """
+    options = options.split()
+    cold = _cold(files, options, runs)
+    startup, warm, n_starts = _warm(files, options, runs)
+    print("  cold JVM (one per solving operation): " + _summary(cold))
+    print("  warm session (after a startup of {:.3f}s): ".format(startup) + _summary(warm))
+    print("  JVMs started by the session: {} for {} solving operations".format(n_starts, len(warm)))
+    saved = sum(cold) - sum(warm) - startup
+    print("  latency saved: {:.3f}s in total, {:.3f}s per solving operation".format(saved, saved / len(cold)))
+    return cold, warm
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    runs = next((int(arg[6:]) for arg in args if arg.startswith("-runs=")), DEFAULT_RUNS)
+    options = next((arg[9:] for arg in args if arg.startswith("-options=")), "")
+    files = [arg for arg in args if not arg.startswith("-")]
+    if len(files) == 0:
+        print(__doc__.strip())
+        sys.exit(1)
+    benchmark(files, runs=runs, options=options)
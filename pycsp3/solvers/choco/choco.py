@@ -1,10 +1,15 @@
 import os
+import re
 
-from pycsp3.solvers.solver import SolverProcess  # , SolverPy4J
+from pycsp3.solvers.solver import SolverProcess, SolverPy4J, _number
 
 CHOCO_DIR = os.sep.join(__file__.split(os.sep)[:-1]) + os.sep
 CHOCO_CP = CHOCO_DIR + "choco-parsers-4.10.15-beta.jar"
 
+# statistics output by Choco, e.g., "Model[Queens], 1 Solutions, Resolution time 0.123s, 25 Nodes (203.2 n/s), 30 Backtracks, 15 Fails, 0 Restarts"
+CHOCO_COUNTERS = re.compile(r"(\d+)\s+(Solutions|Nodes|Backtracks|Backjumps|Fails|Restarts)\b")
+CHOCO_TIMES = re.compile(r"(Building time|Resolution time|Time to best solution)\s*:?\s*(\d+(?:[.,]\d+)?)s")
+
 
 class Choco(SolverProcess):
     def __init__(self):
@@ -13,6 +18,15 @@ class Choco(SolverProcess):
             command="java -cp " + CHOCO_CP + " org.chocosolver.parser.xcsp.ChocoXCSP", cp=CHOCO_CP
         )
 
+    def parse_statistics(self, line, statistics):
+        for value, name in CHOCO_COUNTERS.findall(line):
+            statistics[name.lower()] = int(value)
+        for name, value in CHOCO_TIMES.findall(line):
+            name = name.lower().replace(" ", "_")
+            statistics["best_solution_time" if name == "time_to_best_solution" else name] = _number(value)
+        if "building_time" in statistics:
+            statistics["preprocessing_time"] = statistics["building_time"]
+
     def parse_general_options(self, string_options, dict_options, dict_simplified_options):
         free, all = False, False
         args_solver = ""
@@ -99,7 +113,13 @@ class Choco(SolverProcess):
             print("  Saving trace into a file not implemented in Choco")
         return args_solver + " -flt"
 
-# class ChocoPy4J(SolverPy4J):  # TODO in progress
-#     def __init__(self):
-#         cp = CHOCO_CP + os.pathsep + CHOCO_DIR + "../py4j0.10.8.1.jar" + os.pathsep + CHOCO_DIR + " ChocoSolverPy4J"
-#         super().__init__(name="Choco-solver", command="java -cp " + cp, cp=CHOCO_CP)
+
+
+class ChocoPy4J(SolverPy4J, Choco):
+    """
+    Choco run in a persistent JVM (session), so as to avoid paying the startup of the JVM for each solving operation
+    """
+
+    def __init__(self):
+        SolverPy4J.__init__(self, name="Choco-solver", command="java -cp " + CHOCO_CP + " org.chocosolver.parser.xcsp.ChocoXCSP", cp=CHOCO_CP,
+                            main_class="org.chocosolver.parser.xcsp.ChocoXCSP")
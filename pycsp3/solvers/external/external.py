@@ -4,6 +4,8 @@ from pycsp3.solvers.solver import SolverProcess  # , SolverPy4J
 
 
 class ExternalProcess(SolverProcess):
+    SINGLE_READ = False  # the way the instance file is read is unknown
+
     def __init__(self, name, command):
         super().__init__(name=name, command=command, cp="")
 
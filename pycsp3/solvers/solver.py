@@ -1,21 +1,32 @@
+import asyncio
+import errno
+import functools
+import lzma
 import os
+import queue
 import re
+import select
+import shutil
 import signal
 import subprocess
 import sys
+import tempfile
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import aclosing, contextmanager
+from collections import deque
 
 from lxml import etree
 
-from pycsp3.classes.auxiliary.enums import TypeStatus
-from pycsp3.classes.entities import VarEntities, EVar
-from pycsp3.classes.main.variables import Variable, VariableInteger
+from pycsp3.classes.auxiliary.enums import TypeStatus, TypeCtr
+from pycsp3.classes.entities import VarEntities, EVar, EVarArray, ObjEntities
+from pycsp3.classes.main.variables import Variable, VariableInteger, SolutionStore
 from pycsp3.compiler import Compilation
 from pycsp3.dashboard import options
-from pycsp3.tools.utilities import Stopwatch, flatten, GREEN, WHITE, is_windows, ANY
-
-
-# from py4j.java_gateway import JavaGateway, Py4JNetworkError
+from pycsp3.tools import cacher
+from pycsp3.tools.utilities import Stopwatch, flatten, GREEN, WHITE, is_windows, ANY, error
 
 
 def process_options(solving):
@@ -106,38 +117,75 @@ def process_options(solving):
 
 
 class Logger:
-    def __init__(self, prefix_end="", verbose=0, path=None):
+    """
+    Records the output of a solver in a log file (through a single buffered handle).
+    Optionally, the last lines are also kept in memory (ring buffer of tail_size bytes), and the log file is compressed (lzma) when closed.
+    """
+
+    BUFFER_SIZE = 1 << 16  # hard coding
+
+    def __init__(self, prefix_end="", verbose=0, path=None, *, tail_size=None, compress=False):
         mac, pid = hex(uuid.getnode()), str(os.getpid())
         filename = "solver_" + mac + "_" + pid + "_" + (str(prefix_end) if prefix_end else "") + ".log"
         self.log_file = (path if path else os.getcwd()) + os.sep + filename
         # self.log_file = os.path.dirname(os.path.realpath(__file__)) + os.sep + filename  # old code
         if verbose > 0:
-            print("    - logfile:", self.log_file)
+            print("    - logfile:", self.log_file + (".lzma" if compress else ""))
         if os.path.exists(self.log_file):
             os.remove(self.log_file)
-        self.log = open(self.log_file, "a")
+        self.log = open(self.log_file, "w", buffering=Logger.BUFFER_SIZE)
+        self.tail_size = tail_size
+        self.compress = compress
+        self.tail_lines = deque()  # the last written lines, when tail_size is not None
+        self.tail_length = 0
 
     def write(self, message):
-        self.log = open(self.log_file, "a")
         self.log.write(message)
-        self.log.flush()
+        if self.tail_size is not None:
+            self.tail_lines.append(message)
+            self.tail_length += len(message)
+            while self.tail_length > self.tail_size and len(self.tail_lines) > 1:
+                self.tail_length -= len(self.tail_lines.popleft())
+
+    def tail(self):
+        """
+        Returns the last lines written in the log (at most tail_size characters, except if the last line is longer), or None if no ring buffer is used
+        """
+        return "".join(self.tail_lines) if self.tail_size is not None else None
 
     def read(self):
-        o = open(self.log_file, "r")
-        r = o.read()
-        o.close()
-        return r
+        if not self.log.closed:
+            self.log.flush()
+        with (lzma.open(self.log_file, "rt") if self.log_file.endswith(".lzma") else open(self.log_file, "r")) as f:
+            return f.read()
 
     def close(self):
         self.log.close()
+        if self.compress and not self.log_file.endswith(".lzma"):
+            with open(self.log_file, "rb") as f, lzma.open(self.log_file + ".lzma", "w") as g:
+                shutil.copyfileobj(f, g)
+            os.remove(self.log_file)
+            self.log_file += ".lzma"
+
+
+def _record_solution(variables, values, first):
+    if first:  # reset the history in that case (the columns of the store following the order of declaration of the variables)
+        SolutionStore.reset(x for e in VarEntities.items for x in (e.flatVars if isinstance(e, EVarArray) else [e.variable]))
+    SolutionStore.add(variables, values)
 
 
 class Instantiation:
-    def __init__(self, root, variables, values, pretty_solution):
+    def __init__(self, root, variables, values, pretty_solution=None):
         self.root = root
         self.variables = variables
         self.values = values
-        self.pretty_solution = pretty_solution
+        self._pretty_solution = pretty_solution  # computed when necessary
+
+    @property
+    def pretty_solution(self):
+        if self._pretty_solution is None:
+            self._pretty_solution = etree.tostring(self.root, pretty_print=True, xml_declaration=False).decode("UTF-8").strip()
+        return self._pretty_solution
 
     def __repr__(self):
         return self.variables, self.values
@@ -146,9 +194,350 @@ class Instantiation:
         return str(self.pretty_solution)
 
 
+class OutputParser:
+    """
+    Parses the output of a solver line by line (while being produced), so that each solution and each bound can be handled as soon as found,
+    without keeping the whole output in memory
+    """
+
+    def __init__(self, on_instantiation=None, on_bound=None, on_line=None):
+        self.on_instantiation = on_instantiation  # called with the root (lxml element) of each instantiation (solution)
+        self.on_bound = on_bound  # called with each new bound (line starting with 'o')
+        self.on_line = on_line  # called with each line that is not a part of an instantiation (e.g., for collecting statistics)
+        self.n_lines = 0
+        self.buffer = None  # the lines of the instantiation being read, if any
+        self.last_root = None  # the root of the last instantiation
+        self.n_instantiations = 0
+        self.bound = None
+        self.n_solutions = None
+        self.unsat = False
+        self.optimum = False
+        self.missing = False
+        self.core = None
+
+    def _instantiation(self, s):
+        root = etree.fromstring(s.replace("\nv", ""), etree.XMLParser(remove_blank_text=True))
+        self.last_root = root
+        self.n_instantiations += 1
+        return self.on_instantiation(root) if self.on_instantiation is not None else None
+
+    def feed(self, line):
+        """
+        Parses the specified line of the output of the solver, and returns False if a callback asked for stopping the solver
+        """
+        self.n_lines += 1
+        if self.buffer is None and "<instantiation" in line:
+            self.buffer = [line[line.find("<instantiation"):]]
+        elif self.buffer is not None:
+            self.buffer.append(line)
+        if self.buffer is not None:
+            if "</instantiation>" in line:
+                s = "".join(self.buffer)
+                self.buffer = None
+                return self._instantiation(s[:s.find("</instantiation>") + len("</instantiation>")])
+            return None
+        if self.on_line is not None:
+            self.on_line(line)
+        if line.startswith("o "):
+            tokens = line.split()
+            if len(tokens) > 1 and tokens[-1].lstrip("-").isdigit():
+                self.bound = int(tokens[-1])
+                if self.on_bound is not None:
+                    return self.on_bound(self.bound)
+        elif "<unsatisfiable" in line or "s UNSATISFIABLE" in line:
+            self.unsat = True
+        elif "s OPTIMUM" in line:
+            self.optimum = True
+        elif "c CORE" in line:
+            self.core = line[line.find("c CORE"):].rstrip("\n")
+        elif "d FOUND SOLUTIONS" in line:
+            tokens = line.split()
+            if tokens[-1].isdigit():
+                self.n_solutions = int(tokens[-1])
+        if "Missing Implementation" in line:
+            self.missing = True
+        return None
+
+    def status(self):
+        """
+        Returns the status of the solving operation, as given by the lines parsed so far
+        """
+        if self.unsat:
+            return TypeStatus.UNSAT
+        if self.last_root is None:
+            return TypeStatus.UNKNOWN
+        return TypeStatus.OPTIMUM if self.optimum else TypeStatus.SAT
+
+
+class Statistics:
+    """
+    The statistics of a solving operation, collected while the output of the solver is produced:
+    the trajectory of bounds (pairs composed of the elapsed time in seconds and the bound) and the values of counters
+    (e.g., nodes, fails, wrong_decisions, restarts, preprocessing_time), whose names and availability depend on the solver
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.bounds = []
+        self.counters = dict()
+
+    def elapsed_time(self):
+        return time.perf_counter() - self.start
+
+    def add_bound(self, bound):
+        self.bounds.append((round(self.elapsed_time(), 3), bound))
+
+    def __getitem__(self, name):
+        return self.counters.get(name)
+
+    def __setitem__(self, name, value):
+        self.counters[name] = value
+
+    def __contains__(self, name):
+        return name in self.counters
+
+    def as_dict(self):
+        return {"bounds": list(self.bounds), **self.counters}
+
+    def __repr__(self):
+        return "Statistics(" + ", ".join(k + "=" + str(v) for k, v in self.as_dict().items()) + ")"
+
+
+def _number(s, *, grouping=False):
+    # the number (int or float) at the start of the specified string (possibly followed by a unit), or None;
+    # commas are seen as group separators if grouping is True, and as decimal separators otherwise
+    if grouping:
+        s = re.sub(r"(?<=\d),(?=\d{3})", "", s)
+    m = re.match(r"-?\d+([.,]\d+)?", s)
+    if m is None:
+        return None
+    return float(m.group().replace(",", ".")) if m.group(1) else int(m.group())
+
+
+class _SolvingRun:
+    """
+    The state of a solving operation: parsing of the output of the solver, decoding of solutions and extraction of the result
+    """
+
+    def __init__(self, solver, cop, *, extraction, multiple, recording, on_solution, on_bound):
+        self.solver = solver
+        self.cop = cop
+        self.extraction = extraction
+        self.multiple = multiple  # True if the history of all solutions is recorded
+        self.recording = recording  # True if solutions are recorded in variables
+        self.on_solution = on_solution
+        self.decoders = dict()  # for each text of a list of an instantiation, the variables corresponding to the successive values
+        self.statistics = Statistics()
+        self.on_bound = on_bound
+        self.parser = OutputParser(self._on_instantiation, self._on_bound, lambda line: solver.parse_statistics(line, self.statistics))
+        solver.last_statistics = self.statistics
+
+    def _on_bound(self, bound):
+        self.statistics.add_bound(bound)
+        return self.on_bound(bound) if self.on_bound is not None else None
+
+    def _decoder(self, text):
+        if text not in self.decoders:  # the decoder is built only once per solving operation (and not for each solution)
+            variables = []
+            for token in text.split():
+                r = VarEntities.get_item_with_name(token)
+                if isinstance(r, EVar):
+                    variables.append(r.variable)
+                elif isinstance(r, Variable):
+                    variables.append(r)
+                else:
+                    for x in flatten(r.variables, keep_none=True):
+                        variables.append(x)
+            self.decoders[text] = variables
+        return self.decoders[text]
+
+    def _decode(self, root):
+        variables = self._decoder(root[0].text)
+        values = []
+        for tok in root[1].text.split():
+            if 'x' in tok:  # in order to handle compact forms in solutions
+                vk = tok.split('x')
+                assert len(vk) == 2
+                for _ in range(int(vk[1])):
+                    values.append(vk[0])
+            else:
+                values.append(tok)
+        # values is a list with all values given as strings (possibly '*')
+        assert len(variables) == len(values)
+        for i, _ in enumerate(values):
+            if variables[i] and isinstance(variables[i], VariableInteger):
+                values[i] = int(values[i]) if values[i] != "*" else ANY
+        return variables, values
+
+    def _on_instantiation(self, root):
+        if self.multiple and self.recording:  # the history of all solutions is recorded
+            variables, values = self._decode(root)
+            _record_solution(variables, values, self.parser.n_instantiations == 1)
+        elif self.on_solution is not None:
+            variables, values = self._decode(root)
+        else:
+            return None  # decoding is only performed for the last instantiation (see result())
+        if self.on_solution is not None:
+            return self.on_solution(Instantiation(root, variables, values))
+        return None
+
+    def result(self):
+        """
+        Returns the status of the solving operation, after having recorded the last solution (if any) in the solver
+        """
+        solver, parser = self.solver, self.parser
+        if parser.n_lines == 0:
+            return TypeStatus.UNKNOWN
+        if self.extraction:
+            if parser.core is None:
+                return TypeStatus.UNKNOWN
+            solver.core = parser.core
+            return TypeStatus.CORE
+
+        status = parser.status()
+        if status == TypeStatus.UNSAT:
+            return status
+        if status == TypeStatus.UNKNOWN:
+            print("  Actually, the instance was not solved")
+            return status
+
+        root = parser.last_root
+        variables, values = self._decode(root)
+        if self.recording and not self.multiple:
+            _record_solution(variables, values, True)
+        if self.cop:
+            root.attrib['type'] = "optimum" if parser.optimum else "solution"
+            if "cost" not in root.attrib and parser.bound is not None:
+                root.attrib['cost'] = str(parser.bound)
+            if "cost" in root.attrib:
+                solver.bound = int(root.attrib['cost'])
+            if "id" in root.attrib:
+                del root.attrib['id']
+        solver.last_solution = Instantiation(root, variables, values)
+        if parser.n_solutions is not None:
+            solver.n_solutions = parser.n_solutions
+        return status
+
+    def record(self, status, wck, limit):
+        """
+        Returns the result of the solving operation as a dictionary (to be cached)
+        """
+        found = status in (TypeStatus.SAT, TypeStatus.OPTIMUM)
+        return {"status": status.name, "bound": self.solver.bound if found and self.cop else None, "n_solutions": self.parser.n_solutions,
+                "solution": etree.tostring(self.parser.last_root).decode("UTF-8") if found else None, "wck": wck, "limit": limit}
+
+    def restore(self, result):
+        """
+        Sets the solver (and the variables) as if the solving operation had given the specified (cached) result, and returns the status
+        """
+        solver = self.solver
+        if result["bound"] is not None:
+            solver.bound = result["bound"]
+        if result["n_solutions"] is not None:
+            solver.n_solutions = result["n_solutions"]
+        if result["solution"] is not None:
+            root = etree.fromstring(result["solution"])
+            variables, values = self._decode(root)
+            if self.recording:
+                _record_solution(variables, values, True)
+            solver.last_solution = Instantiation(root, variables, values)
+        return TypeStatus[result["status"]]
+
+
+def _write_model(model, output):
+    # writes the specified model (bytes or a StreamedDocument) into the specified binary stream
+    if isinstance(model, (bytes, bytearray)):
+        output.write(model)
+    else:
+        model.write(output)
+
+
+class _FifoWriter:
+    """
+    A binary stream writing into a named pipe opened in non-blocking mode, and giving up (BrokenPipeError) when the solving operation is over,
+    so that writing never blocks indefinitely (e.g., if the solver stops reading without closing the pipe)
+    """
+
+    BUFFER_SIZE = 1 << 16  # hard coding
+
+    def __init__(self, fd, over):
+        self.fd = fd
+        self.over = over  # an event set when the solving operation is over
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data
+        if len(self.buffer) >= _FifoWriter.BUFFER_SIZE:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        written = 0
+        while written < len(self.buffer):
+            if self.over.is_set():
+                raise BrokenPipeError("the solving operation is over")
+            try:
+                written += os.write(self.fd, self.buffer[written:written + _FifoWriter.BUFFER_SIZE])
+            except BlockingIOError:  # the pipe is full
+                select.select([], [self.fd], [], 0.1)
+        self.buffer.clear()
+
+
+def _feed(model, path, over):
+    # writes the model into the named pipe once the solver has opened it; nothing blocks, so that feeding stops when the solving operation is over
+    while not over.is_set():
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        except OSError as e:
+            if e.errno != errno.ENXIO:  # ENXIO as long as the solver has not opened the pipe
+                return
+            over.wait(0.01)
+            continue
+        try:
+            writer = _FifoWriter(fd, over)
+            _write_model(model, writer)
+            writer.flush()
+        except OSError:  # e.g., BrokenPipeError if the solver stops before reading the whole document
+            pass
+        finally:
+            os.close(fd)
+        return
+
+
+@contextmanager
+def _model_path(model, single_read=True):
+    # yields the path from which the solver can read the specified model (a filename, or bytes or a StreamedDocument). A document that is not
+    # in a file is fed through a named pipe (FIFO) if the solver reads it only once; otherwise (or on systems without FIFOs, e.g., Windows),
+    # it is written in a temporary file
+    if isinstance(model, str):
+        yield model
+        return
+    directory = tempfile.mkdtemp(prefix="pycsp3-")
+    over, feeder = threading.Event(), None
+    try:
+        path = os.path.join(directory, (Compilation.string_model or "instance") + ".xml")
+        if single_read and hasattr(os, "mkfifo"):
+            os.mkfifo(path)
+            feeder = threading.Thread(target=_feed, args=(model, path, over), daemon=True)
+            feeder.start()
+        else:
+            with open(path, "wb") as f:
+                _write_model(model, f)
+        yield path
+    finally:
+        over.set()  # the feeder (if any) stops at its next step, whether the solver has opened the pipe or not
+        if feeder is not None:
+            feeder.join()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
 class SolverProcess:
     automatic_call = False
 
+    KILL_DELAY = 5  # hard coding (in seconds, after an interruption, before killing a solver)
+    SINGLE_READ = True  # True if the solver reads (opens) its instance file only once, so that the document can be fed through a named pipe
+    LINE_LIMIT = 1 << 28  # hard coding (maximal length of lines output by solvers, when reading them asynchronously)
+
     def __init__(self, *, name, command, cp):
         self.name = name
         self.command = command
@@ -160,11 +549,15 @@ class SolverProcess:
         self.log_filename_suffix = None
         self.n_executions = 0
         self.last_log = None
+        self.last_log_tail = None  # the last lines of the output of the solver (when using the option -log_tail)
+        self.last_statistics = None  # the statistics of the last (or current) execution
         # concerning the last execution:
         self.last_solution = None
         self.n_solutions = None
         self.bound = None
         self.status = None
+        self.process = None  # the process of the last (or current) execution
+        self.cancelled = False  # True if the current solving operation must be interrupted as soon as its process is started
         # concerning extraction:
         self.core = None
 
@@ -182,142 +575,61 @@ class SolverProcess:
     def log_suffix(self, _extend_filename_logger):
         self.log_filename_suffix = _extend_filename_logger
 
+    def parse_statistics(self, line, statistics):
+        """
+        Records in the specified Statistics object the information given by the specified line output by the solver (to be overridden)
+        """
+        pass
+
     def parse_general_options(self, string_options, dict_options, dict_simplified_options):  # specific options via args are managed automatically
         raise NotImplementedError("Must be overridden")
 
-    def _solve(self, instance, string_options="", dict_options=None, dict_simplified_options=None, compiler=False, *, verbose=0, automatic=False,
-               extraction=False):
-        if dict_options is None:
-            dict_options = dict()
-        if dict_simplified_options is None:
-            dict_simplified_options = dict()
-        model, cop = instance
-        if extraction:
-            self.switch_to_extraction()
+    def interrupt(self):
+        """
+        Interrupts (by sending SIGINT to its process group) the solving process currently run by this solver, if any
+        """
+        self._send_signal(signal.SIGINT)
 
-        def _int_from(s, left):
-            right = left + s[left:].find("\n")
-            left = right - 1
-            while s[left].isdigit():
-                left -= 1
-            return int(s[left + 1:right])
+    def cancel(self):
+        """
+        Interrupts the solving operation of this solver, even if its process is not started yet (it is then interrupted as soon as started)
+        """
+        self.cancelled = True
+        self.interrupt()
 
-        def _record_solution(roots, i):
-            variables = []
-            for token in roots[i][0].text.split():
-                r = VarEntities.get_item_with_name(token)
-                if isinstance(r, EVar):
-                    variables.append(r.variable)
-                elif isinstance(r, Variable):
-                    variables.append(r)
-                else:
-                    for x in flatten(r.variables, keep_none=True):
-                        variables.append(x)
-            if i == 0:  # reset the history in that case
-                for x in variables:
-                    if x:
-                        x.values = []
-            values = []
-            for tok in roots[i][1].text.split():
-                if 'x' in tok:  # in order to handle compact forms in solutions
-                    vk = tok.split('x')
-                    assert len(vk) == 2
-                    for _ in range(int(vk[1])):
-                        values.append(vk[0])
-                else:
-                    values.append(tok)
-            # values is a list with all values given as strings (possibly '*')
-            assert len(variables) == len(values)
-            for i, _ in enumerate(values):
-                if variables[i]:
-                    if isinstance(variables[i], VariableInteger):
-                        values[i] = int(values[i]) if values[i] != "*" else ANY
-                    variables[i].value = values[i]  # we record the last found solution value
-                    variables[i].values.append(values[i])  # we record it in the history
-            return variables, values
-
-        def extract_result_and_solution(stdout):
-            if extraction:
-                left = stdout.rfind("c CORE")
-                if left == -1:
-                    return TypeStatus.UNKNOWN
-                right = left + stdout[left:].find("\n")
-                self.core = stdout[left:right]
-                return TypeStatus.CORE
-
-            if stdout.find("<unsatisfiable") != -1 or stdout.find("s UNSATISFIABLE") != -1:
-                return TypeStatus.UNSAT
-            if stdout.find("<instantiation") == -1 or stdout.find("</instantiation>") == -1:
-                print("  Actually, the instance was not solved")
-                return TypeStatus.UNKNOWN
-
-            if "limit=no" in string_options or ("limit_sols" in dict_simplified_options and int(dict_simplified_options["limit_sols"]) > 1):
-                # TODo findall does not seem to work with the output of Choco. why?
-                roots = [etree.fromstring(("<instantiation" + tok + "</instantiation>").replace("\nv", ""), etree.XMLParser(remove_blank_text=True))
-                         for tok in re.findall(r"<instantiation(.*?)</instantiation>", stdout)]
-            else:
-                left, right = stdout.rfind("<instantiation"), stdout.rfind("</instantiation>")
-                roots = [etree.fromstring(stdout[left:right + len("</instantiation>")].replace("\nv", ""), etree.XMLParser(remove_blank_text=True))]
-
-            for i in range(len(roots) - 1):  # all roots except the last one to record the history
-                _record_solution(roots, i)
-
-            root = roots[-1]
-            variables, values = _record_solution(roots, len(roots) - 1)
-            optimal = stdout.find("s OPTIMUM") != -1
-            if cop:
-                root.attrib['type'] = "optimum" if optimal else "solution"
-                if "cost" not in root.attrib:
-                    root.attrib['cost'] = _int_from(stdout, stdout.rfind("o ") + 2)
-                self.bound = int(root.attrib['cost'])
-                if "id" in root.attrib:
-                    del root.attrib['id']
-
-            def _array_values(t):
-                if t is None:
-                    return None
-                if isinstance(t, Variable):
-                    return t.value
-                t.values = [_array_values(v) for v in t]
-                return t.values
-
-            for array in Variable.arrays:
-                _array_values(array)  # we set the value of the field 'values'
-                # (currently, the recursive mode does not work; superficial copy when getting an item)
-
-            pretty_solution = etree.tostring(root, pretty_print=True, xml_declaration=False).decode("UTF-8").strip()
-            self.last_solution = Instantiation(root, variables, values, pretty_solution)
-            j = stdout.find("d FOUND SOLUTIONS")
-            if j != -1:
-                self.n_solutions = _int_from(stdout, j)
-            return TypeStatus.OPTIMUM if optimal else TypeStatus.SAT
-
-        def execute(cmd):
+    def _send_signal(self, sig):
+        p = self.process
+        if p is None or (p.poll() if isinstance(p, subprocess.Popen) else p.returncode) is not None:  # asyncio processes have no method poll()
+            return
+        try:
             if not is_windows():
-                p = subprocess.Popen(cmd.split(), stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, preexec_fn=os.setsid)
+                os.killpg(os.getpgid(p.pid), sig)
+            elif sig == signal.SIGINT:
+                p.terminate()
             else:
-                p = subprocess.Popen(cmd.split(), stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
-            stopped = False
-            handler = signal.getsignal(signal.SIGINT)
+                p.kill()
+        except ProcessLookupError:  # the process has just terminated
+            pass
 
-            def new_handler(frame, signum):
-                global stopped
-                stopped = True
-                os.killpg(os.getpgid(p.pid), signal.SIGINT)
+    def _command(self, model, string_options, dict_options, dict_simplified_options, compiler):
+        # returns the command for solving the specified model (filename) and the string of options, while completing the specified dictionaries
+        if compiler is False:  # To get options from the model
+            if len(string_options) == 0 or string_options[0] != "[":
+                string_options = "[" + self.name.lower() + ("," + string_options if len(string_options) > 0 else "") + "]"
+            solver, tmp_dict_options, tmp_dict_simplified_options = process_options(string_options)
+            dict_simplified_options.update(tmp_dict_simplified_options)
+            dict_options.update(tmp_dict_options)
 
-            signal.signal(signal.SIGINT, new_handler)
-            end_prefix = self.log_filename_suffix if self.log_filename_suffix is not None else str(self.n_executions)
-            log = Logger(end_prefix, verbose, Compilation.pathname)  # To record the output of the solver
-            self.last_log = log.log_file
-            for line in p.stdout:
-                if verbose == 2:
-                    sys.stdout.write(line)
-                log.write(line)
-            p.wait()
-            p.terminate()
-            log.close()
-            signal.signal(signal.SIGINT, handler)  # Reset the right SIGINT
-            return log.read(), stopped
+        solver_args = self.parse_general_options(string_options, dict_options, dict_simplified_options)
+        solver_args += " " + dict_options["args"] if "args" in dict_options else ""
+        solver_args += " " + self.options
+        return self.command + " " + (model if model is not None else "") + " " + solver_args, string_options
+
+    def _prepare(self, instance, string_options, dict_options, dict_simplified_options, compiler, *, verbose, automatic, extraction):
+        # returns the command to be executed, the verbosity level and a Boolean indicating if all solutions are recorded (or None if no execution)
+        model, cop = instance
+        if extraction:
+            self.switch_to_extraction()
 
         if model is not None and len(VarEntities.items) == 0:
             print("\n The instance has no variable, so the solver is not run.")
@@ -329,27 +641,89 @@ class SolverProcess:
             return None
 
         SolverProcess.automatic_call = automatic
-        if compiler is False:  # To get options from the model
-            if len(string_options) == 0 or string_options[0] != "[":
-                string_options = "[" + self.name.lower() + ("," + string_options if len(string_options) > 0 else "") + "]"
-            solver, tmp_dict_options, tmp_dict_simplified_options = process_options(string_options)
-            dict_simplified_options.update(tmp_dict_simplified_options)
-            dict_options.update(tmp_dict_options)
-
-        stopwatch = Stopwatch()
-        solver_args = self.parse_general_options(string_options, dict_options, dict_simplified_options)
-        solver_args += " " + dict_options["args"] if "args" in dict_options else ""
-        solver_args += " " + self.options
-
+        command, string_options = self._command(model, string_options, dict_options, dict_simplified_options, compiler)
         verbose = 2 if options.solve or "verbose" in dict_simplified_options else verbose
-        command = self.command + " " + (model if model is not None else "") + " " + solver_args
 
         if verbose > 0:
             print("\n  * Solving by " + self.name + " in progress ... ")
             print("    - command:", command)
-        out_err, stopped = execute(command)
+        multiple = "limit=no" in string_options or ("limit_sols" in dict_simplified_options and int(dict_simplified_options["limit_sols"]) > 1)
+        return command, verbose, multiple
+
+    def _logger(self, verbose):
+        end_prefix = self.log_filename_suffix if self.log_filename_suffix is not None else str(self.n_executions)
+        tail_size = int(float(options.log_tail) * 1024 * 1024) if options.log_tail else None
+        return Logger(end_prefix, verbose, Compilation.pathname, tail_size=tail_size, compress=options.log_lzma)  # To record the output of the solver
 
-        missing = out_err is not None and out_err.find("Missing Implementation") != -1
+    def _execute(self, command, run, verbose):
+        # executes the specified command, while giving each line of the output to the parser of the specified run, and returns True if stopped
+        if not is_windows():
+            p = subprocess.Popen(command.split(), stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, preexec_fn=os.setsid)
+        else:
+            p = subprocess.Popen(command.split(), stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        self.process = p
+        if self.cancelled:  # cancelled (e.g., by a portfolio) before the process was started
+            self.interrupt()
+        stopped = False
+        main_thread = threading.current_thread() is threading.main_thread()  # signal handlers can only be set in the main thread
+        handler = signal.getsignal(signal.SIGINT)
+
+        def new_handler(frame, signum):
+            nonlocal stopped
+            stopped = True
+            self.interrupt()
+
+        if main_thread:
+            signal.signal(signal.SIGINT, new_handler)
+        self._consume(p.stdout, run, verbose)
+        p.wait()
+        p.terminate()
+        if main_thread:
+            signal.signal(signal.SIGINT, handler)  # Reset the right SIGINT
+        return stopped or self.cancelled
+
+    def _consume(self, lines, run, verbose):
+        # parses the specified lines output by the solver (while being produced), and records them in the log
+        log = self._logger(verbose)
+        interrupted = False
+        for line in lines:
+            if verbose == 2:
+                sys.stdout.write(line)
+            log.write(line)
+            if run.parser.feed(line) is False and not interrupted:  # a callback asked for stopping the solver
+                interrupted = True
+                self.interrupt()
+        log.close()
+        self.last_log, self.last_log_tail = log.log_file, log.tail()
+
+    def _solve(self, instance, string_options="", dict_options=None, dict_simplified_options=None, compiler=False, *, verbose=0, automatic=False,
+               extraction=False, on_solution=None, on_bound=None, recording=True, cache=False):
+        if dict_options is None:
+            dict_options = dict()
+        if dict_simplified_options is None:
+            dict_simplified_options = dict()
+
+        with _model_path(instance[0], self.SINGLE_READ) as model:
+            prepared = self._prepare((model, instance[1]), string_options, dict_options, dict_simplified_options, compiler, verbose=verbose,
+                                     automatic=automatic, extraction=extraction)
+            if prepared is None:
+                return None
+            command, verbose, multiple = prepared
+            run = _SolvingRun(self, instance[1], extraction=extraction, multiple=multiple, recording=recording, on_solution=on_solution,
+                              on_bound=on_bound)
+            cache_key, limit = None, float(dict_simplified_options["limit_time"]) if "limit_time" in dict_simplified_options else None
+            if cache and not (multiple or extraction or on_solution or on_bound):  # the result of the solving operation can be taken from the cache
+                cache_key = cacher.result_key(instance[0], self.name + " " + self.command + " " + self.options, dict_options, dict_simplified_options)
+                cached = cacher.lookup_result(cache_key, limit, instance[1])
+                if cached is not None:
+                    self.last_command_wck = "{:.2f}".format(cached["wck"])
+                    if verbose > 0:
+                        print("\n  * Solved by " + self.name + " in " + GREEN + self.last_command_wck + WHITE + " seconds (result from the cache)\n")
+                    return run.restore(cached)
+            stopwatch = Stopwatch()
+            stopped = self._execute(command, run, verbose)
+
+        missing = run.parser.missing
         self.last_command_wck = stopwatch.elapsed_time()
         if verbose > 0:
             if stopped:
@@ -363,52 +737,326 @@ class SolverProcess:
             else:
                 print()
         self.n_executions += 1
-        return extract_result_and_solution(out_err) if out_err else TypeStatus.UNKNOWN
+        status = run.result()
+        definitive = status in ((TypeStatus.OPTIMUM, TypeStatus.UNSAT) if instance[1] else (TypeStatus.SAT, TypeStatus.UNSAT))
+        if cache_key is not None and not stopped and (definitive or limit is not None):  # without limit, only definitive results are stored
+            cacher.store_result(cache_key, run.record(status, float(self.last_command_wck), limit))
+        return status
 
     def solve(self, instance, string_options="", dict_options=None, dict_simplified_options=None, compiler=False, *, verbose=0, automatic=False,
-              extraction=False):
+              extraction=False, on_solution=None, on_bound=None, recording=True, cache=False):
         self.status = self._solve(instance, string_options, dict_options, dict_simplified_options, compiler, verbose=verbose, automatic=automatic,
-                                  extraction=extraction)
+                                  extraction=extraction, on_solution=on_solution, on_bound=on_bound, recording=recording, cache=cache)
         return self.status
 
+    async def iter_async(self, instance, string_options="", dict_options=None, dict_simplified_options=None, *, verbose=0, timeout=None,
+                         recording=True):
+        """
+        Solves the specified (compiled) instance without blocking the event loop, and yields pairs ("solution", Instantiation)
+        and ("bound", int) as soon as solutions and bounds are found. At the end, the status of the solving operation is in the field status.
+        When the timeout (in seconds) is reached, the solver is interrupted (SIGINT) so as to get its final results, and then killed
+        if it does not stop within a few seconds. When the iteration is cancelled or closed early, the process group of the solver is killed.
+        Solutions are recorded in variables only if recording is True (which must not be the case for concurrent solving operations).
+        """
+        if dict_options is None:
+            dict_options = dict()
+        if dict_simplified_options is None:
+            dict_simplified_options = dict()
+        self.status = None
+        with _model_path(instance[0], self.SINGLE_READ) as model:
+            prepared = self._prepare((model, instance[1]), string_options, dict_options, dict_simplified_options, False, verbose=verbose, automatic=False,
+                                     extraction=False)
+            if prepared is None:
+                return
+            async with aclosing(self._iter_async(prepared, instance[1], verbose, timeout, recording)) as events:
+                async for event in events:  # the inner iteration is closed (and so the solver killed) when this one is
+                    yield event
+
+    async def _iter_async(self, prepared, cop, verbose, timeout, recording):
+        command, verbose, multiple = prepared
+        events = []
+        run = _SolvingRun(self, cop, extraction=False, multiple=multiple, recording=recording, on_solution=lambda sol: events.append(("solution", sol)),
+                          on_bound=lambda b: events.append(("bound", b)))
+        stopwatch = Stopwatch()
+        loop = asyncio.get_running_loop()
+        self.process = p = await asyncio.create_subprocess_exec(*command.split(), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+                                                                start_new_session=not is_windows(), limit=SolverProcess.LINE_LIMIT)
+        if self.cancelled:
+            self.interrupt()
+        log = self._logger(verbose)
+        deadline, interrupted = None if timeout is None else loop.time() + timeout, False
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(p.stdout.readline(), None if deadline is None else max(0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    if interrupted:  # the solver did not stop after being interrupted
+                        break
+                    interrupted, deadline = True, loop.time() + SolverProcess.KILL_DELAY
+                    self.interrupt()
+                    continue
+                if not line:
+                    break
+                line = line.decode()
+                if verbose == 2:
+                    sys.stdout.write(line)
+                log.write(line)
+                run.parser.feed(line)
+                while len(events) > 0:
+                    yield events.pop(0)
+        finally:
+            if p.returncode is None:
+                self._send_signal(signal.SIGKILL if not is_windows() else signal.SIGTERM)
+            await p.wait()  # the process is reaped, even when the iteration is cancelled or closed early
+            log.close()
+            self.last_log, self.last_log_tail = log.log_file, log.tail()
+            self.last_command_wck = stopwatch.elapsed_time()
+            self.n_executions += 1
+        self.status = run.result()
+
+    async def solve_async(self, instance, string_options="", dict_options=None, dict_simplified_options=None, *, verbose=0, timeout=None,
+                          on_solution=None, on_bound=None, recording=True):
+        """
+        Solves the specified (compiled) instance without blocking the event loop, and returns the status of the solving operation.
+        The functions on_solution and on_bound are called as soon as solutions and bounds are found; the solver is stopped if they return False.
+        """
+        events = self.iter_async(instance, string_options, dict_options, dict_simplified_options, verbose=verbose, timeout=timeout, recording=recording)
+        try:
+            async for kind, value in events:
+                callback = on_solution if kind == "solution" else on_bound
+                if callback is not None and callback(value) is False:
+                    self.interrupt()
+        finally:
+            await events.aclose()
+        return self.status
+
+    def record(self, solutions=None):
+        """
+        Records in variables the specified solutions (Instantiation objects), or if None, the last solution found by the solver (if any).
+        This is useful after a solving operation run without recording (e.g., concurrently with other ones).
+        """
+        if solutions is None:
+            solutions = [self.last_solution] if self.last_solution is not None and self.status in (TypeStatus.SAT, TypeStatus.OPTIMUM) else []
+        for i, solution in enumerate(solutions):
+            _record_solution(solution.variables, solution.values, i == 0)
+
     def switch_to_extraction(self):
         pass
 
-# class SolverPy4J(SolverProcess):  # TODO in progress
-#     gateways = []
-#     processes = []
-#
-#     def __init__(self, *, name, command, cp):
-#         self.gateway, self.process = SolverPy4J.connexion(command)
-#         SolverPy4J.gateways.append(self.gateway)
-#         SolverPy4J.processes.append(self.process)
-#         self.solver = self.gateway.entry_point.getSolver()
-#         super().__init__(name=name, command=command, cp=cp)
-#
-#     @staticmethod
-#     def connexion(command):
-#         process = subprocess.Popen(command.split())
-#         cnt = 0
-#         while True:
-#             time.sleep(0.1)
-#             cnt += 1
-#             print("Py4J Connection " + str(cnt) + " ...")
-#             try:
-#                 gateway = JavaGateway(eager_load=True)
-#             except Py4JNetworkError:
-#                 print("Py4J Connection failed: No JVM listening ...")
-#             else:
-#                 print("Py4J Successfully connected to the JVM")
-#                 return gateway, process
-#         return gateway, process
-#
-#     @staticmethod
-#     def close():
-#         for element in SolverPy4J.gateways:
-#             element.close()
-#
-#     def loadXCSP3(self, arg):
-#         if isinstance(arg, str):
-#             self.solver.loadXCSP3(arg)
-#         elif isinstance(arg, IOBase):
-#             self.solver.loadXCSP3(arg.name)
+
+class SolverPy4J(SolverProcess):
+    """
+    A solver run in a persistent JVM (session) through Py4J, so as to pay the startup and warm-up of the JVM only once for many solving operations.
+    For each solving operation, the solver is called with the usual arguments (see call()), and its output is parsed as usual.
+    If the JVM stops (e.g., because the solver calls System.exit() on a fatal error), it is automatically restarted for the next solving operation;
+    n_starts counts the started JVMs.
+    A session is used by one thread at a time; see SolverPool for concurrent solving.
+    """
+
+    sessions = []  # all built sessions (for stopping their JVMs when exiting)
+
+    SENTINEL = "c end of the solving operation in the session"  # hard coding
+
+    def __init__(self, *, name, command, cp, main_class):
+        SolverProcess.__init__(self, name=name, command=command, cp=cp)
+        self.main_class = main_class
+        self.gateway = None
+        self.lines = None  # the queue receiving the lines output by the JVM
+        self.n_starts = 0
+        SolverPy4J.sessions.append(self)
+
+    def start(self):
+        """
+        Starts the JVM of the session (done automatically when necessary)
+        """
+        try:
+            from py4j.java_gateway import JavaGateway
+        except ImportError:
+            error("The package py4j is required for using solver sessions (pip install py4j)")
+        self.lines = queue.Queue()
+        self.gateway = JavaGateway.launch_gateway(classpath=self.cp, die_on_exit=True, redirect_stdout=self.lines)
+        self.n_starts += 1
+
+    def alive(self):
+        return self.gateway is not None and self.gateway.java_process.poll() is None
+
+    def close(self):
+        """
+        Stops the JVM of the session
+        """
+        if self.gateway is None:
+            return
+        gateway, self.gateway = self.gateway, None
+        if gateway.java_process.poll() is not None:  # the JVM is already stopped (e.g., System.exit() called by the solver)
+            client = gateway._gateway_client  # not publicly accessible in py4j
+            client.close()
+            client.is_connected = False  # so that the Java objects that are released later do not try to reach the stopped JVM
+            return
+        try:
+            gateway.shutdown()
+        except Exception:  # the JVM may have stopped in the meantime
+            pass
+        if gateway.java_process.poll() is None:
+            gateway.java_process.kill()
+
+    def interrupt(self):
+        self.close()  # the JVM is stopped (and will be restarted at the next solving operation)
+
+    def call(self, jvm, args):
+        """
+        Calls the solver in the specified JVM with the specified arguments (Java array of strings), and returns when the solving operation is over.
+        By default, the main method of the main class is called, and the threads it possibly starts are waited for.
+        """
+        main_class = functools.reduce(getattr, self.main_class.split("."), jvm)
+        before = {t.getId() for t in jvm.java.lang.Thread.getAllStackTraces().keySet()}
+        main_class.main(args)
+        for t in jvm.java.lang.Thread.getAllStackTraces().keySet():  # waiting for threads possibly started by the solver
+            if t.getId() not in before and not t.isDaemon():
+                t.join()
+
+    def run(self, args):
+        """
+        Runs the solver in the JVM of the session with the specified arguments (list of strings), and yields the lines of its output
+        """
+        if not self.alive():
+            self.close()  # if the JVM has stopped, the connection to it is closed before starting a new one
+            self.start()
+        jvm = self.gateway.jvm
+        array = self.gateway.new_array(jvm.java.lang.String, len(args))
+        for i, arg in enumerate(args):
+            array[i] = arg
+        done, failed = threading.Event(), []
+
+        def _call():
+            try:
+                self.call(jvm, array)
+                jvm.System.out.println(SolverPy4J.SENTINEL)
+                jvm.System.out.flush()
+            except Exception as e:  # e.g., Py4JError if the JVM has stopped
+                failed.append(e)
+            finally:
+                done.set()
+
+        threading.Thread(target=_call, daemon=True).start()
+        while True:
+            try:
+                line = self.lines.get(timeout=0.1)
+            except queue.Empty:
+                if done.is_set() and (len(failed) > 0 or not self.alive()):
+                    break
+                continue
+            if line.rstrip("\n") == SolverPy4J.SENTINEL:
+                break
+            yield line
+
+    def _execute(self, command, run, verbose):
+        self.process = None
+        if not self.cancelled:
+            self._consume(self.run(command[len(self.command):].split()), run, verbose)
+        return self.cancelled
+
+
+class SolverPool:
+    """
+    A pool of solver sessions (e.g., AcePy4J objects), so that several threads can solve concurrently with warm JVMs
+    """
+
+    def __init__(self, factory, size, *, start=False):
+        """
+        :param factory: a function (typically, a class like AcePy4J) building a session
+        :param size: the number of sessions in the pool
+        :param start: True if the JVMs of the sessions must be started immediately (instead of at their first use)
+        """
+        self.sessions = [factory() for _ in range(size)]
+        self.available = queue.Queue()
+        for session in self.sessions:
+            if start:
+                session.start()
+            self.available.put(session)
+
+    @contextmanager
+    def session(self):
+        """
+        Returns (as a context manager) a session of the pool, waiting for one to be available if necessary
+        """
+        session = self.available.get()
+        try:
+            yield session
+        finally:
+            self.available.put(session)
+
+    def solve(self, instance, string_options="", **kwargs):
+        """
+        Solves the specified (compiled) instance with a session of the pool, and returns a pair composed of the session and the status
+        """
+        with self.session() as session:
+            return session, session.solve(instance, string_options, **kwargs)
+
+    def close(self):
+        for session in self.sessions:
+            session.close()
+
+
+def solve_portfolio(instance, runs, *, verbose=-1, on_solution=None, on_bound=None):
+    """
+    Solves the specified (compiled) instance by running concurrently several solvers, and returns a pair composed of the solver
+    whose result is retained and the status of the solving operation.
+    For a CSP, the first definitive answer (SAT or UNSAT) is retained and other solvers are interrupted.
+    For a COP, the best bound over all solvers is tracked; the first definitive answer (OPTIMUM or UNSAT) is retained,
+    and otherwise (e.g., time limits) the solver having found the best solution is retained.
+
+    :param instance: a pair (filename, cop) as returned when compiling
+    :param runs: a list of tuples (solver, string_options, dict_options, dict_simplified_options), each solver being a SolverProcess object
+    :param verbose: verbosity level from -1 to 2
+    :param on_solution: a function called with each solution (Instantiation object) found by any solver
+    :param on_bound: a function called with each bound (int) improving the best bound found so far by all solvers
+    :return: a pair (solver, status)
+    """
+    _, cop = instance
+    minimizing = cop and len(ObjEntities.items) > 0 and ObjEntities.items[0].constraint.name == TypeCtr.MINIMIZE
+    lock = threading.Lock()
+    best = [None]  # the best bound found so far (by any solver)
+
+    def _on_bound(b):
+        with lock:
+            if best[0] is not None and (b >= best[0] if minimizing else b <= best[0]):
+                return None
+            best[0] = b
+            return on_bound(b) if on_bound is not None else None
+
+    def _on_solution(sol):
+        with lock:
+            return on_solution(sol)
+
+    def _run(solver, string_options, dict_options, dict_simplified_options):
+        return solver.solve(instance, string_options, dict_options, dict_simplified_options, verbose=verbose, on_solution=_on_solution if on_solution else None,
+                            on_bound=_on_bound, recording=False)
+
+    definitive = (TypeStatus.OPTIMUM, TypeStatus.UNSAT) if cop else (TypeStatus.SAT, TypeStatus.UNSAT)
+    solvers = [run[0] for run in runs]
+    for i, solver in enumerate(solvers):
+        solver.log_suffix("portfolio" + str(i))  # for having different log files
+        solver.cancelled = False
+    winner, status = None, TypeStatus.UNKNOWN
+    with ThreadPoolExecutor(max_workers=len(runs)) as executor:
+        futures = {executor.submit(_run, *run): run[0] for run in runs}
+        try:
+            for future in as_completed(futures):
+                solver, result = futures[future], future.result()
+                if winner is None or winner.status not in definitive:
+                    if result in definitive:
+                        winner, status = solver, result
+                        for other in solvers:  # the other solvers are interrupted (possibly, as soon as their processes are started)
+                            if other is not solver:
+                                other.cancel()
+                    elif result == TypeStatus.SAT and (winner is None or winner.status != TypeStatus.SAT or
+                                                       (solver.bound is not None and winner.bound is not None and
+                                                        (solver.bound < winner.bound if minimizing else solver.bound > winner.bound))):
+                        winner, status = solver, result
+        except KeyboardInterrupt:
+            for solver in solvers:
+                solver.cancel()
+            raise
+    if winner is not None:
+        winner.record()
+    return winner if winner is not None else solvers[0], status
@@ -38,38 +38,42 @@ def build_similar_constraints():
 # Phase 1: Detecting groups of similar constraints
 
 def detecting_groups_recursively(ctr_entities):
+    def _buckets(entities):
+        # constraints are bucketed with respect to their signatures since close_to() can only succeed inside a bucket
+        buckets = OrderedDict()
+        for i, e in enumerate(entities):
+            if e is None or isinstance(e, EGroup):
+                continue
+            key = e.constraint.signature()
+            if key is not None:
+                buckets.setdefault(key, []).append(i)
+        return buckets.values()
+
     def _detecting_groups(entities):
-        flags = [False] * len(entities)  # indicate (indexes of) constraints that are similar at a given moment (see intern loop)
         removal = False
-        groups = []
-        for i, e1 in enumerate(entities):
-            if flags[i] or e1 is None or isinstance(e1, EGroup):
-                continue
-            Diffs.reset()
-            group = EGroup()  # group of similar constraints tried to be built
-            group.entities.append(e1)  # first constraint of the new group
-            for j in range(i + 1, len(entities)):
-                e2 = entities[j]
-                if flags[j] is False and e2 is not None and not isinstance(e2, EGroup):
-                    diffs = e2.constraint.close_to(e1.constraint)
-                    # if diffs is None:
-                    #     flags[j] = True
-                    #     entities[j] = None
-                    #     removal = True
-                    if diffs is not False:
-                        diffs.merge()  # merging flags of two lists, indicating if the length of argument contents is different
-                        group.entities.append(e2)  # adding the constraint to the new group
-                        flags[j] = True  # to avoid processing it again
-                        entities[j] = None  # to discard this constraint (since it is now in a group)
-                        removal = True
-            if len(group.entities) > 1:
-                group.diff_argument_names = Diffs.fusion.argument_names
-                group.diff_argument_flags = Diffs.fusion.argument_flags
-                entities[i] = group  # constraint replaced by the new group (and other constraints of the group will be now ignored since flagged to False)
-            groups.append(group)
-            if len(entities) > 100 and len(groups) == 2 and len(groups[0].entities) + len(groups[1].entities) < 5:  # len(entities) // 5:
-                print("\tStopping group detection")  # because it may be very expensive (and not very efficient)
-                break
+        for indexes in _buckets(entities):
+            flags = [False] * len(indexes)  # indicate (positions in the bucket of) constraints that are similar at a given moment (see intern loop)
+            for i, k1 in enumerate(indexes):
+                if flags[i]:
+                    continue
+                e1 = entities[k1]
+                Diffs.reset()
+                group = EGroup()  # group of similar constraints tried to be built
+                group.entities.append(e1)  # first constraint of the new group
+                for j in range(i + 1, len(indexes)):
+                    if flags[j] is False:
+                        e2 = entities[indexes[j]]
+                        diffs = e2.constraint.close_to(e1.constraint)
+                        if diffs is not False:
+                            diffs.merge()  # merging flags of two lists, indicating if the length of argument contents is different
+                            group.entities.append(e2)  # adding the constraint to the new group
+                            flags[j] = True  # to avoid processing it again
+                            entities[indexes[j]] = None  # to discard this constraint (since it is now in a group)
+                            removal = True
+                if len(group.entities) > 1:
+                    group.diff_argument_names = Diffs.fusion.argument_names
+                    group.diff_argument_flags = Diffs.fusion.argument_flags
+                    entities[k1] = group  # constraint replaced by the new group (and other constraints of the group will be now ignored)
         return [e for e in entities if e is not None] if removal else entities
 
     for e in ctr_entities:
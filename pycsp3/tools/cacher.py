@@ -0,0 +1,244 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import site
+import sys
+import sysconfig
+import types
+
+from pycsp3.dashboard import options
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pycsp3")
+DEFAULT_CACHE_SIZE = 1024  # in MB
+
+# options that have no impact on the content of the generated XCSP3 file
+NEUTRAL_OPTIONS = {"data", "dataparser", "output", "suffix", "solve", "solver", "verbose", "ev", "debug", "dont_display_warnings", "no_cache", "cache_dir",
+                   "cache_size", "lzma", "log_tail", "log_lzma", "pipe",
+                   "solve_cache", "cache", "output_record"}
+
+# normalized solver options that have no impact on the result of a solving operation (the time limit being handled separately)
+NEUTRAL_SOLVER_OPTIONS = {"limit_time", "verbose"}
+
+DEFINITIVE_STATUSES = {"UNSAT", "OPTIMUM"}  # for a CSP, SAT is also definitive
+
+# calls in the model that make it unsafe to skip its execution (solving, loading data from the model itself, reading files, ...)
+UNCACHEABLE_CALLS = re.compile(r"\b(solve|compile|clear|default_data|load_json_data|open|input)\s*\(")
+
+
+def cache_dir():
+    directory = vars(options).get("cache_dir")  # options are not declared when the parser is used on its own
+    return directory if directory else DEFAULT_CACHE_DIR
+
+
+def cacheable(model_source):
+    """
+    Returns True if the compiled form of the model can be taken from (and recorded in) the cache.
+    The cache must be explicitly requested (option -cache), as it cannot detect that a model depends on something else than its source,
+    the local modules it imports, its data and its options (e.g., unseeded randomness, environment variables or time).
+    """
+    if not options.cache or options.no_cache or options.display or options.solve or options.solver or options.callback or options.dataexport or options.profile:
+        return False
+    return UNCACHEABLE_CALLS.search(model_source) is None
+
+
+_fingerprint_value = None  # computed once per process (the sources of the library are not modified while it is running)
+
+
+def _fingerprint():
+    # the version of PyCSP3, and the state of its source files (so that entries become stale when the library is modified)
+    global _fingerprint_value
+    if _fingerprint_value is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with open(os.path.join(root, "version.txt"), encoding="utf-8") as f:
+            t = [f.read()]
+        for path, _, files in sorted(os.walk(root)):
+            for name in sorted(files):
+                if name.endswith(".py"):
+                    st = os.stat(os.path.join(path, name))
+                    t.append(name + ":" + str(st.st_mtime_ns) + ":" + str(st.st_size))
+        _fingerprint_value = " ".join(t)
+    return _fingerprint_value
+
+
+def cache_key(model_source, data):
+    """
+    Returns the key (hash) identifying the compilation of the specified model source with the specified (resolved) data,
+    while taking into account the variant and the compiler options
+    """
+    h = hashlib.sha256()
+    for piece in (_fingerprint(), model_source, repr(data), repr(options.parameters)):
+        h.update(piece.encode("UTF-8"))
+        h.update(b"\0")
+    for name in options.values + options.flags:
+        if name not in NEUTRAL_OPTIONS:
+            h.update((name + "=" + str(options.get(name)) + "\0").encode("UTF-8"))
+    return h.hexdigest()
+
+
+def _entry(key):
+    return os.path.join(cache_dir(), key + ".xml")
+
+
+def _dependencies_entry(key):
+    return os.path.join(cache_dir(), key + ".deps.json")
+
+
+def _digest(filename):
+    h = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _local_modules():
+    # returns the source files of the imported modules that are neither in the standard library, nor in site-packages, nor in PyCSP3
+    # (those of PyCSP3 being taken into account by the fingerprint), nor the main script (whose source is taken into account by the key)
+    excluded = [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))] + site.getsitepackages() + [site.getusersitepackages()]
+    excluded += [path for name, path in sysconfig.get_paths().items() if name in ("stdlib", "platstdlib", "purelib", "platlib")]
+    excluded = tuple(os.path.join(os.path.realpath(path), "") for path in excluded)
+    main = os.path.realpath(sys.argv[0])
+    files = set()
+    for module in list(sys.modules.values()):
+        filename = getattr(module, "__file__", None)
+        if filename is None or not filename.endswith(".py") or not os.path.isfile(filename):
+            continue
+        filename = os.path.realpath(filename)
+        if filename != main and not filename.startswith(excluded):
+            files.add(filename)
+    return sorted(files)
+
+
+def _result_entry(key):
+    return os.path.join(cache_dir(), key + ".json")
+
+
+def snapshot_entry(key):
+    """
+    Returns the name of the file in the cache for the snapshot (see parser/snapshots.py) with the specified key
+    """
+    return os.path.join(cache_dir(), key + ".snap")
+
+
+def _size_limit():
+    size = vars(options).get("cache_size")
+    return int(size if size else DEFAULT_CACHE_SIZE) * 1024 * 1024
+
+
+def trim():
+    """
+    Evicts the least recently used entries of the cache if its size limit is exceeded
+    """
+    _evict(_size_limit())
+
+
+def lookup(key, fullname):
+    """
+    Copies the cached XCSP3 file with the specified key (if any) into the specified file, and returns True if this was possible
+    """
+    entry = _entry(key)
+    try:
+        with open(_dependencies_entry(key)) as f:
+            dependencies = json.load(f)
+        if any(_digest(filename) != digest for filename, digest in dependencies.items()):  # a local module imported by the model has changed
+            return False
+        shutil.copyfile(entry, fullname)
+        os.utime(entry)  # the modification time is used for LRU eviction
+        os.utime(_dependencies_entry(key))
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def store(key, fullname):
+    """
+    Records the specified XCSP3 file in the cache, evicting the least recently used entries if the size limit is exceeded.
+    The local modules imported by the model (after its execution) are recorded with the digests of their sources, so that the entry
+    is no more used when one of them is modified.
+    """
+    os.makedirs(cache_dir(), exist_ok=True)
+    tmp = _dependencies_entry(key) + "." + str(os.getpid())  # in order to never let a partially written entry be visible
+    with open(tmp, "w") as f:
+        json.dump({filename: _digest(filename) for filename in _local_modules()}, f)
+    os.replace(tmp, _dependencies_entry(key))
+    tmp = _entry(key) + "." + str(os.getpid())
+    shutil.copyfile(fullname, tmp)
+    os.replace(tmp, _entry(key))
+    trim()
+
+
+def result_key(model, solver, dict_options, dict_simplified_options):
+    """
+    Returns the key (hash) identifying the solving of the specified compiled instance (filename, bytes or StreamedDocument) by the specified solver
+    (a string describing it, with its specific options), with the specified normalized options (from process_options), except the time limit
+    """
+    h = hashlib.sha256()
+    if isinstance(model, (bytes, bytearray)):
+        h.update(model)
+    elif isinstance(model, str):
+        with open(model, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    else:  # a StreamedDocument, generated one more time (without being kept in memory) for being hashed
+        model.write(types.SimpleNamespace(write=h.update))
+    normalized = {k: v for k, v in dict_simplified_options.items() if k not in NEUTRAL_SOLVER_OPTIONS}
+    for piece in (solver, json.dumps(normalized, sort_keys=True, default=str), str(dict_options.get("args"))):
+        h.update(b"\0")
+        h.update(piece.encode("UTF-8"))
+    return h.hexdigest()
+
+
+def lookup_result(key, limit, cop):
+    """
+    Returns the cached result (dict) of the solving operation with the specified key, if any and if it is valid for the specified time limit
+    (in seconds, None if no limit): a definitive result is valid if it was obtained within the time limit, and any other result
+    (e.g., UNKNOWN, or a bound for a COP) is valid only if it was obtained with the same (specified) time limit
+    """
+    entry = _result_entry(key)
+    try:
+        with open(entry) as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        return None
+    definitive = result["status"] in DEFINITIVE_STATUSES or (result["status"] == "SAT" and not cop)
+    if definitive and (limit is None or result["wck"] <= limit):
+        valid = True
+    else:
+        valid = limit is not None and result["limit"] == limit
+    if valid:
+        os.utime(entry)  # the modification time is used for LRU eviction
+    return result if valid else None
+
+
+def store_result(key, result):
+    """
+    Records the specified result (dict) of the solving operation with the specified key
+    """
+    os.makedirs(cache_dir(), exist_ok=True)
+    tmp = _result_entry(key) + "." + str(os.getpid())
+    with open(tmp, "w") as f:
+        json.dump(result, f)
+    os.replace(tmp, _result_entry(key))
+    trim()
+
+
+def _evict(limit):
+    entries = []
+    for name in os.listdir(cache_dir()):
+        if name.endswith((".xml", ".json", ".snap")):
+            try:
+                st = os.stat(os.path.join(cache_dir(), name))
+                entries.append((st.st_mtime, st.st_size, name))
+            except OSError:  # the entry may have been removed concurrently
+                continue
+    total = sum(size for (_, size, _) in entries)
+    for _, size, name in sorted(entries):
+        if total <= limit:
+            break
+        try:
+            os.remove(os.path.join(cache_dir(), name))
+        except OSError:
+            pass
+        total -= size
@@ -6,7 +6,7 @@ from pycsp3.classes.entities import ECtr, EMetaCtr
 from pycsp3.classes.main.constraints import (
     ScalarProduct, PartialConstraint, ConstraintAllDifferentList, ConstraintSum, ConstraintElement, ConstraintElementMatrix, ConstraintInstantiation,
     ConstraintRefutation, ConstraintDummyConstant, auxiliary, global_indirection, manage_global_indirection)
-from pycsp3.classes.main.variables import Domain, Variable, VariableInteger
+from pycsp3.classes.main.variables import Domain, Variable, VariableInteger, SolutionStore
 from pycsp3.classes.nodes import Node, TypeNode
 from pycsp3.dashboard import options
 from pycsp3.libs.forbiddenfruit import curse
@@ -781,7 +781,7 @@ class OpOverrider:
                     indexes = auxiliary().replace_node(indexes, values=range(n))
         if isinstance(indexes, Variable):
             if indexes.dom.is_infinite():
-                indexes.dom = Domain(range(len(array)))
+                indexes.dom = Domain.intern(Domain(range(len(array))))
             if isinstance(array, ListInt):
                 if is_1d_list(array, int):
                     if all(array[0] == v for v in array):
@@ -887,7 +887,13 @@ class ListVar(list):
 
     def __init__(self, variables=None):
         super().__init__([] if variables is None else variables)
-        self.values = None
+
+    @property
+    def values(self):  # the values of the last found solution (following the structure of the array), or None
+        def _values(t):
+            return None if t is None else t.value if isinstance(t, Variable) else [_values(v) for v in t]
+
+        return None if SolutionStore.n_rows == 0 else _values(self)
 
     def __getslice__(self, i, j):  # TODO using getitem instead? as for ListCtr?
         return ListVar(super().__getslice__(i, j))
@@ -0,0 +1,142 @@
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from pycsp3.dashboard import options
+
+try:
+    import resource  # not available on Windows
+except ImportError:
+    resource = None
+
+N_TOP_ALLOCATIONS = 10  # hard coding
+
+
+def _peak_rss():
+    # in kilobytes (ru_maxrss is given in kilobytes on Linux, but in bytes on macOS)
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+class _TimedStream:
+    """
+    A binary stream whose writes are timed, so that writing the file can be reported as a phase distinct from building the document
+    when both are interleaved (streamed document)
+    """
+
+    def __init__(self, stream, times):
+        self.stream = stream
+        self.times = times  # accumulated wck and cpu times (list of two floats, shared by all timed streams)
+
+    def write(self, data):
+        wck, cpu = time.perf_counter(), time.process_time()
+        self.stream.write(data)
+        self.times[0] += time.perf_counter() - wck
+        self.times[1] += time.process_time() - cpu
+
+
+class Profiler:
+    """
+    Records, when the option -profile is set, wall time, CPU time and peak RSS for each phase of the compiler.
+    With the option -profile_allocations, the top allocations (tracemalloc) of each phase are also recorded; tracing is then
+    only active during phases, and snapshots are taken outside the timed sections (but tracing slows down the phases).
+    With the option -profile_stats, a cProfile file (.pstats) is also recorded for each phase.
+    """
+
+    origin = None  # the wck and cpu times when the first phase was started
+    phases = []  # the records of the profiled phases
+    current = None  # the phase currently profiled (name, wck, cpu, snapshot, cProfile object)
+    written = [0.0, 0.0]  # the wck and cpu times spent in writing into timed streams
+
+    @staticmethod
+    def start(name):
+        if not options.profile:
+            return
+        Profiler.stop()
+        snapshot = None
+        if options.profile_allocations:
+            tracemalloc.start()
+            snapshot = tracemalloc.take_snapshot()
+        profile = None
+        if options.profile_stats:
+            import cProfile
+            profile = cProfile.Profile()
+            profile.enable()
+        if Profiler.origin is None:
+            Profiler.origin = (time.perf_counter(), time.process_time())
+        Profiler.current = (name, time.perf_counter(), time.process_time(), snapshot, profile)
+
+    @staticmethod
+    def stop():
+        if Profiler.current is None:
+            return
+        name, wck, cpu, snapshot, profile = Profiler.current
+        wck, cpu = time.perf_counter() - wck, time.process_time() - cpu
+        Profiler.current = None
+        if profile is not None:
+            profile.disable()
+        record = {"name": name, "wck": wck, "cpu": cpu, "peak_rss_kb": _peak_rss()}
+        if snapshot is not None:
+            record["traced_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+            filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]  # discarding allocations of the profiler
+            stats = tracemalloc.take_snapshot().filter_traces(filters).compare_to(snapshot.filter_traces(filters), "lineno")
+            tracemalloc.stop()
+            record["top_allocations"] = [{"location": str(stat.traceback[0]), "size_diff_kb": stat.size_diff // 1024, "count_diff": stat.count_diff}
+                                         for stat in stats[:N_TOP_ALLOCATIONS]]
+        Profiler.phases.append((record, profile))
+
+    @staticmethod
+    def timed(outputs):
+        """
+        Returns the specified binary streams, wrapped (when profiling) so that the time spent in writing into them is measured
+        """
+        if not options.profile:
+            return outputs
+        Profiler.written = [0.0, 0.0]
+        return [_TimedStream(output, Profiler.written) for output in outputs]
+
+    @staticmethod
+    def split_writes(name):
+        """
+        Moves the time spent in writing into timed streams (see timed()) from the last profiled phase to a new phase with the specified name
+        """
+        if not options.profile or len(Profiler.phases) == 0:
+            return
+        record = Profiler.phases[-1][0]
+        wck, cpu = Profiler.written
+        record["wck"], record["cpu"] = record["wck"] - wck, record["cpu"] - cpu
+        Profiler.phases.append(({"name": name, "wck": wck, "cpu": cpu, "peak_rss_kb": record["peak_rss_kb"]}, None))
+
+    @staticmethod
+    def save(prefix):
+        """
+        Saves the records of all profiled phases in the JSON file <prefix>-profile.json (and cProfile files <prefix>-profile-<phase>.pstats),
+        together with the total times (since the start of the first phase) and the times spent outside phases
+        """
+        if not options.profile:
+            return
+        Profiler.stop()
+        for record, profile in Profiler.phases:
+            if profile is not None:
+                record["pstats"] = prefix + "-profile-" + record["name"].replace(" ", "_") + ".pstats"
+                profile.dump_stats(record["pstats"])
+        records = [record for record, _ in Profiler.phases]
+        total_wck, total_cpu = (time.perf_counter() - Profiler.origin[0], time.process_time() - Profiler.origin[1]) if Profiler.origin else (0, 0)
+        with open(prefix + "-profile.json", "w") as f:
+            json.dump({"phases": records, "total_wck": total_wck, "total_cpu": total_cpu,
+                       "outside_phases_wck": total_wck - sum(record["wck"] for record in records),
+                       "outside_phases_cpu": total_cpu - sum(record["cpu"] for record in records)}, f, indent=2)
+        print("  * Saving the profile in the file " + prefix + "-profile.json completed.")
+
+
+@contextmanager
+def profiled(name):
+    Profiler.start(name)
+    try:
+        yield
+    finally:
+        Profiler.stop()
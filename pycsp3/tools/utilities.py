@@ -313,6 +313,37 @@ def matrix_to_string(m):
     # return "\n" + "\n".join(["\t(" + ",".join([str(v) for v in t]) + ")" for t in m]) + "\n"
 
 
+def is_ndarray(obj):
+    # numpy being an optional dependency, it is not imported here (if it has never been loaded, obj cannot be an array)
+    np = sys.modules.get("numpy")
+    return np is not None and isinstance(obj, np.ndarray)
+
+
+def array_to_string(table, restricting_domains=None):
+    """
+    Returns the string representation of the specified table given as a 2-dimensional NumPy array of integers
+    (assumed to be sorted and without duplicates). The filtering wrt domains and the formatting of tuples are vectorized.
+    """
+    import numpy as np
+    if restricting_domains is not None:
+        mask = np.ones(len(table), dtype=bool)
+        for i, dom in enumerate(restricting_domains):
+            if dom.is_infinite():
+                mask &= np.isin(table[:, i], dom.all_values())
+                continue
+            intervals = dom.intervals()
+            if len(intervals) == 1:
+                mask &= (table[:, i] >= intervals[0][0]) & (table[:, i] <= intervals[0][1])
+            else:  # binary search of the interval that could contain each value
+                starts, ends = np.array([lo for lo, _ in intervals]), np.array([hi for _, hi in intervals])
+                pos = np.searchsorted(starts, table[:, i], side="right") - 1
+                mask &= (pos >= 0) & (table[:, i] <= ends[np.maximum(pos, 0)])
+        table = table[mask]
+    CHUNK = 100_000  # hard coding (number of tuples formatted at once)
+    fmt = "(" + ",".join("%d" for _ in range(table.shape[1])) + ")"
+    return "".join((fmt * len(piece)) % tuple(piece.ravel().tolist()) for piece in (table[i:i + CHUNK] for i in range(0, len(table), CHUNK)))
+
+
 def table_to_string(table, restricting_domains=None, *, parallel=False):
     def _tuple_to_string(t):
         return "(" + ",".join(
@@ -323,6 +354,8 @@ def table_to_string(table, restricting_domains=None, *, parallel=False):
             "*" if v == ANY else v.str_tuple()
             for v in t) + ")"
 
+    if is_ndarray(table):
+        return array_to_string(table, restricting_domains)
     LIMIT = 100_000  # hard coding
     if not parallel or len(table) < LIMIT:
         s = []
@@ -330,7 +363,7 @@ def table_to_string(table, restricting_domains=None, *, parallel=False):
         for t in table:  # table is assumed to be sorted (adding an assert?) ; only distinct tuples are kept
             if t != previous:
                 if restricting_domains is None or isinstance(t[0], str) \
-                        or all(t[i] == ANY or t[i] in restricting_domains[i].all_values() for i in range(len(t))):
+                        or all(t[i] == ANY or t[i] in restricting_domains[i] for i in range(len(t))):
                     s.append(_tuple_to_string(t))
                 previous = t
 
@@ -1,3 +1,4 @@
+import io
 from collections import OrderedDict
 
 from lxml import etree
@@ -71,29 +72,36 @@ def _complex_var(va, dom_or_dom2vars):
 
 
 def _simple_var(va, dom, dom2var):
+    # domains are interned (see Domain.pool), so that keys of dom2var are hashed and compared quickly
     if dom in dom2var:
-        return _complex_var(va, dom if len(dom) < SIZE_LIMIT_FOR_USING_AS else dom2var[dom])
+        s = str(dom)
+        return _complex_var(va, s if len(s) < SIZE_LIMIT_FOR_USING_AS else dom2var[dom])
     else:
         dom2var[dom] = va
-        return _complex_var(va, dom)
+        return _complex_var(va, str(dom))
 
 
-def _variables():
-    elt = _element(TypeXML.VARIABLES)
+def _variable_elements():
     dom2var = dict()
     for va in VarEntities.items:
         if isinstance(va, EVar):
-            elt.append(_simple_var(va, str(va.variable.dom), dom2var))
+            yield _simple_var(va, va.variable.dom, dom2var)
         else:
             dom2vars = DefaultListOrderedDict(())
             for x in va.flatVars:
                 if x is not None:
-                    dom2vars[str(x.dom)].append(x)
-            dom2vars = DefaultListOrderedDict(sorted(dom2vars.items(), key=lambda item: [y.indexes for y in item[1]]))
+                    dom2vars[x.dom].append(x)
             if len(dom2vars) == 1:  # and not va.is_containing_hole():  # TODO do we keep the second part of the condition?
-                elt.append(_simple_var(va, str(va.flatVars[0].dom), dom2var))
+                yield _simple_var(va, next(iter(dom2vars)), dom2var)
             else:
-                elt.append(_complex_var(va, dom2vars))
+                dom2vars = DefaultListOrderedDict((str(dom), vars) for dom, vars in sorted(dom2vars.items(), key=lambda item: [y.indexes for y in item[1]]))
+                yield _complex_var(va, dom2vars)
+
+
+def _variables():
+    elt = _element(TypeXML.VARIABLES)
+    for son in _variable_elements():
+        elt.append(son)
     return elt
 
 
@@ -255,6 +263,21 @@ def _annotations():
     return elt
 
 
+def _constraint_elements(entities):
+    # yields the top-level elements of the constraints, one entity at a time (nested lists of constraints being traversed)
+    # a block is yielded as a pair composed of its (empty) element and a generator of its sons
+    for entity in entities:
+        if isinstance(entity, (EToGather, EToSatisfy)) or (isinstance(entity, ESlide) and len(entity.scope) == 0):
+            yield from _constraint_elements(entity.entities)
+        elif isinstance(entity, EBlock):
+            if len(entity.entities) != 0:
+                yield _element(TypeXML.BLOCK, entity), _constraint_elements(entity.entities)
+        else:
+            elt = _element(TypeXML.CONSTRAINTS)
+            _constraints_recursive(elt, entity)
+            yield from elt
+
+
 def build_document():
     root = _element(TypeXML.INSTANCE, attributes=[(TypeXML.FORMAT, "XCSP3")])
 
@@ -275,3 +298,83 @@ def build_document():
     if len(annotations := _annotations()) > 0:
         root.append(annotations)
     return root
+
+
+class _StreamWriter:
+    """
+    Writes elements to a binary stream (or several ones), while indenting them as when pretty-printing the whole document
+    """
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+
+    def write(self, data):
+        for output in self.outputs:
+            output.write(data)
+
+    def element(self, elt, level):
+        etree.indent(elt, level=level)
+        self.write(b"  " * level + etree.tostring(elt, xml_declaration=False, encoding='UTF-8') + b"\n")
+
+    def start(self, elt, level):
+        s = etree.tostring(elt, xml_declaration=False, encoding='UTF-8')  # elt has no content, so it is of the form <name .../>
+        self.write(b"  " * level + s[:-2] + b">\n")
+
+    def end(self, elt, level):
+        self.write(b"  " * level + b"</" + str(elt.tag).encode('UTF-8') + b">\n")
+
+    def section(self, elt, sons, level, *, discard_if_empty=True):
+        opened = False
+        for son in sons:
+            if not opened:
+                self.start(elt, level)
+                opened = True
+            if isinstance(son, tuple):  # a block whose sons are also written one at a time
+                self.section(*son, level + 1, discard_if_empty=False)
+            else:
+                self.element(son, level + 1)
+        if opened:
+            self.end(elt, level)
+        elif not discard_if_empty:
+            self.element(elt, level)
+        return opened
+
+
+class StreamedDocument:
+    """
+    The XCSP3 document of the current model, which is not generated when compiling, but each time it is written into a binary stream
+    (e.g., the named pipe read by a solver), so that it is neither written in a file nor entirely held in memory.
+    The model must not be modified (or cleared) while the document is used.
+    """
+
+    def __init__(self, write):
+        self.write = write  # a function writing the document into a binary stream
+
+    def __bytes__(self):
+        output = io.BytesIO()
+        self.write(output)
+        return output.getvalue()
+
+
+def write_document(*outputs):
+    """
+    Writes the XCSP3 document of the current model into the specified binary streams (typically, a file and possibly an lzma stream).
+    Contrary to build_document(), the whole lxml tree is never built: elements are serialized one at a time,
+    the produced text being the same as the one obtained by pretty-printing the document.
+
+    :param outputs: binary streams
+    :return: None if there is no variable (and nothing is written), True if the instance is a COP, and False otherwise
+    """
+    if len(VarEntities.items) == 0:
+        print("Warning: no variables in this model (and so, no generated file)!")
+        return None
+    cop = len(ObjEntities.items) > 0
+    writer = _StreamWriter(outputs)
+    writer.start(_element(TypeXML.INSTANCE, attributes=[(TypeXML.FORMAT, "XCSP3"), (TypeXML.TYPE, TypeFramework.COP if cop else TypeFramework.CSP)]), 0)
+    writer.section(_element(TypeXML.VARIABLES), _variable_elements(), 1)
+    if not writer.section(_element(TypeXML.CONSTRAINTS), _constraint_elements(CtrEntities.items), 1):
+        print("Warning: no constraints for this model!")
+    writer.section(_element(TypeXML.OBJECTIVES), (_constraint(ce, possible_simplified_form=True) for ce in ObjEntities.items), 1)
+    writer.section(_element(TypeXML.ANNOTATIONS), (_annotation(ce, possible_simplified_form=False) for ce in AnnEntities.items), 1)
+    writer.end(_element(TypeXML.INSTANCE), 0)
+    return cop